@@ -0,0 +1,400 @@
+"""
+命令行入口 (python -m app)
+只使用 app.core, 不导入 PySide6, 适合在无图形界面的机器上批量修改配置;
+启动子进程或线程池的模块只在对应的命令中导入, 保持其他命令的启动速度
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from .core import (
+    BackupStore, ConfigError, ConfigStore, analyze_file, backup_config, backup_dir, diff_raw, export_sections,
+    json_default, list_sections, missing_sections, parse_selection, plan_compaction, read_raw, read_sections
+)
+from .core.backup_store import BACKUP_COMPACT
+from .core.compaction import DEFAULT_IDLE_DAYS
+from .core.json_pointer import format_pointer
+from .core.size_analyzer import DEFAULT_MAX_DEPTH
+
+
+def parse_value(text, as_string=False):
+    """把命令行参数解析为 JSON 值, 不是合法 JSON 时按字符串处理"""
+    if as_string:
+        return text
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_env(items):
+    """把 KEY=VALUE 列表解析为字典"""
+    env = {}
+    for item in items or []:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise ConfigError(f"环境变量格式应为 KEY=VALUE: {item}")
+        env[key] = value
+    return env
+
+
+def dump(value):
+    """输出 JSON 值"""
+    return json.dumps(value, indent=2, ensure_ascii=False, default=json_default)
+
+
+def build_parser():
+    """创建参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="python -m app",
+        description="Claude 配置管理器命令行 (不启动图形界面)"
+    )
+    parser.add_argument(
+        "-c", "--config", action="append", type=Path, metavar="PATH",
+        help="配置文件路径, 可重复以批量处理多个文件 (默认 ~/.claude.json)"
+    )
+    parser.add_argument("--no-backup", action="store_true", help="保存前不备份当前配置")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # MCP 服务器
+    servers = commands.add_parser("servers", help="MCP 服务器").add_subparsers(dest="action", required=True)
+    servers.add_parser("list", help="列出服务器")
+    add = servers.add_parser("add", help="添加或替换服务器")
+    add.add_argument("name")
+    add.add_argument("server_command", metavar="command")
+    add.add_argument("args", nargs=argparse.REMAINDER, help="命令参数 (-e 需写在名称之前)")
+    add.add_argument("-e", "--env", action="append", metavar="KEY=VALUE", help="环境变量, 可重复")
+    remove = servers.add_parser("remove", help="删除服务器")
+    remove.add_argument("name")
+    probe = servers.add_parser("probe", help="并发启动服务器并完成 MCP 握手, 输出启动和握手耗时")
+    probe.add_argument("names", nargs="*", help="只检测这些服务器 (默认全部)")
+    probe.add_argument("-t", "--timeout", type=float, help="握手超时 (秒)")
+    tools = servers.add_parser("tools", help="列出服务器提供的工具和资源 (有效期内取自缓存)")
+    tools.add_argument("names", nargs="*", help="只列出这些服务器 (默认全部)")
+    tools.add_argument("--refresh", action="store_true", help="忽略缓存重新获取")
+
+    # GitHub 仓库
+    repos = commands.add_parser("repos", help="GitHub 仓库").add_subparsers(dest="action", required=True)
+    repos.add_parser("list", help="列出仓库及路径")
+    add = repos.add_parser("add", help="添加仓库")
+    add.add_argument("name")
+    remove = repos.add_parser("remove", help="删除仓库")
+    remove.add_argument("name")
+    add = repos.add_parser("add-path", help="为仓库添加本地路径")
+    add.add_argument("name")
+    add.add_argument("path")
+    remove = repos.add_parser("remove-path", help="删除仓库的本地路径")
+    remove.add_argument("name")
+    remove.add_argument("path")
+    check = repos.add_parser("check", help="检查本地路径是否存在且为对应仓库的检出")
+    check.add_argument("--all", action="store_true", help="同时列出正常的路径")
+    discover = repos.add_parser("discover", help="在目录下查找 git 检出并添加到对应的仓库")
+    discover.add_argument("roots", nargs="*", help="扫描的根目录 (默认为上次扫描的目录)")
+    discover.add_argument("-d", "--depth", type=int, help="扫描深度")
+    discover.add_argument("-n", "--dry-run", action="store_true", help="只列出, 不修改配置")
+
+    # 功能开关
+    flags = commands.add_parser("flags", help="功能开关").add_subparsers(dest="action", required=True)
+    for action, help_text in (("list", "列出功能开关"), ("set", "设置功能开关"), ("remove", "删除功能开关")):
+        sub = flags.add_parser(action, help=help_text)
+        sub.add_argument(
+            "-g", "--group", choices=["statsig", "growthbook"], default="statsig",
+            help="开关分组 (默认 statsig)"
+        )
+        if action != "list":
+            sub.add_argument("name")
+        if action == "set":
+            sub.add_argument("value", help="JSON 值, 例如 true / false / 123 / \"text\"")
+
+    # 项目压缩与归档
+    projects = commands.add_parser("projects", help="项目压缩与归档").add_subparsers(dest="action", required=True)
+    compact = projects.add_parser("compact", help="把目录已不存在或闲置的项目移到归档")
+    compact.add_argument(
+        "--idle-days", type=int, default=DEFAULT_IDLE_DAYS,
+        help=f"闲置超过该天数的项目也会归档 (默认 {DEFAULT_IDLE_DAYS}, 0 表示不按闲置时间)"
+    )
+    compact.add_argument("--keep-missing", action="store_true", help="保留目录已不存在的项目")
+    compact.add_argument("-n", "--dry-run", action="store_true", help="只列出将要归档的项目和可节省的字节")
+    projects.add_parser("archived", help="列出归档中的项目")
+    restore = projects.add_parser("restore", help="从归档恢复项目")
+    restore.add_argument("paths", nargs="+", metavar="path")
+
+    # 备份历史
+    backups = commands.add_parser("backups", help="备份历史").add_subparsers(dest="action", required=True)
+    backups.add_parser("list", help="列出备份 (最新的在前)")
+    restore = backups.add_parser("restore", help="用备份覆盖配置 (覆盖前先备份当前配置)")
+    restore.add_argument("id", help="备份编号或其唯一前缀")
+    export = backups.add_parser("export", help="把备份写入文件")
+    export.add_argument("id", help="备份编号或其唯一前缀")
+    export.add_argument("output", type=Path)
+    prune = backups.add_parser("prune", help="按保留设置删除旧备份")
+    prune.add_argument("--keep", type=int, help="修改保留的备份数")
+    prune.add_argument("--days", type=int, help="修改保留的天数 (0 表示不限)")
+
+    # 按部分导出/导入
+    export = commands.add_parser("export", help="导出配置中选中的部分 (.gz 结尾时 gzip 压缩)")
+    export.add_argument("output", type=Path)
+    export.add_argument(
+        "-s", "--section", action="append", default=[], metavar="KEY[:MEMBER]",
+        help="导出的顶层键或其中的成员, 可重复 (默认整个配置), 例如 mcpServers 或 githubRepoPaths:owner/repo"
+    )
+    import_ = commands.add_parser("import", help="只解析并合并文件中选中的部分 (支持 gzip)")
+    import_.add_argument("input", type=Path)
+    import_.add_argument(
+        "-s", "--section", action="append", default=[], metavar="KEY[:MEMBER]",
+        help="导入的顶层键或其中的成员, 可重复 (默认文件中的全部)"
+    )
+    import_.add_argument("-l", "--list", action="store_true", help="只列出文件中的顶层键和大小")
+
+    # 结构化比较
+    diff = commands.add_parser("diff", help="比较两份配置, 列出变化的路径")
+    diff.add_argument("old", help="文件路径, 或 backup:编号 表示备份")
+    diff.add_argument("new", nargs="?", help="同上 (默认为当前配置文件)")
+
+    # 大小分析
+    sizes = commands.add_parser("sizes", help="列出占用字节最多的键")
+    sizes.add_argument(
+        "-d", "--depth", type=int, default=DEFAULT_MAX_DEPTH, help=f"分析的深度 (默认 {DEFAULT_MAX_DEPTH})"
+    )
+    sizes.add_argument("-n", "--top", type=int, default=20, help="输出的条数 (默认 20)")
+
+    # JSON Pointer
+    get = commands.add_parser("get", help="读取 JSON Pointer 指向的值")
+    get.add_argument("pointer", help="例如 /mcpServers/foo/command")
+    set_ = commands.add_parser("set", help="设置 JSON Pointer 指向的值")
+    set_.add_argument("pointer")
+    set_.add_argument("value", help="JSON 值, 不是合法 JSON 时按字符串处理")
+    set_.add_argument("--string", action="store_true", help="始终按字符串处理 value")
+    delete = commands.add_parser("delete", help="删除 JSON Pointer 指向的值")
+    delete.add_argument("pointer")
+
+    return parser
+
+
+def select_servers(store, names):
+    """按名称选出服务器 {名称: 配置}, 未指定名称时为全部"""
+    servers = store.servers()
+    unknown = [name for name in names if name not in servers]
+    if unknown:
+        raise ConfigError(f"服务器不存在: {', '.join(unknown)}")
+    if names:
+        return {name: servers[name] for name in names}
+    return servers
+
+
+def read_diff_source(store, source):
+    """diff 命令的比较对象的原始字节: 文件路径或 backup:编号"""
+    if source is None:
+        return read_raw(store.path)
+    if source.startswith("backup:"):
+        backups = BackupStore(backup_dir(store.path))
+        return backups.read(backups.get(source[len("backup:"):]))
+    return read_raw(Path(source))
+
+
+def run_command(store, args, out):
+    """对一个配置文件执行命令"""
+    command, action = args.command, getattr(args, "action", None)
+
+    if command == "servers":
+        if action == "list":
+            for name, config in store.servers().items():
+                line = " ".join([name, str(config.get("command", ""))] + [str(a) for a in config.get("args", [])])
+                out.write(line + "\n")
+        elif action == "add":
+            store.set_server(args.name, args.server_command, args.args, parse_env(args.env))
+        elif action == "tools":
+            from .core.mcp_inventory import InventoryCache
+            cache = InventoryCache()
+            cache.load(store.path)
+            results, spawned = cache.refresh(select_servers(store, args.names), force=args.refresh)
+            if spawned:
+                cache.prune()
+                cache.store(store.path)
+            for inventory in sorted(results, key=lambda inventory: inventory.name):
+                if inventory.skipped:
+                    out.write(f"{inventory.name}\t未获取: {inventory.error}\n")
+                    continue
+                if inventory.error:
+                    out.write(f"{inventory.name}\t错误: {' '.join(inventory.error.split())}\n")
+                    continue
+                out.write(f"{inventory.name}\t{len(inventory.tools)} 个工具\t{len(inventory.resources)} 个资源\n")
+                for tool in inventory.tools:
+                    out.write(f"  tool\t{tool.get('name', '')}\n")
+                for resource in inventory.resources:
+                    out.write(f"  resource\t{resource.get('uri', '')}\n")
+        elif action == "probe":
+            from .core.mcp_probe import DEFAULT_PROBE_TIMEOUT, probe_servers
+            timeout = DEFAULT_PROBE_TIMEOUT if args.timeout is None else args.timeout
+            results = probe_servers(select_servers(store, args.names), timeout)
+            for result in sorted(results, key=lambda result: result.name):
+                spawn = f"{result.spawn_time * 1000:.0f}" if result.spawn_time is not None else "-"
+                init = f"{result.init_time * 1000:.0f}" if result.init_time is not None else "-"
+                error = " ".join(result.error.split())
+                out.write("\t".join([result.status, spawn, init, result.name, error]).rstrip("\t") + "\n")
+        else:
+            store.remove_server(args.name)
+
+    elif command == "repos":
+        if action == "list":
+            for name, paths in store.repos().items():
+                out.write("\t".join([name] + [str(p) for p in paths]) + "\n")
+        elif action == "add":
+            store.add_repo(args.name)
+        elif action == "remove":
+            store.remove_repo(args.name)
+        elif action == "add-path":
+            store.add_repo_path(args.name, args.path)
+        elif action == "check":
+            from .core.path_health import STATUS_OK, PathHealthChecker, repo_path_pairs
+            checker = PathHealthChecker()
+            checker.load(store.path)
+            results = sorted(checker.check(repo_path_pairs(store.repos()), prune=True))
+            checker.store(store.path)
+            for result in results:
+                if args.all or result.status != STATUS_OK:
+                    out.write("\t".join([result.status, result.repo, result.path] + list(result.remotes)) + "\n")
+        elif action == "discover":
+            from .core.repo_discovery import DEFAULT_SCAN_DEPTH, RepoScanner, plan_repo_merge
+            scanner = RepoScanner()
+            scanner.load(store.path)
+            roots = args.roots or scanner.roots
+            if not roots:
+                raise ConfigError("请指定要扫描的根目录")
+            proposals = plan_repo_merge(store.repos(), list(scanner.scan(roots, DEFAULT_SCAN_DEPTH if args.depth is None else args.depth)))
+            scanner.store(store.path)
+            for name, path, _ in proposals:
+                out.write(f"{name}\t{path}\n")
+            out.write(f"# {len(proposals)} 个新路径\n")
+            if not args.dry_run:
+                store.add_repo_paths([(name, path) for name, path, _ in proposals])
+        else:
+            store.remove_repo_path(args.name, args.path)
+
+    elif command == "flags":
+        if action == "list":
+            for name, value in store.flags(args.group).items():
+                out.write(f"{name}\t{json.dumps(value, ensure_ascii=False)}\n")
+        elif action == "set":
+            value = parse_value(args.value)
+            if args.group == "statsig" and not isinstance(value, bool):
+                raise ConfigError(f"Statsig 开关的值必须是 true 或 false: {args.value}")
+            store.set_flag(args.group, args.name, value)
+        else:
+            store.remove_flag(args.group, args.name)
+
+    elif command == "projects":
+        if action == "compact":
+            candidates = plan_compaction(
+                store.data.get("projects", {}), args.idle_days or None, not args.keep_missing
+            )
+            for candidate in candidates:
+                out.write(f"{candidate.size}\t{candidate.reason}\t{candidate.path}\n")
+            out.write(f"# {len(candidates)} 个项目, {sum(c.size for c in candidates)} 字节\n")
+            if candidates and not args.dry_run:
+                if not args.no_backup:
+                    backup_config(store.path, BACKUP_COMPACT)
+                store.compact_projects(
+                    [c.path for c in candidates], {c.path: c.reason for c in candidates}
+                )
+        elif action == "archived":
+            for item in store.archive().entries():
+                archived_at = datetime.fromtimestamp(item.archived_at).strftime("%Y-%m-%d %H:%M")
+                out.write(f"{archived_at}\t{item.size}\t{item.reason}\t{item.path}\n")
+        else:
+            store.restore_projects(args.paths)
+
+    elif command == "backups":
+        backups = BackupStore(backup_dir(store.path))
+        if action == "list":
+            for snapshot in backups.snapshots():
+                created_at = datetime.fromtimestamp(snapshot.created_at).strftime("%Y-%m-%d %H:%M:%S")
+                out.write(f"{snapshot.id}\t{created_at}\t{snapshot.reason}\t{snapshot.size}\n")
+            count, total, objects, stored = backups.usage()
+            out.write(f"# {count} 个备份, 原始 {total} 字节, {objects} 块占用 {stored} 字节\n")
+        elif action == "restore":
+            backups.restore(backups.get(args.id), store.path)
+            store.load()
+        elif action == "export":
+            args.output.write_bytes(backups.read(backups.get(args.id)))
+        else:
+            if args.keep is not None or args.days is not None:
+                keep_last, keep_days = backups.retention()
+                backups.set_retention(
+                    keep_last if args.keep is None else args.keep, keep_days if args.days is None else args.days
+                )
+            removed = backups.prune()
+            out.write(f"# 删除了 {removed} 个备份\n")
+
+    elif command == "export":
+        selection = parse_selection(args.section) if args.section else None
+        size = export_sections(store.data, args.output, selection)
+        out.write(f"# 已导出 {size} 字节到 {args.output}\n")
+    elif command == "import":
+        raw = read_raw(args.input)
+        sections = list_sections(raw)
+        if args.list:
+            for section in sections:
+                members = "-" if section.members is None else str(len(section.members))
+                out.write(f"{section.key}\t{section.size}\t{members}\n")
+        else:
+            if args.section:
+                selection = parse_selection(args.section)
+                missing = missing_sections(sections, selection)
+                if missing:
+                    raise ConfigError(f"{args.input} 中没有这些部分: {', '.join(missing)}")
+            else:
+                selection = dict.fromkeys(section.key for section in sections)
+            count = store.import_sections(read_sections(raw, selection))
+            out.write(f"# {count} 处变化\n")
+
+    elif command == "diff":
+        entries = diff_raw(read_diff_source(store, args.old), read_diff_source(store, args.new))
+        for entry in entries:
+            out.write(f"{entry.kind}\t{format_pointer(entry.path) or '/'}\n")
+        out.write(f"# {len(entries)} 处变化\n")
+
+    elif command == "sizes":
+        root = analyze_file(store.path, args.depth)
+        nodes = []
+        pending = [((), root)]
+        while pending:
+            path, node = pending.pop()
+            for child in node.children:
+                child_path = path + (child.key,)
+                nodes.append((child.size, child_path))
+                pending.append((child_path, child))
+        nodes.sort(key=lambda item: item[0], reverse=True)
+        for size, path in nodes[:args.top]:
+            out.write(f"{size}\t{format_pointer(path)}\n")
+
+    elif command == "get":
+        out.write(dump(store.get(args.pointer)) + "\n")
+    elif command == "set":
+        store.set(args.pointer, parse_value(args.value, args.string))
+    else:
+        store.delete(args.pointer)
+
+
+def main(argv=None, out=None, err=None):
+    """命令行主函数, 返回退出码"""
+    out = out or sys.stdout
+    err = err or sys.stderr
+    args = build_parser().parse_args(argv)
+    paths = args.config or [None]
+
+    status = 0
+    for path in paths:
+        store = ConfigStore(path)
+        try:
+            store.load()
+            if len(paths) > 1:
+                out.write(f"# {store.path}\n")
+            run_command(store, args, out)
+            store.save(backup=not args.no_backup)
+        except (ConfigError, OSError, ValueError) as e:
+            err.write(f"错误: {store.path}: {e}\n")
+            status = 1
+    return status
@@ -0,0 +1,48 @@
+"""
+配置核心 (不依赖 Qt)
+启动子进程或线程池的模块 (path_health、repo_discovery、mcp_probe、mcp_inventory) 不在这里导出,
+使用时从子模块导入, 以免拖慢命令行的启动
+"""
+from .errors import ConfigError, SaveConflict
+from .config_cache import (
+    CachedConfig, clear_cache, content_hash, load_cache, read_cache_file, store_cache, write_cache_file
+)
+from .config_file import atomic_write_bytes, default_config_path, file_fingerprint, read_config, write_config
+from .backup_store import BackupStore, Snapshot, backup_config, backup_dir
+from .config_diff import diff_config, merge_local_changes, merge_with_disk
+from .json_diff import DiffEntry, JsonDiff, diff_raw, summarize_diff
+from .section_transfer import (
+    SectionInfo, export_sections, list_sections, merge_sections, missing_sections, parse_selection, read_raw,
+    read_sections
+)
+from .config_store import ConfigStore, save_config
+from .lazy_config import (
+    LazySection, dumps_config, dumps_section, index_members, json_default, load_section, member_bytes,
+    member_keys, member_sizes, parse_config, remove_members
+)
+from .profiler import Profiler, profiler, timed
+from .project_stats import ProjectStatsCache, project_stats
+from .size_analyzer import SizeNode, analyze_file, analyze_sizes
+from .compaction import (
+    ArchivedProject, CompactionCandidate, ProjectArchive, archive_path, archive_projects, compact_projects,
+    plan_compaction
+)
+
+__all__ = [
+    'ConfigError', 'SaveConflict', 'ConfigStore', 'save_config',
+    'CachedConfig', 'clear_cache', 'content_hash', 'load_cache', 'read_cache_file', 'store_cache',
+    'write_cache_file',
+    'atomic_write_bytes', 'default_config_path', 'file_fingerprint', 'read_config', 'write_config',
+    'BackupStore', 'Snapshot', 'backup_config', 'backup_dir',
+    'diff_config', 'merge_local_changes', 'merge_with_disk',
+    'DiffEntry', 'JsonDiff', 'diff_raw', 'summarize_diff',
+    'SectionInfo', 'export_sections', 'list_sections', 'merge_sections', 'missing_sections',
+    'parse_selection', 'read_raw', 'read_sections',
+    'LazySection', 'dumps_config', 'dumps_section', 'index_members', 'json_default', 'load_section',
+    'member_bytes', 'member_keys', 'member_sizes', 'parse_config', 'remove_members',
+    'Profiler', 'profiler', 'timed',
+    'ProjectStatsCache', 'project_stats',
+    'SizeNode', 'analyze_file', 'analyze_sizes',
+    'ArchivedProject', 'CompactionCandidate', 'ProjectArchive', 'archive_path', 'archive_projects',
+    'compact_projects', 'plan_compaction',
+]
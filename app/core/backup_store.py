@@ -0,0 +1,390 @@
+"""
+配置备份历史
+每次备份把配置文件按 JSON 结构切成块, 块按内容哈希以 zlib 压缩保存 (相同的块只存一份),
+备份本身只是列出各块哈希的清单; 未修改的文件不产生新备份, 小修改只写入变化的块
+"""
+import json
+import os
+import tempfile
+import time
+import zlib
+from collections import namedtuple
+
+from .config_cache import content_hash
+from .config_file import atomic_write_bytes, file_fingerprint
+from .errors import ConfigError
+from .lazy_config import index_members, index_top_level
+from .profiler import timed
+
+
+# 清单格式版本
+BACKUP_VERSION = 1
+
+# 默认保留的备份数和天数 (0 表示不按天数删除)
+DEFAULT_KEEP_LAST = 100
+DEFAULT_KEEP_DAYS = 30
+
+# 顶层值超过该大小时单独成块, 并按成员继续切分
+SPLIT_MIN_BYTES = 64 * 1024
+
+# 成员键哈希的低位全为 0 时在该成员前切分 (平均每 32 个成员一块), 插入或删除成员只影响相邻的块
+CHUNK_MASK = 0x1f
+
+# 单块的最大字节数, 更长的区间按固定大小切开
+MAX_CHUNK_BYTES = 1024 * 1024
+
+# 垃圾回收不删除最近修改过的块, 避免与正在进行的备份冲突
+GC_GRACE_SECONDS = 3600
+
+# 备份原因
+BACKUP_SAVE = "save"
+BACKUP_IMPORT = "import"
+BACKUP_RESET = "reset"
+BACKUP_COMPACT = "compact"
+BACKUP_RESTORE = "restore"
+
+BACKUP_LABELS = {
+    BACKUP_SAVE: "保存前",
+    BACKUP_IMPORT: "导入前",
+    BACKUP_RESET: "重置前",
+    BACKUP_COMPACT: "压缩前",
+    BACKUP_RESTORE: "恢复前",
+}
+
+# 一次备份: 编号, 创建时间 (时间戳), 原因, 文件字节数, 内容哈希, 备份时的文件指纹, 块列表 [(哈希, 字节数)]
+Snapshot = namedtuple("Snapshot", "id created_at reason size content_hash fingerprint chunks")
+
+
+def snapshot_stamp(created_at, previous_id=None):
+    """备份编号中的时间部分 (本地时间, 微秒精度), 按文件名排序即按创建顺序
+
+    不晚于上一个备份 (同一微秒或时钟回拨) 时接在上一个备份之后, 保持顺序。
+    """
+    micros = int(created_at * 1000000)
+    stamp = _format_stamp(micros)
+    if previous_id is None or stamp > previous_id[:len(stamp)]:
+        return stamp
+    try:
+        previous = int(time.mktime(time.strptime(previous_id[:15], "%Y%m%d-%H%M%S"))) * 1000000
+    except ValueError:
+        return stamp
+    fraction = previous_id[16:22]
+    # 旧格式的编号 (秒后直接是哈希) 排在同一秒内所有新格式编号之后
+    previous += int(fraction) if len(fraction) == 6 and fraction.isdigit() else 999999
+    return _format_stamp(previous + 1)
+
+
+def _format_stamp(micros):
+    """微秒时间戳 -> YYYYmmdd-HHMMSS-ffffff"""
+    seconds, fraction = divmod(micros, 1000000)
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(seconds))}-{fraction:06d}"
+
+
+def backup_dir(config_path):
+    """配置文件对应的备份目录"""
+    return config_path.with_suffix('.json.backups')
+
+
+def chunk_boundaries(raw):
+    """切分位置列表 (从 0 到 len(raw))
+
+    缩进 2 的配置中较大的顶层值单独成块并按成员内容切分, 较小的顶层值合在一起;
+    其他格式按固定大小切分。
+    """
+    cuts = [0]
+    sections = index_top_level(raw)
+    for _, start, stop in sections or ():
+        if stop - start < SPLIT_MIN_BYTES:
+            continue
+        cuts.append(start)
+        if raw[start:start + 1] == b"{":
+            for key, member_start, _ in (index_members(raw[start:stop], 4) or ())[1:]:
+                if zlib.crc32(key.encode('utf-8')) & CHUNK_MASK == 0:
+                    cuts.append(start + member_start)
+        cuts.append(stop)
+    cuts.append(len(raw))
+
+    bounds = [0]
+    for end in cuts[1:]:
+        while end - bounds[-1] > MAX_CHUNK_BYTES:
+            bounds.append(bounds[-1] + MAX_CHUNK_BYTES)
+        if end > bounds[-1]:
+            bounds.append(end)
+    return bounds
+
+
+def _snapshot_from_manifest(snapshot_id, manifest):
+    """由清单内容创建 Snapshot"""
+    fingerprint = manifest.get("fingerprint")
+    return Snapshot(
+        snapshot_id, manifest["createdAt"], manifest.get("reason", ""), manifest["size"], manifest["hash"],
+        tuple(fingerprint) if fingerprint else None, [tuple(chunk) for chunk in manifest["chunks"]]
+    )
+
+
+class BackupStore:
+    """配置备份历史
+
+    目录结构: objects/ 下为按哈希命名的压缩块, snapshots/ 下每个备份一个 JSON 清单
+    (文件名以创建时间开头, 按名称排序即按时间排序), retention.json 为保留设置。
+    块和清单都先写临时文件再原子替换, 命令行和图形界面可以同时备份。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.objects_dir = path / "objects"
+        self.snapshots_dir = path / "snapshots"
+
+    # ---- 保留设置 ----
+
+    def retention(self):
+        """保留设置 (备份数, 天数)"""
+        try:
+            settings = json.loads((self.path / "retention.json").read_bytes())
+        except (OSError, ValueError):
+            settings = {}
+        if not isinstance(settings, dict):
+            settings = {}
+        return settings.get("keepLast", DEFAULT_KEEP_LAST), settings.get("keepDays", DEFAULT_KEEP_DAYS)
+
+    def set_retention(self, keep_last, keep_days):
+        """修改保留设置"""
+        if keep_last < 1 or keep_days < 0:
+            raise ConfigError("至少保留 1 个备份, 天数不能为负")
+        self.path.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(
+            self.path / "retention.json", json.dumps({"keepLast": keep_last, "keepDays": keep_days}).encode('utf-8')
+        )
+
+    # ---- 块 ----
+
+    def object_path(self, digest):
+        """块文件的位置 (按哈希前两位分目录)"""
+        return self.objects_dir / digest[:2] / digest
+
+    def _put_object(self, chunk):
+        """保存一块, 返回 (哈希, 新写入的压缩字节数); 已有的块只更新修改时间"""
+        digest = content_hash(chunk)
+        path = self.object_path(digest)
+        try:
+            os.utime(path)
+            return digest, 0
+        except FileNotFoundError:
+            pass
+
+        data = zlib.compress(chunk)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=digest + ".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest, len(data)
+
+    def _get_object(self, digest):
+        """读取并解压一块"""
+        try:
+            return zlib.decompress(self.object_path(digest).read_bytes())
+        except FileNotFoundError:
+            raise ConfigError(f"备份数据缺失: {digest}") from None
+
+    # ---- 备份 ----
+
+    @timed()
+    def snapshots(self):
+        """所有备份, 最新的在前; 损坏的清单被跳过"""
+        try:
+            names = sorted(os.listdir(self.snapshots_dir), reverse=True)
+        except FileNotFoundError:
+            return []
+
+        snapshots = []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            try:
+                manifest = json.loads((self.snapshots_dir / name).read_bytes())
+                snapshots.append(_snapshot_from_manifest(name[:-5], manifest))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return snapshots
+
+    def latest(self):
+        """最新的备份, 没有时返回 None"""
+        try:
+            names = sorted((name for name in os.listdir(self.snapshots_dir) if name.endswith(".json")), reverse=True)
+        except FileNotFoundError:
+            return None
+        for name in names:
+            try:
+                return _snapshot_from_manifest(name[:-5], json.loads((self.snapshots_dir / name).read_bytes()))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return None
+
+    def get(self, snapshot_id):
+        """按编号 (或唯一的编号前缀) 查找备份"""
+        matches = [snapshot for snapshot in self.snapshots() if snapshot.id.startswith(snapshot_id)]
+        if not matches:
+            raise ConfigError(f"备份不存在: {snapshot_id}")
+        exact = [snapshot for snapshot in matches if snapshot.id == snapshot_id]
+        if exact:
+            return exact[0]
+        if len(matches) > 1:
+            raise ConfigError(f"备份编号不唯一: {snapshot_id}")
+        return matches[0]
+
+    @timed()
+    def snapshot(self, config_path, reason=BACKUP_SAVE):
+        """备份配置文件的当前内容, 返回 (Snapshot, 是否新建)
+
+        文件指纹或内容与最新的备份相同时不新建备份; 文件不存在时返回 (None, False)。
+        新建备份后按保留设置删除旧备份。
+        """
+        latest = self.latest()
+        fingerprint = file_fingerprint(config_path)
+        if fingerprint is None:
+            return None, False
+        if latest is not None and latest.fingerprint == fingerprint:
+            return latest, False
+
+        with open(config_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        digest = content_hash(raw)
+        if latest is not None and latest.content_hash == digest:
+            return latest, False
+
+        bounds = chunk_boundaries(raw)
+        view = memoryview(raw)
+        chunks = []
+        for begin, end in zip(bounds, bounds[1:]):
+            chunk_digest, _ = self._put_object(view[begin:end])
+            chunks.append((chunk_digest, end - begin))
+
+        created_at = time.time()
+        stamp = snapshot_stamp(created_at, None if latest is None else latest.id)
+        snapshot = Snapshot(
+            f"{stamp}-{digest[:8]}", created_at, reason, len(raw), digest, fingerprint, chunks
+        )
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.snapshots_dir / f"{snapshot.id}.json", json.dumps({
+            "version": BACKUP_VERSION,
+            "createdAt": created_at,
+            "reason": reason,
+            "size": len(raw),
+            "hash": digest,
+            "fingerprint": list(fingerprint),
+            "chunks": [list(chunk) for chunk in chunks],
+        }).encode('utf-8'))
+
+        self.prune()
+        return snapshot, True
+
+    @timed()
+    def read(self, snapshot):
+        """还原备份的原始字节, 内容哈希不符时抛出 ConfigError"""
+        raw = b"".join(self._get_object(digest) for digest, _ in snapshot.chunks)
+        if content_hash(raw) != snapshot.content_hash:
+            raise ConfigError(f"备份已损坏: {snapshot.id}")
+        return raw
+
+    @timed()
+    def restore(self, snapshot, config_path):
+        """用备份覆盖配置文件 (覆盖前先备份当前内容), 返回写入后的文件指纹"""
+        raw = self.read(snapshot)
+        self.snapshot(config_path, BACKUP_RESTORE)
+        return atomic_write_bytes(config_path, raw)
+
+    # ---- 清理 ----
+
+    @timed()
+    def prune(self, keep_last=None, keep_days=None, now=None):
+        """删除超出保留设置的备份 (最新的一个始终保留), 有删除时回收不再引用的块, 返回删除的备份数"""
+        default_last, default_days = self.retention()
+        keep_last = default_last if keep_last is None else keep_last
+        keep_days = default_days if keep_days is None else keep_days
+        now = time.time() if now is None else now
+
+        try:
+            names = sorted((name for name in os.listdir(self.snapshots_dir) if name.endswith(".json")), reverse=True)
+        except FileNotFoundError:
+            return 0
+
+        expired = []
+        for index, name in enumerate(names[1:], 1):
+            if index >= keep_last:
+                expired.append(name)
+                continue
+            if keep_days:
+                try:
+                    created_at = time.mktime(time.strptime(name[:15], "%Y%m%d-%H%M%S"))
+                except ValueError:
+                    continue
+                if now - created_at > keep_days * 86400:
+                    expired.append(name)
+
+        for name in expired:
+            try:
+                os.unlink(self.snapshots_dir / name)
+            except FileNotFoundError:
+                pass
+        if expired:
+            self.collect_garbage(now)
+        return len(expired)
+
+    def collect_garbage(self, now=None):
+        """删除不被任何备份引用的块, 返回 (删除的块数, 释放的字节数)"""
+        now = time.time() if now is None else now
+        referenced = {digest for snapshot in self.snapshots() for digest, _ in snapshot.chunks}
+        removed = freed = 0
+        for entry, st in self._scan_objects():
+            if entry.name in referenced or now - st.st_mtime < GC_GRACE_SECONDS:
+                continue
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            freed += st.st_size
+        return removed, freed
+
+    def _scan_objects(self):
+        """遍历所有块文件, 产生 (DirEntry, stat)"""
+        try:
+            buckets = list(os.scandir(self.objects_dir))
+        except FileNotFoundError:
+            return
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            with os.scandir(bucket.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        yield entry, entry.stat()
+                    except FileNotFoundError:
+                        continue
+
+    def usage(self):
+        """(备份数, 备份的原始总字节数, 块数, 块占用的字节数)"""
+        snapshots = self.snapshots()
+        objects = stored = 0
+        for _, st in self._scan_objects():
+            objects += 1
+            stored += st.st_size
+        return len(snapshots), sum(snapshot.size for snapshot in snapshots), objects, stored
+
+
+def backup_config(config_path, reason=BACKUP_SAVE):
+    """把配置文件的当前内容加入备份历史, 返回 Snapshot (文件不存在时返回 None)"""
+    snapshot, _ = BackupStore(backup_dir(config_path)).snapshot(config_path, reason)
+    return snapshot
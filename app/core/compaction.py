@@ -0,0 +1,219 @@
+"""
+配置压缩
+找出不再需要的 projects 条目 (目录已不存在, 或长时间没有会话) 并预览可节省的字节,
+把选中的条目移到配置旁的 zip 归档 (~/.claude.json.archive.zip) 中, 需要时再逐条恢复
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import namedtuple
+from pathlib import Path
+
+from .lazy_config import LazySection, member_bytes, member_sizes, remove_members
+from .profiler import timed
+
+
+# 默认的闲置天数
+DEFAULT_IDLE_DAYS = 90
+
+# 清理原因
+REASON_MISSING = "missing"
+REASON_IDLE = "idle"
+
+# 清理候选: 项目路径, 原因, 在配置文件中占用的字节数, 最近活动时间 (时间戳, 未知时为 None)
+CompactionCandidate = namedtuple("CompactionCandidate", "path reason size last_active")
+
+# 归档中的项目: 项目路径, zip 成员名, 归档时间 (时间戳), 原因, 字节数
+ArchivedProject = namedtuple("ArchivedProject", "path member archived_at reason size")
+
+
+def archive_path(config_path):
+    """配置文件对应的归档文件"""
+    return config_path.with_suffix('.json.archive.zip')
+
+
+def transcripts_dir(project_path):
+    """CLI 保存项目会话记录的目录 (~/.claude/projects 下, 路径中的非字母数字字符替换为 -)"""
+    return Path.home() / ".claude" / "projects" / re.sub(r"[^A-Za-z0-9]", "-", project_path)
+
+
+def last_activity(project_path):
+    """项目最近一次活动的时间戳
+
+    取会话记录中最新文件的修改时间; 没有会话记录时取项目目录的修改时间, 都不存在时返回 None。
+    """
+    latest = None
+    try:
+        with os.scandir(transcripts_dir(project_path)) as entries:
+            for entry in entries:
+                mtime = entry.stat().st_mtime
+                if latest is None or mtime > latest:
+                    latest = mtime
+    except OSError:
+        pass
+    if latest is not None:
+        return latest
+
+    try:
+        return os.stat(project_path).st_mtime
+    except OSError:
+        return None
+
+
+@timed()
+def plan_compaction(projects, idle_days=DEFAULT_IDLE_DAYS, prune_missing=True, now=None):
+    """列出可以清理的项目, 按占用字节数从大到小排列
+
+    idle_days 为 None 时不按闲置时间清理。会访问文件系统, 应在后台线程中调用。
+    """
+    now = time.time() if now is None else now
+    candidates = []
+    for path, size in member_sizes(projects).items():
+        if not os.path.isdir(path):
+            if prune_missing:
+                candidates.append(CompactionCandidate(path, REASON_MISSING, size, None))
+            continue
+        if idle_days is None:
+            continue
+        active = last_activity(path)
+        if active is not None and now - active > idle_days * 86400:
+            candidates.append(CompactionCandidate(path, REASON_IDLE, size, active))
+
+    candidates.sort(key=lambda candidate: candidate.size, reverse=True)
+    return candidates
+
+
+def compact_projects(data, paths):
+    """从配置中删除 paths 中的项目, 返回 (删除的路径元组列表, {项目路径: 原始 JSON 字节})
+
+    先取出条目的原始字节 (供写入归档), 再用删除后的新对象替换 data["projects"]。
+    """
+    projects = data.get("projects")
+    if not isinstance(projects, (dict, LazySection)):
+        return [], {}
+
+    removed = {}
+    for path in paths:
+        raw = member_bytes(projects, path)
+        if raw is not None:
+            removed[path] = raw
+    if removed:
+        data["projects"] = remove_members(projects, removed)
+    return [("projects", path) for path in removed], removed
+
+
+def archive_projects(data, paths, archive, reasons=None):
+    """把 paths 中的项目从配置移到归档 archive, 返回 (变化的路径列表, {项目路径: 原始 JSON 字节})
+
+    先从配置中删除 (取出原始字节), 再写入归档; 写入失败时恢复原来的 data["projects"] 并重新抛出异常。
+    """
+    previous = data.get("projects")
+    changes, removed = compact_projects(data, paths)
+    if not removed:
+        return [], {}
+    try:
+        archive.add(removed, reasons)
+    except BaseException:
+        data["projects"] = previous
+        raise
+    return changes, removed
+
+
+class ProjectArchive:
+    """项目归档 (zip)
+
+    每个项目是一个 deflate 压缩的成员, 项目路径等信息保存在成员注释中,
+    因此列出归档只需读取 zip 的中央目录, 恢复时只解压选中的成员。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def exists(self):
+        """归档文件是否存在"""
+        return self.path.exists()
+
+    @timed()
+    def entries(self):
+        """列出归档的项目 (同一项目归档多次时只保留最新的一次)"""
+        if not self.path.exists():
+            return []
+
+        latest = {}
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                try:
+                    meta = json.loads(info.comment.decode('utf-8'))
+                except ValueError:
+                    continue
+                item = ArchivedProject(
+                    meta["path"], info.filename, meta.get("archivedAt", 0), meta.get("reason", ""), info.file_size
+                )
+                current = latest.get(item.path)
+                if current is None or item.archived_at >= current.archived_at:
+                    latest[item.path] = item
+        return sorted(latest.values(), key=lambda item: item.archived_at, reverse=True)
+
+    @timed()
+    def add(self, items, reasons=None):
+        """归档 {项目路径: 原始 JSON 字节}
+
+        在临时副本 (mkstemp 创建, 只允许当前用户读取) 上追加后 fsync 并原子替换,
+        中途失败不会损坏已有的归档。
+        """
+        reasons = reasons or {}
+        archived_at = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if self.path.exists():
+                    with open(self.path, 'rb') as src:
+                        shutil.copyfileobj(src, f)
+            with zipfile.ZipFile(tmp_path, 'a', compression=zipfile.ZIP_DEFLATED) as archive:
+                for index, (path, raw) in enumerate(items.items()):
+                    info = zipfile.ZipInfo(
+                        f"projects/{int(archived_at * 1000)}-{index}.json", time.localtime(archived_at)[:6]
+                    )
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info.comment = json.dumps({
+                        "path": path, "archivedAt": archived_at, "reason": reasons.get(path, "")
+                    }, ensure_ascii=False).encode('utf-8')
+                    archive.writestr(info, raw)
+            with open(tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def read(self, member):
+        """解压并解析一个归档的项目"""
+        with zipfile.ZipFile(self.path) as archive:
+            return json.loads(archive.read(member))
+
+    @timed()
+    def restore(self, data, items):
+        """把归档的项目 (ArchivedProject 列表) 写回配置, 返回变化的路径列表
+
+        配置中已存在的项目不会被覆盖。
+        """
+        projects = data.get("projects")
+        if isinstance(projects, LazySection):
+            projects = data["projects"] = projects.materialize()
+        elif not isinstance(projects, dict):
+            projects = data["projects"] = {}
+
+        changes = []
+        with zipfile.ZipFile(self.path) as archive:
+            for item in items:
+                if item.path in projects:
+                    continue
+                projects[item.path] = json.loads(archive.read(item.member))
+                changes.append(("projects", item.path))
+        return changes
@@ -0,0 +1,115 @@
+"""
+解析结果缓存
+把解析后的配置 (大的子树仍为原始字节) 以 marshal 格式保存在 ~/.cache 下,
+启动时先显示缓存, 再在后台按文件指纹和内容哈希校验
+"""
+import hashlib
+import marshal
+import os
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+from .lazy_config import LazySection
+from .profiler import timed
+
+
+# 缓存格式版本, 格式或解析规则改变时递增
+CACHE_VERSION = 1
+
+CachedConfig = namedtuple("CachedConfig", "data fingerprint content_hash")
+
+
+def cache_dir():
+    """缓存目录 ($XDG_CACHE_HOME 或 ~/.cache 下)"""
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "claude-config-manager"
+
+
+def cache_path(config_path, kind="config"):
+    """配置文件对应的缓存文件, kind 区分同一配置的不同缓存"""
+    name = hashlib.blake2b(str(config_path).encode('utf-8'), digest_size=8).hexdigest()
+    return cache_dir() / f"{kind}-{name}.marshal"
+
+
+def content_hash(raw):
+    """配置文件内容的哈希"""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+@timed()
+def load_cache(config_path):
+    """读取缓存, 不存在或无效时返回 None"""
+    payload = read_cache_file(cache_path(config_path))
+    if (not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION
+            or payload.get("path") != str(config_path)):
+        return None
+
+    lazy_keys = set(payload["lazy"])
+    data = {
+        key: LazySection(value) if key in lazy_keys else value
+        for key, value in payload["sections"].items()
+    }
+    return CachedConfig(data, tuple(payload["fingerprint"]), payload["hash"])
+
+
+@timed()
+def store_cache(config_path, data, fingerprint, raw_hash):
+    """保存缓存 (原子替换); 缓存只是加速手段, 失败时返回 False 而不抛出异常"""
+    if fingerprint is None:
+        return False
+
+    sections = {}
+    lazy_keys = []
+    for key, value in data.items():
+        if isinstance(value, LazySection):
+            sections[key] = value.raw
+            lazy_keys.append(key)
+        else:
+            sections[key] = value
+
+    return write_cache_file(cache_path(config_path), {
+        "version": CACHE_VERSION,
+        "path": str(config_path),
+        "fingerprint": tuple(fingerprint),
+        "hash": raw_hash,
+        "lazy": lazy_keys,
+        "sections": sections,
+    })
+
+
+def read_cache_file(path):
+    """读取 marshal 缓存文件, 不存在或损坏时返回 None"""
+    try:
+        with open(path, 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cache_file(path, payload):
+    """以 marshal 格式原子写入缓存文件, 失败时返回 False"""
+    try:
+        raw = marshal.dumps(payload)
+        # 配置中可能包含令牌, 缓存只允许当前用户读取
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def clear_cache(config_path):
+    """删除缓存"""
+    try:
+        os.unlink(cache_path(config_path))
+    except FileNotFoundError:
+        pass
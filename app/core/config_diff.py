@@ -0,0 +1,94 @@
+"""
+配置比较与三方合并
+"""
+from .config_file import file_fingerprint
+from .lazy_config import LazySection, load_section, parse_config
+from .profiler import timed
+
+
+# 对象中变化的子键超过该数量时, 整体替换该顶层键
+MAX_SUBKEY_CHANGES = 50
+
+_MISSING = object()
+
+
+@timed()
+def diff_config(old, new):
+    """比较两个配置, 返回变化的路径列表
+
+    顶层键和对象的第二层键会被细分, 例如 ("mcpServers", "foo");
+    变化过多时只返回顶层键。
+    """
+    changes = []
+    for key in list(old) + [k for k in new if k not in old]:
+        old_value = old.get(key, _MISSING)
+        new_value = new.get(key, _MISSING)
+        if old_value == new_value:
+            continue
+
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            sub_changes = [
+                (key, sub) for sub in list(old_value) + [s for s in new_value if s not in old_value]
+                if old_value.get(sub, _MISSING) != new_value.get(sub, _MISSING)
+            ]
+            if len(sub_changes) <= MAX_SUBKEY_CHANGES:
+                changes.extend(sub_changes)
+                continue
+        changes.append((key,))
+    return changes
+
+
+def merge_local_changes(theirs, ours, paths):
+    """三方合并: 以磁盘上的新配置为准, 只重放本程序修改过的路径
+
+    paths 是自上次读取/保存 (合并基准) 以来本地修改过的路径集合,
+    空路径表示整个配置被替换。返回合并后的配置 (会修改 theirs)。
+    """
+    if () in paths:
+        return ours
+
+    for path in sorted(paths, key=len):
+        target = theirs
+        source = ours
+        for key in path[:-1]:
+            if not isinstance(source, dict) or key not in source:
+                source = None
+                break
+            if isinstance(source[key], LazySection):
+                # 本地的子树可能仍未解析 (例如压缩后拼接出的 projects)
+                load_section(source, key)
+            if isinstance(target.get(key), LazySection):
+                load_section(target, key)
+            if not isinstance(target.get(key), dict):
+                # 对方没有这一层, 直接使用本地的整棵子树
+                target[key] = source[key]
+                source = None
+                break
+            target = target[key]
+            source = source[key]
+        if source is None:
+            continue
+
+        key = path[-1]
+        if isinstance(source, dict) and key in source:
+            target[key] = source[key]
+        else:
+            target.pop(key, None)
+    return theirs
+
+
+@timed()
+def merge_with_disk(path, snapshot, local_paths, base_fingerprint):
+    """文件自合并基准以来被修改时, 把本地修改合并到磁盘上的新内容中
+
+    返回 (要写入的配置, 外部修改的路径列表)。
+    """
+    fingerprint = file_fingerprint(path)
+    if fingerprint is None or fingerprint == base_fingerprint:
+        # 快速路径: 文件未被修改, 无需重新读取
+        return snapshot, []
+
+    with open(path, 'rb') as f:
+        theirs = parse_config(f.read())
+    merged = merge_local_changes(theirs, snapshot, local_paths)
+    return merged, diff_config(snapshot, merged)
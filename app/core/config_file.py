@@ -0,0 +1,77 @@
+"""
+配置文件读写
+只依赖标准库, GUI 和命令行共用
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from .lazy_config import dumps_config, parse_config
+
+
+def default_config_path():
+    """Claude 配置文件的默认位置"""
+    return Path.home() / ".claude.json"
+
+
+def file_fingerprint(path):
+    """文件指纹 (mtime, size), 文件不存在时返回 None"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def read_config(path):
+    """读取并解析配置文件, 返回 (配置字典, 读取时的文件指纹)
+
+    较大的子树保留为 LazySection, 文件不存在时返回空配置。
+    """
+    try:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+    except FileNotFoundError:
+        return {}, None
+    return parse_config(raw), (st.st_mtime_ns, st.st_size)
+
+
+def write_config(path, data):
+    """把配置序列化后原子写入 path, 返回写入后文件的指纹 (mtime, size)
+
+    不更新解析缓存: 下次启动校验缓存时发现内容不同, 会在后台解析并更新。
+    """
+    return atomic_write_bytes(path, dumps_config(data).encode('utf-8'))
+
+
+def atomic_write_bytes(path, raw):
+    """把 raw 写入同目录的临时文件, fsync 后原子替换 path
+
+    返回写入后文件的指纹 (mtime, size)。
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # 确保目录项 (重命名) 也落盘
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    return (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,104 @@
+"""
+配置修改操作
+直接修改配置字典, 返回变化的路径 (供通知视图和三方合并使用), 未修改时返回 None
+"""
+
+# 功能开关分组对应的顶层键
+FLAG_GROUPS = {
+    "statsig": "cachedStatsigGates",
+    "growthbook": "cachedGrowthBookFeatures",
+}
+
+
+def make_server_entry(command, args, env=None):
+    """生成 mcpServers 中的服务器配置"""
+    entry = {
+        "command": command,
+        "args": list(args)
+    }
+    if env:
+        entry["env"] = dict(env)
+    return entry
+
+
+def set_server(data, name, command, args, env=None):
+    """添加或替换 MCP 服务器"""
+    entry = make_server_entry(command, args, env)
+    servers = data.setdefault("mcpServers", {})
+    if servers.get(name) == entry:
+        return None
+    servers[name] = entry
+    return ("mcpServers", name)
+
+
+def remove_server(data, name):
+    """删除 MCP 服务器"""
+    servers = data.get("mcpServers", {})
+    if name not in servers:
+        return None
+    del servers[name]
+    return ("mcpServers", name)
+
+
+def add_repo(data, name):
+    """添加 GitHub 仓库 (已存在时保留原有路径)"""
+    repos = data.setdefault("githubRepoPaths", {})
+    if name in repos:
+        return None
+    repos[name] = []
+    return ("githubRepoPaths", name)
+
+
+def remove_repo(data, name):
+    """删除 GitHub 仓库及其所有路径"""
+    repos = data.get("githubRepoPaths", {})
+    if name not in repos:
+        return None
+    del repos[name]
+    return ("githubRepoPaths", name)
+
+
+def add_repo_path(data, name, path):
+    """为仓库添加本地路径, 仓库不存在时自动添加"""
+    paths = data.setdefault("githubRepoPaths", {}).setdefault(name, [])
+    if path in paths:
+        return None
+    paths.append(path)
+    return ("githubRepoPaths", name)
+
+
+def add_repo_paths(data, pairs):
+    """批量添加 [(仓库名称, 路径)], 返回变化的路径列表 (每个仓库一项)"""
+    changes = []
+    for name, path in pairs:
+        changed = add_repo_path(data, name, path)
+        if changed is not None and changed not in changes:
+            changes.append(changed)
+    return changes
+
+
+def remove_repo_path(data, name, path):
+    """删除仓库的本地路径"""
+    paths = data.get("githubRepoPaths", {}).get(name, [])
+    if path not in paths:
+        return None
+    paths.remove(path)
+    return ("githubRepoPaths", name)
+
+
+def set_flag(data, group, name, value):
+    """设置功能开关的值"""
+    flags = data.setdefault(FLAG_GROUPS[group], {})
+    if name in flags and flags[name] == value and type(flags[name]) is type(value):
+        return None
+    flags[name] = value
+    return (FLAG_GROUPS[group], name)
+
+
+def remove_flag(data, group, name):
+    """删除功能开关"""
+    flags = data.get(FLAG_GROUPS[group], {})
+    if name not in flags:
+        return None
+    del flags[name]
+    return (FLAG_GROUPS[group], name)
@@ -0,0 +1,189 @@
+"""
+配置存储
+不依赖 Qt 的配置读取、修改和保存接口, 供命令行和脚本使用
+"""
+from . import config_ops
+from .compaction import ProjectArchive, archive_path, archive_projects
+from .config_diff import merge_with_disk
+from .backup_store import backup_config
+from .config_file import atomic_write_bytes, default_config_path, read_config
+from .errors import SaveConflict
+from .json_pointer import delete_value, parse_pointer, resolve, set_value
+from .lazy_config import dumps_config
+from .profiler import timed
+from .section_transfer import merge_sections
+
+
+@timed()
+def save_config(path, data, local_paths, base_fingerprint, backup=True):
+    """保存配置 (GUI 和命令行共用): 先备份, 文件自合并基准以来被修改时与磁盘内容合并, 再原子写入
+
+    返回 (写入的配置, 外部修改的路径列表, 写入后的文件指纹); 合并或序列化时 data 被其他线程修改则抛出 SaveConflict。
+    """
+    if backup:
+        backup_config(path)
+    try:
+        data, changes = merge_with_disk(path, data, local_paths, base_fingerprint)
+        raw = dumps_config(data).encode('utf-8')
+    except RuntimeError as e:
+        # dictionary changed size during iteration 等
+        if "during iteration" not in str(e):
+            raise
+        raise SaveConflict(str(e)) from e
+    return data, changes, atomic_write_bytes(path, raw)
+
+
+def _change_path(data, tokens):
+    """JSON Pointer 修改对应的变化路径 (最多两层, 且只经过对象)"""
+    path = []
+    node = data
+    for token in tokens[:2]:
+        if not isinstance(node, dict):
+            break
+        path.append(token)
+        node = node.get(token)
+    return tuple(path)
+
+
+class ConfigStore:
+    """配置存储
+
+    修改只作用于内存并记录变化的路径; save() 时如果文件在读取后被其他程序
+    (例如 Claude CLI) 修改过, 会以磁盘内容为准重放本地修改。
+    """
+
+    def __init__(self, path=None):
+        self.path = path if path is not None else default_config_path()
+        self.data = {}
+        # 读取/写入时的文件指纹, 即合并基准
+        self.fingerprint = None
+        # 自合并基准以来修改过的路径
+        self.changes = set()
+
+    def load(self):
+        """读取配置文件"""
+        self.data, self.fingerprint = read_config(self.path)
+        self.changes = set()
+        return self.data
+
+    @property
+    def modified(self):
+        """是否有尚未保存的修改"""
+        return bool(self.changes)
+
+    def record(self, path):
+        """记录变化的路径, 原样返回"""
+        if path is not None:
+            self.changes.add(path)
+        return path
+
+    def save(self, backup=True):
+        """保存修改, 没有修改时返回 False"""
+        if not self.changes:
+            return False
+
+        self.data, _, self.fingerprint = save_config(self.path, self.data, self.changes, self.fingerprint, backup)
+        self.changes = set()
+        return True
+
+    # ---- 按 JSON Pointer 读写 ----
+
+    def get(self, pointer):
+        """读取 JSON Pointer 指向的值"""
+        return resolve(self.data, parse_pointer(pointer))
+
+    def set(self, pointer, value):
+        """设置 JSON Pointer 指向的值"""
+        tokens = parse_pointer(pointer)
+        set_value(self.data, tokens, value)
+        return self.record(_change_path(self.data, tokens))
+
+    def delete(self, pointer):
+        """删除 JSON Pointer 指向的值"""
+        tokens = parse_pointer(pointer)
+        delete_value(self.data, tokens)
+        return self.record(_change_path(self.data, tokens))
+
+    # ---- MCP 服务器 ----
+
+    def servers(self):
+        """mcpServers 字典"""
+        return self.data.get("mcpServers", {})
+
+    def set_server(self, name, command, args=(), env=None):
+        """添加或替换 MCP 服务器"""
+        return self.record(config_ops.set_server(self.data, name, command, args, env))
+
+    def remove_server(self, name):
+        """删除 MCP 服务器"""
+        return self.record(config_ops.remove_server(self.data, name))
+
+    # ---- GitHub 仓库 ----
+
+    def repos(self):
+        """githubRepoPaths 字典"""
+        return self.data.get("githubRepoPaths", {})
+
+    def add_repo(self, name):
+        """添加 GitHub 仓库"""
+        return self.record(config_ops.add_repo(self.data, name))
+
+    def remove_repo(self, name):
+        """删除 GitHub 仓库"""
+        return self.record(config_ops.remove_repo(self.data, name))
+
+    def add_repo_path(self, name, path):
+        """为仓库添加本地路径"""
+        return self.record(config_ops.add_repo_path(self.data, name, path))
+
+    def add_repo_paths(self, pairs):
+        """批量添加 [(仓库名称, 路径)], 返回变化的仓库数"""
+        changes = config_ops.add_repo_paths(self.data, pairs)
+        self.changes.update(changes)
+        return len(changes)
+
+    def remove_repo_path(self, name, path):
+        """删除仓库的本地路径"""
+        return self.record(config_ops.remove_repo_path(self.data, name, path))
+
+    # ---- 功能开关 ----
+
+    def flags(self, group):
+        """功能开关字典, group 为 "statsig" 或 "growthbook" """
+        return self.data.get(config_ops.FLAG_GROUPS[group], {})
+
+    def set_flag(self, group, name, value):
+        """设置功能开关"""
+        return self.record(config_ops.set_flag(self.data, group, name, value))
+
+    def remove_flag(self, group, name):
+        """删除功能开关"""
+        return self.record(config_ops.remove_flag(self.data, group, name))
+
+    # ---- 按部分导入 ----
+
+    def import_sections(self, sections):
+        """合并导入的部分 (read_sections 的结果), 返回变化的路径数"""
+        changes = merge_sections(self.data, sections)
+        self.changes.update(changes)
+        return len(changes)
+
+    # ---- 项目归档 ----
+
+    def archive(self):
+        """配置文件对应的项目归档"""
+        return ProjectArchive(archive_path(self.path))
+
+    def compact_projects(self, paths, reasons=None):
+        """把项目移到归档, 返回归档的项目数 (写入归档失败时配置保持不变)"""
+        changes, removed = archive_projects(self.data, paths, self.archive(), reasons)
+        self.changes.update(changes)
+        return len(removed)
+
+    def restore_projects(self, paths):
+        """从归档恢复项目 (配置中已存在的不覆盖), 返回恢复的项目数"""
+        paths = set(paths)
+        items = [item for item in self.archive().entries() if item.path in paths]
+        changes = self.archive().restore(self.data, items)
+        self.changes.update(changes)
+        return len(changes)
@@ -0,0 +1,11 @@
+"""
+配置核心的异常类型
+"""
+
+
+class ConfigError(Exception):
+    """配置读取或修改失败 (键不存在、路径无效等)"""
+
+
+class SaveConflict(ConfigError):
+    """保存时配置正在被其他线程修改 (序列化或合并时字典大小改变), 应稍后用新的快照重新保存"""
@@ -0,0 +1,203 @@
+"""
+结构化比较
+比较两份配置 (原始字节), 列出新增、删除和修改的路径; 相同的子树直接比较字节跳过, 不解析,
+只有不同的成员才解析后逐层比较, 数组元素按标识 (id、name 等键或内容) 配对
+"""
+import json
+from collections import namedtuple
+
+from .lazy_config import LazySection, index_members, index_top_level, json_default
+from .profiler import timed
+
+
+# 变化类型
+DIFF_ADDED = "added"
+DIFF_REMOVED = "removed"
+DIFF_CHANGED = "changed"
+DIFF_REORDERED = "reordered"
+
+DIFF_LABELS = {
+    DIFF_ADDED: "新增",
+    DIFF_REMOVED: "删除",
+    DIFF_CHANGED: "修改",
+    DIFF_REORDERED: "顺序改变",
+}
+
+# 按字节比较时, 超过该大小的对象按成员继续切分, 较小的直接解析
+SPLIT_MIN_BYTES = 16 * 1024
+
+# 新增/删除的值超过该大小时保留为 LazySection, 显示时才解析
+LAZY_VALUE_BYTES = 4 * 1024
+
+# 数组元素可用作标识的键 (按顺序尝试)
+IDENTITY_KEYS = ("id", "name", "path", "uri", "url", "key")
+
+# 一处变化: 路径 (键和数组下标的元组), 类型, 旧值, 新值 (不存在时为 None)
+DiffEntry = namedtuple("DiffEntry", "path kind old new")
+
+
+class DiffCancelled(Exception):
+    """比较被取消"""
+
+
+def _raw_value(raw):
+    """新增/删除的成员值: 较小的直接解析, 较大的保留原始字节"""
+    if len(raw) >= LAZY_VALUE_BYTES and raw[:1] in (b"{", b"["):
+        return LazySection(raw)
+    return json.loads(raw)
+
+
+def _identity_key(old, new):
+    """数组元素的标识键: 所有元素都是含该键的对象且键值在各自数组中唯一, 没有时返回 None"""
+    items = old + new
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for key in IDENTITY_KEYS:
+        values_old = [item.get(key) for item in old]
+        values_new = [item.get(key) for item in new]
+        if any(not isinstance(value, (str, int)) or isinstance(value, bool) for value in values_old + values_new):
+            continue
+        if len(set(values_old)) == len(values_old) and len(set(values_new)) == len(values_new):
+            return key
+    return None
+
+
+def _content_key(value):
+    """按内容配对时的键"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=json_default)
+
+
+class JsonDiff:
+    """结构化比较
+
+    cancelled 为返回 bool 的函数, 比较过程中定期检查, 返回 True 时抛出 DiffCancelled。
+    """
+
+    def __init__(self, cancelled=None):
+        self.cancelled = cancelled
+        self.entries = []
+        # 按字节跳过的相同成员数, 及解析后比较的成员数
+        self.skipped = 0
+        self.parsed = 0
+
+    def check_cancelled(self):
+        """被取消时抛出 DiffCancelled"""
+        if self.cancelled is not None and self.cancelled():
+            raise DiffCancelled()
+
+    @timed()
+    def compare_raw(self, old_raw, new_raw):
+        """比较两份配置的原始字节, 返回 DiffEntry 列表 (按文件中的顺序)"""
+        if old_raw == new_raw:
+            return self.entries
+        old_members = index_top_level(old_raw)
+        new_members = index_top_level(new_raw)
+        if old_members is None or new_members is None:
+            # 不是缩进 2 的格式, 完整解析后比较
+            self.compare_values(json.loads(old_raw), json.loads(new_raw), ())
+        else:
+            self._compare_members(old_raw, old_members, new_raw, new_members, (), 2)
+        return self.entries
+
+    def _compare_members(self, old_raw, old_members, new_raw, new_members, path, indent):
+        """按字节比较两个对象的成员, 不同的成员再切分或解析"""
+        old_ranges = {key: (start, stop) for key, start, stop in old_members}
+        new_ranges = {key: (start, stop) for key, start, stop in new_members}
+        for index, (key, start, stop) in enumerate(old_members):
+            if index % 1024 == 0:
+                self.check_cancelled()
+            other = new_ranges.get(key)
+            if other is None:
+                self.entries.append(DiffEntry(path + (key,), DIFF_REMOVED, _raw_value(old_raw[start:stop]), None))
+                continue
+            old_value = old_raw[start:stop]
+            if stop - start == other[1] - other[0]:
+                new_value = new_raw[other[0]:other[1]]
+                if old_value == new_value:
+                    self.skipped += 1
+                    continue
+            else:
+                new_value = new_raw[other[0]:other[1]]
+            self._compare_raw_value(old_value, new_value, path + (key,), indent + 2)
+
+        for key, start, stop in new_members:
+            if key not in old_ranges:
+                self.entries.append(DiffEntry(path + (key,), DIFF_ADDED, None, _raw_value(new_raw[start:stop])))
+
+    def _compare_raw_value(self, old_raw, new_raw, path, indent):
+        """比较一个成员的两个不同版本: 较大的对象继续按成员切分, 否则解析后比较"""
+        if (len(old_raw) >= SPLIT_MIN_BYTES and len(new_raw) >= SPLIT_MIN_BYTES
+                and old_raw[:1] == b"{" and new_raw[:1] == b"{"):
+            old_members = index_members(old_raw, indent)
+            new_members = index_members(new_raw, indent)
+            if old_members is not None and new_members is not None:
+                self._compare_members(old_raw, old_members, new_raw, new_members, path, indent)
+                return
+        self.parsed += 1
+        self.compare_values(json.loads(old_raw), json.loads(new_raw), path)
+
+    def compare_values(self, old, new, path):
+        """比较两个解析后的值"""
+        if isinstance(old, LazySection):
+            old = old.materialize()
+        if isinstance(new, LazySection):
+            new = new.materialize()
+        if old == new:
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key, value in old.items():
+                if key not in new:
+                    self.entries.append(DiffEntry(path + (key,), DIFF_REMOVED, value, None))
+                elif value != new[key]:
+                    self.compare_values(value, new[key], path + (key,))
+            for key, value in new.items():
+                if key not in old:
+                    self.entries.append(DiffEntry(path + (key,), DIFF_ADDED, None, value))
+        elif isinstance(old, list) and isinstance(new, list):
+            self._compare_lists(old, new, path)
+        else:
+            self.entries.append(DiffEntry(path, DIFF_CHANGED, old, new))
+
+    def _compare_lists(self, old, new, path):
+        """按标识配对数组元素; 路径中的下标为元素在所在数组中的位置"""
+        key = _identity_key(old, new)
+        if key is not None:
+            old_ids = [item[key] for item in old]
+            new_ids = [item[key] for item in new]
+        else:
+            old_ids = [_content_key(item) for item in old]
+            new_ids = [_content_key(item) for item in new]
+
+        # 相同标识 (按内容配对时可能重复) 按出现顺序一一配对
+        unmatched = {}
+        for index, identity in enumerate(old_ids):
+            unmatched.setdefault(identity, []).append(index)
+        matched = []
+        for new_index, identity in enumerate(new_ids):
+            candidates = unmatched.get(identity)
+            if candidates:
+                old_index = candidates.pop(0)
+                matched.append(old_index)
+                if key is not None and old[old_index] != new[new_index]:
+                    self.compare_values(old[old_index], new[new_index], path + (new_index,))
+            else:
+                self.entries.append(DiffEntry(path + (new_index,), DIFF_ADDED, None, new[new_index]))
+        for indexes in unmatched.values():
+            for old_index in indexes:
+                self.entries.append(DiffEntry(path + (old_index,), DIFF_REMOVED, old[old_index], None))
+
+        if matched != sorted(matched):
+            self.entries.append(DiffEntry(path, DIFF_REORDERED, old, new))
+
+
+def diff_raw(old_raw, new_raw, cancelled=None):
+    """比较两份配置的原始字节, 返回 DiffEntry 列表"""
+    return JsonDiff(cancelled).compare_raw(old_raw, new_raw)
+
+
+def summarize_diff(entries):
+    """{变化类型: 数量}"""
+    counts = dict.fromkeys(DIFF_LABELS, 0)
+    for entry in entries:
+        counts[entry.kind] += 1
+    return counts
@@ -0,0 +1,95 @@
+"""
+JSON Pointer (RFC 6901)
+例如 "/mcpServers/foo/command", "~1" 表示 "/", "~0" 表示 "~"
+"""
+from .errors import ConfigError
+from .lazy_config import LazySection
+
+
+def parse_pointer(pointer):
+    """把 JSON Pointer 拆分为键列表, 空字符串表示整个文档"""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ConfigError(f"JSON Pointer 必须以 / 开头: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def format_pointer(tokens):
+    """把键列表转换为 JSON Pointer"""
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def _list_index(node, token, allow_append=False):
+    """把键转换为列表下标"""
+    if allow_append and token == "-":
+        return len(node)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise ConfigError(f"无效的数组下标: {token}")
+    index = int(token)
+    if index >= len(node) + (1 if allow_append else 0):
+        raise ConfigError(f"数组下标越界: {token}")
+    return index
+
+
+def _child(node, token):
+    """取子节点, 尚未解析的子树会被解析并替换"""
+    if isinstance(node, dict):
+        if token not in node:
+            raise ConfigError(f"键不存在: {token}")
+        child = node[token]
+        if isinstance(child, LazySection):
+            child = node[token] = child.materialize()
+        return child
+    if isinstance(node, list):
+        return node[_list_index(node, token)]
+    raise ConfigError(f"无法在非容器值中查找: {token}")
+
+
+def resolve(data, tokens):
+    """按键列表取值"""
+    node = data
+    for token in tokens:
+        node = _child(node, token)
+    return node
+
+
+def set_value(data, tokens, value):
+    """按键列表设置值, 缺少的中间对象会被创建; 数组下标 "-" 表示追加"""
+    if not tokens:
+        raise ConfigError("不能替换整个配置")
+
+    node = data
+    for token in tokens[:-1]:
+        if isinstance(node, dict) and token not in node:
+            node[token] = {}
+        node = _child(node, token)
+
+    key = tokens[-1]
+    if isinstance(node, dict):
+        node[key] = value
+    elif isinstance(node, list):
+        index = _list_index(node, key, allow_append=True)
+        if index == len(node):
+            node.append(value)
+        else:
+            node[index] = value
+    else:
+        raise ConfigError(f"无法在非容器值中设置: {key}")
+
+
+def delete_value(data, tokens):
+    """按键列表删除值"""
+    if not tokens:
+        raise ConfigError("不能删除整个配置")
+
+    node = resolve(data, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(node, dict):
+        if key not in node:
+            raise ConfigError(f"键不存在: {key}")
+        del node[key]
+    elif isinstance(node, list):
+        del node[_list_index(node, key)]
+    else:
+        raise ConfigError(f"无法在非容器值中删除: {key}")
@@ -0,0 +1,236 @@
+"""
+按需解析的配置
+CLI 总是以缩进 2 写入配置文件, 因此可以用正则找到每个顶层键的字节范围:
+小的键立即解析, 大的子树 (例如 projects 中的历史记录) 只保留原始字节, 用到时再解析
+"""
+import json
+import re
+
+from .profiler import timed
+
+
+# 可以延迟解析的顶层键
+LAZY_KEYS = ("projects",)
+
+# 小于该字节数的段落直接解析
+LAZY_MIN_BYTES = 64 * 1024
+
+# 缩进 2 的文件中, 字符串内不会出现原始换行, 因此 "\n" 加 indent 个空格再加引号只可能是该层的键
+_MEMBER_KEY_PATTERN = rb'\n%s("(?:[^"\\\n]|\\.)*"): '
+_member_key_res = {}
+
+
+class LazySection:
+    """尚未解析的顶层值, 保存其原始 JSON 字节 (缩进 2, 位于第一层)
+
+    对象不可变; 解析后由调用方用结果替换配置中的占位对象 (见 load_section)。
+    """
+
+    __slots__ = ('raw',)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    @property
+    def size(self):
+        """原始字节数"""
+        return len(self.raw)
+
+    def materialize(self):
+        """解析原始字节"""
+        return json.loads(self.raw)
+
+    def text(self):
+        """原始 JSON 文本 (与写入文件时的第一层缩进一致)"""
+        return self.raw.decode('utf-8')
+
+    def __eq__(self, other):
+        if isinstance(other, LazySection):
+            return self.raw == other.raw or self.materialize() == other.materialize()
+        return self.materialize() == other
+
+    __hash__ = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"LazySection({len(self.raw)} bytes)"
+
+
+def _strip_end(raw, pos):
+    """跳过 pos 之前的空白, 返回新的结束位置 (不复制数据)"""
+    while pos > 0 and raw[pos - 1] in b" \t\r\n":
+        pos -= 1
+    return pos
+
+
+def index_members(raw, indent=2):
+    """缩进 2 的 JSON 对象中每个成员值的字节范围 [(键, 开始, 结束)], 格式不符时返回 None
+
+    indent 为成员键所在行的缩进: 整个配置为 2, 第一层值 (例如 projects 的原始字节) 为 4。
+    """
+    key_re = _member_key_res.get(indent)
+    if key_re is None:
+        key_re = _member_key_res[indent] = re.compile(_MEMBER_KEY_PATTERN % (b" " * indent))
+
+    end = _strip_end(raw, len(raw))
+    if end == 0 or raw[end - 1:end] != b"}":
+        return None
+
+    matches = list(key_re.finditer(raw, 0, end))
+    if not matches or raw[:matches[0].start()].strip() != b"{":
+        return None
+
+    sections = []
+    for i, match in enumerate(matches):
+        if i + 1 < len(matches):
+            stop = _strip_end(raw, matches[i + 1].start())
+            if raw[stop - 1:stop] != b",":
+                return None
+            stop -= 1
+        else:
+            stop = end - 1
+        sections.append((json.loads(match.group(1)), match.end(), _strip_end(raw, stop)))
+    return sections
+
+
+def index_top_level(raw):
+    """缩进 2 的配置中每个顶层值的字节范围 [(键, 开始, 结束)], 格式不符时返回 None"""
+    return index_members(raw, 2)
+
+
+@timed()
+def parse_config(raw, lazy_keys=LAZY_KEYS):
+    """解析配置文件的原始字节, lazy_keys 中较大的顶层值保留为 LazySection
+
+    文件不是缩进 2 格式时退回到完整解析。
+    """
+    sections = index_top_level(raw) if lazy_keys else None
+    if sections is None:
+        return json.loads(raw)
+
+    data = {}
+    try:
+        for key, start, stop in sections:
+            if key in lazy_keys and stop - start >= LAZY_MIN_BYTES and raw[start:start + 1] in (b"{", b"["):
+                data[key] = LazySection(raw[start:stop])
+            else:
+                data[key] = json.loads(raw[start:stop])
+    except ValueError:
+        # 例如键名中含有被误判的内容, 交给完整解析报告准确的错误位置
+        return json.loads(raw)
+    return data
+
+
+def _dumps_member(value, indent):
+    """序列化位于 indent 缩进的键之后的值, 与缩进 2 的文件中的文本一致"""
+    return json.dumps(value, indent=2, ensure_ascii=False, default=json_default).replace("\n", "\n" + " " * indent)
+
+
+def member_sizes(value, indent=4):
+    """对象中每个成员在文件中占用的字节数 (含键名和分隔符) {键: 字节数}
+
+    value 为位于 indent - 2 缩进处的对象或 LazySection; 未解析时按字节范围计算, 不解析内容。
+    """
+    if isinstance(value, LazySection):
+        members = index_members(value.raw, indent)
+        if members is not None:
+            raw = value.raw
+            return {key: stop - start + (start - raw.rfind(b"\n", 0, start)) + 1 for key, start, stop in members}
+        value = value.materialize()
+    if not isinstance(value, dict):
+        return {}
+    return {
+        key: indent + len(json.dumps(str(key), ensure_ascii=False).encode('utf-8')) + 2
+        + len(_dumps_member(item, indent).encode('utf-8')) + 2
+        for key, item in value.items()
+    }
+
+
+def member_keys(value, indent=4):
+    """对象的键列表, 未解析时只扫描键所在的行"""
+    if isinstance(value, LazySection):
+        members = index_members(value.raw, indent)
+        if members is not None:
+            return [key for key, _, _ in members]
+        value = value.materialize()
+    return list(value) if isinstance(value, dict) else []
+
+
+def member_bytes(value, key, indent=4):
+    """对象中一个成员值的 JSON 字节, 未解析时直接切取原始字节; 不存在时返回 None"""
+    if isinstance(value, LazySection):
+        members = index_members(value.raw, indent)
+        if members is not None:
+            for member_key, start, stop in members:
+                if member_key == key:
+                    return value.raw[start:stop]
+            return None
+        value = value.materialize()
+    if not isinstance(value, dict) or key not in value:
+        return None
+    return _dumps_member(value[key], indent).encode('utf-8')
+
+
+def remove_members(value, keys, indent=4):
+    """返回删除了 keys 中成员的新对象, 不修改 value
+
+    LazySection 直接拼接其余成员的原始字节, 结果仍不解析 (变小后低于 LAZY_MIN_BYTES 时解析)。
+    """
+    keys = set(keys)
+    if isinstance(value, LazySection):
+        raw = value.raw
+        members = index_members(raw, indent)
+        if members is not None:
+            pad = b" " * indent
+            kept = [
+                pad + json.dumps(key, ensure_ascii=False).encode('utf-8') + b": " + raw[start:stop]
+                for key, start, stop in members if key not in keys
+            ]
+            if not kept:
+                return {}
+            closing = b"\n" + b" " * (indent - 2) + b"}"
+            section = b"{\n" + b",\n".join(kept) + closing
+            if len(section) < LAZY_MIN_BYTES:
+                return json.loads(section)
+            return LazySection(section)
+        value = value.materialize()
+    return {key: item for key, item in value.items() if key not in keys}
+
+
+def load_section(data, key):
+    """取出顶层值, 尚未解析时解析并替换占位对象"""
+    value = data.get(key)
+    if isinstance(value, LazySection):
+        value = data[key] = value.materialize()
+    return value
+
+
+def json_default(value):
+    """json.dumps 的 default: 解析遇到的 LazySection"""
+    if isinstance(value, LazySection):
+        return value.materialize()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_section(value):
+    """序列化一个顶层值, 缩进与其在配置文件中的位置一致; LazySection 直接使用原始文本"""
+    if isinstance(value, LazySection):
+        return value.text()
+    return json.dumps(value, indent=2, ensure_ascii=False, default=json_default).replace("\n", "\n  ")
+
+
+@timed()
+def dumps_config(data):
+    """序列化整个配置, 结果与 json.dumps(data, indent=2) 相同, 但不解析 LazySection"""
+    if not isinstance(data, dict) or not data:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=json_default)
+    parts = [
+        "  " + json.dumps(str(key), ensure_ascii=False) + ": " + dumps_section(value)
+        for key, value in data.items()
+    ]
+    return "{\n" + ",\n".join(parts) + "\n}"
@@ -0,0 +1,180 @@
+"""
+MCP 服务器清单
+通过 stdio 获取服务器的 tools/list 和 resources/list, 按服务器定义 (command、args、env) 的哈希缓存在磁盘上,
+在有效期内浏览不会启动任何进程, 定义改变后才需要重新获取
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import namedtuple
+
+from .config_cache import cache_path, read_cache_file, write_cache_file
+from .mcp_probe import (
+    DEFAULT_PROBE_CONCURRENCY, DEFAULT_PROBE_TIMEOUT, McpError, McpStdioClient, is_remote_server,
+    remote_server_message, run_per_server, unexpected_error_message
+)
+from .profiler import timed
+
+
+# 清单缓存格式版本
+INVENTORY_CACHE_VERSION = 1
+
+# 默认的有效期 (秒)
+DEFAULT_INVENTORY_TTL = 24 * 3600
+
+# 分页获取列表时最多请求的页数
+MAX_LIST_PAGES = 100
+
+# JSON-RPC 的 "方法不存在" 错误码
+_METHOD_NOT_FOUND = -32601
+
+# 服务器清单: 名称, 获取时间 (时间戳), 服务器信息, 工具列表, 资源列表, 错误信息, 是否来自缓存,
+# 是否因是远程服务器而未获取 (此时错误信息为说明)
+McpInventory = namedtuple("McpInventory", "name fetched_at server_info tools resources error cached skipped")
+
+
+def definition_key(config):
+    """服务器定义的哈希 (command、args 和 env), 定义不变时缓存的清单可以继续使用"""
+    definition = {
+        "command": config.get("command", ""),
+        "args": config.get("args") or [],
+        "env": config.get("env") or {},
+    }
+    text = json.dumps(definition, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+async def list_all(client, method, field):
+    """按 nextCursor 分页获取完整列表; 服务器不支持该方法时返回空列表"""
+    items = []
+    params = None
+    for _ in range(MAX_LIST_PAGES):
+        try:
+            result = await client.request(method, params)
+        except McpError as e:
+            if e.code == _METHOD_NOT_FOUND:
+                return items
+            raise
+        page = result.get(field)
+        if isinstance(page, list):
+            items.extend(item for item in page if isinstance(item, dict))
+        cursor = result.get("nextCursor")
+        if not cursor:
+            break
+        params = {"cursor": cursor}
+    return items
+
+
+async def fetch_inventory(name, config, timeout=DEFAULT_PROBE_TIMEOUT):
+    """启动服务器, 握手后获取工具和资源列表, 返回 McpInventory"""
+    client = McpStdioClient(config)
+    try:
+        await asyncio.wait_for(client.start(), timeout)
+        result = await asyncio.wait_for(client.initialize(), timeout)
+        capabilities = result.get("capabilities") or {}
+        server_info = result.get("serverInfo")
+        tools = resources = []
+        # 没有声明对应能力的服务器不发送请求
+        if "tools" in capabilities:
+            tools = await asyncio.wait_for(list_all(client, "tools/list", "tools"), timeout)
+        if "resources" in capabilities:
+            resources = await asyncio.wait_for(list_all(client, "resources/list", "resources"), timeout)
+        return McpInventory(
+            name, time.time(), server_info if isinstance(server_info, dict) else {}, tools, resources, "", False,
+            False
+        )
+    except McpError as e:
+        return McpInventory(name, time.time(), {}, [], [], str(e), False, False)
+    except asyncio.TimeoutError:
+        return McpInventory(name, time.time(), {}, [], [], f"{timeout:g} 秒内没有响应", False, False)
+    except Exception as e:
+        return McpInventory(name, time.time(), {}, [], [], unexpected_error_message(e), False, False)
+    finally:
+        await client.close()
+
+
+class InventoryCache:
+    """服务器清单缓存
+
+    entries 为 {定义哈希: (获取时间, 服务器信息, 工具列表, 资源列表)}; 获取失败的结果和未获取的远程服务器不缓存,
+    服务器修复后下次浏览即可重新获取。只在获取线程中修改。
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, name, config, ttl=DEFAULT_INVENTORY_TTL, now=None):
+        """有效期内的缓存清单, 没有时返回 None"""
+        entry = self.entries.get(definition_key(config))
+        now = time.time() if now is None else now
+        if entry is None or now - entry[0] > ttl:
+            return None
+        fetched_at, server_info, tools, resources = entry
+        return McpInventory(name, fetched_at, server_info, tools, resources, "", True, False)
+
+    def put(self, config, inventory):
+        """缓存获取成功的清单"""
+        if not inventory.error and not inventory.skipped:
+            self.entries[definition_key(config)] = (
+                inventory.fetched_at, inventory.server_info, inventory.tools, inventory.resources
+            )
+
+    def prune(self, ttl=DEFAULT_INVENTORY_TTL, now=None):
+        """删除过期的清单 (定义改变后旧定义的清单也会在过期后删除)"""
+        now = time.time() if now is None else now
+        self.entries = {key: entry for key, entry in self.entries.items() if now - entry[0] <= ttl}
+
+    @timed()
+    def refresh(self, servers, ttl=DEFAULT_INVENTORY_TTL, force=False, timeout=DEFAULT_PROBE_TIMEOUT,
+                concurrency=DEFAULT_PROBE_CONCURRENCY, on_result=None, cancelled=None):
+        """获取 {名称: 配置} 的清单, 返回 (清单列表, 启动的进程数)
+
+        有效期内的清单直接取自缓存 (force 为 True 时除外), 其余在新的事件循环中并发获取;
+        远程服务器不启动进程也不缓存。会启动子进程, 应在后台线程中调用。
+        """
+        results = []
+        missing = {}
+        for name, config in servers.items():
+            if not isinstance(config, dict):
+                continue
+            if is_remote_server(config):
+                skipped = McpInventory(name, time.time(), {}, [], [], remote_server_message(config), False, True)
+                results.append(skipped)
+                if on_result is not None:
+                    on_result(skipped)
+                continue
+            cached = None if force else self.get(name, config, ttl)
+            if cached is None:
+                missing[name] = config
+                continue
+            results.append(cached)
+            if on_result is not None:
+                on_result(cached)
+        if not missing:
+            return results, 0
+
+        async def fetch(name, config):
+            inventory = await fetch_inventory(name, config, timeout)
+            self.put(config, inventory)
+            return inventory
+
+        results.extend(asyncio.run(run_per_server(missing, fetch, concurrency, on_result, cancelled)))
+        return results, len(missing)
+
+    def load(self, config_path):
+        """从磁盘读取缓存, 成功时返回 True"""
+        payload = read_cache_file(cache_path(config_path, "mcp-inventory"))
+        if (not isinstance(payload, dict) or payload.get("version") != INVENTORY_CACHE_VERSION
+                or payload.get("path") != str(config_path)):
+            return False
+        self.entries = payload["entries"]
+        return True
+
+    def store(self, config_path):
+        """把缓存写入磁盘, 失败时返回 False"""
+        return write_cache_file(cache_path(config_path, "mcp-inventory"), {
+            "version": INVENTORY_CACHE_VERSION,
+            "path": str(config_path),
+            "entries": self.entries,
+        })
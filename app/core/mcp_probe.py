@@ -0,0 +1,304 @@
+"""
+MCP 服务器检测
+用 asyncio 子进程并发启动配置中的服务器 (使用各自的 env), 完成 MCP initialize 握手,
+记录启动耗时、握手耗时和失败原因; 启动慢的服务器会拖慢每一次 CLI 会话
+"""
+import asyncio
+import json
+import os
+import shutil
+import time
+from collections import namedtuple
+
+from .. import __version__
+from .profiler import timed
+
+
+# 默认的握手超时 (秒)
+DEFAULT_PROBE_TIMEOUT = 15.0
+
+# 同时启动的服务器数
+DEFAULT_PROBE_CONCURRENCY = 8
+
+# 发送给服务器的协议版本
+PROTOCOL_VERSION = "2024-11-05"
+
+# 单条消息的最大长度 (tools/list 的结果可能很大)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# 错误输出中保留的尾部字节数
+STDERR_TAIL_BYTES = 2000
+
+# 检测结果
+PROBE_OK = "ok"
+PROBE_TIMEOUT = "timeout"
+PROBE_SPAWN_FAILED = "spawn_failed"
+PROBE_EXITED = "exited"
+PROBE_ERROR = "error"
+PROBE_SKIPPED = "skipped"
+
+PROBE_LABELS = {
+    PROBE_OK: "正常",
+    PROBE_TIMEOUT: "超时",
+    PROBE_SPAWN_FAILED: "无法启动",
+    PROBE_EXITED: "进程退出",
+    PROBE_ERROR: "握手失败",
+    PROBE_SKIPPED: "未检测 (远程服务器)",
+}
+
+# 检测结果: 服务器名称, 状态, 启动耗时 (秒), 启动到握手完成的耗时 (秒, 未完成时为 None),
+# 服务器信息 (initialize 结果中的 serverInfo), 错误信息
+ProbeResult = namedtuple("ProbeResult", "name status spawn_time init_time server_info error")
+
+
+class McpError(Exception):
+    """MCP 通信失败, status 为检测结果中的状态, code 为服务器返回的 JSON-RPC 错误码"""
+
+    def __init__(self, status, message, code=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def is_remote_server(config):
+    """通过 URL 连接的服务器 (type 为 http/sse 等, 或只有 url 没有 command), 不能通过 stdio 启动"""
+    server_type = config.get("type") or "stdio"
+    return server_type != "stdio" or (bool(config.get("url")) and not config.get("command"))
+
+
+def remote_server_message(config):
+    """远程服务器不检测的说明"""
+    return f"{config.get('type') or 'url'} 服务器 {config.get('url', '')}".strip() + ", 不启动进程"
+
+
+def check_server_config(config):
+    """检查服务器定义中字段的类型, 格式错误时抛出 McpError (不启动进程)"""
+    if not config.get("command"):
+        raise McpError(PROBE_SPAWN_FAILED, "没有配置 command")
+    if not isinstance(config["command"], str):
+        raise McpError(PROBE_SPAWN_FAILED, "command 必须是字符串")
+    if not isinstance(config.get("args") or [], list):
+        raise McpError(PROBE_SPAWN_FAILED, "args 必须是数组")
+    if not isinstance(config.get("env") or {}, dict):
+        raise McpError(PROBE_SPAWN_FAILED, "env 必须是对象")
+
+
+def unexpected_error_message(error):
+    """未预料到的异常的说明"""
+    return f"{type(error).__name__}: {error}"
+
+
+def server_environment(config):
+    """服务器进程的环境变量: 当前环境加上配置中的 env"""
+    env = dict(os.environ)
+    env.update({str(key): str(value) for key, value in (config.get("env") or {}).items()})
+    return env
+
+
+def resolve_command(command, env):
+    """按服务器的 PATH 查找命令 (Windows 上 npx 等为 .cmd, 需要完整路径)"""
+    return shutil.which(command, path=env.get("PATH")) or command
+
+
+class McpStdioClient:
+    """通过 stdio 与 MCP 服务器通信的最小客户端 (按行分隔的 JSON-RPC)"""
+
+    def __init__(self, config):
+        self.config = config
+        self.process = None
+        self.spawn_time = None
+        self._next_id = 0
+        self._stderr = bytearray()
+        self._stderr_task = None
+
+    async def start(self):
+        """启动服务器进程"""
+        check_server_config(self.config)
+        env = server_environment(self.config)
+        command = resolve_command(self.config["command"], env)
+        args = [str(arg) for arg in self.config.get("args") or []]
+        start = time.perf_counter()
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                command, *args, env=env, limit=MAX_MESSAGE_BYTES,
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            )
+        except (OSError, ValueError) as e:
+            raise McpError(PROBE_SPAWN_FAILED, str(e)) from e
+        self.spawn_time = time.perf_counter() - start
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+
+    async def _drain_stderr(self):
+        """持续读取错误输出 (只保留尾部), 避免管道写满阻塞服务器"""
+        while True:
+            chunk = await self.process.stderr.read(65536)
+            if not chunk:
+                return
+            self._stderr += chunk
+            del self._stderr[:-STDERR_TAIL_BYTES]
+
+    def stderr_tail(self):
+        """错误输出的最后几行"""
+        return bytes(self._stderr).decode('utf-8', errors='replace').strip()
+
+    async def _send(self, message):
+        """发送一条消息"""
+        try:
+            self.process.stdin.write(json.dumps(message).encode('utf-8') + b"\n")
+            await self.process.stdin.drain()
+        except (ConnectionError, OSError) as e:
+            raise McpError(PROBE_EXITED, f"写入失败: {e}") from e
+
+    async def notify(self, method, params=None):
+        """发送通知"""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def request(self, method, params=None):
+        """发送请求并等待对应的响应, 返回 result; 服务器返回错误时抛出 McpError"""
+        self._next_id += 1
+        request_id = self._next_id
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+        while True:
+            try:
+                line = await self.process.stdout.readline()
+            except ValueError as e:
+                raise McpError(PROBE_ERROR, f"消息过长: {e}") from e
+            if not line:
+                await self._wait_stderr()
+                detail = self.stderr_tail()
+                code = self.process.returncode
+                message = "进程已退出" if code is None else f"进程已退出 (退出码 {code})"
+                raise McpError(PROBE_EXITED, message + (f": {detail}" if detail else ""))
+            try:
+                response = json.loads(line)
+            except ValueError:
+                # 服务器打印到 stdout 的日志
+                continue
+            if not isinstance(response, dict) or response.get("id") != request_id:
+                # 通知或服务器发起的请求
+                continue
+            if "error" in response:
+                error = response["error"] if isinstance(response["error"], dict) else {}
+                raise McpError(
+                    PROBE_ERROR, f"{error.get('code', '')} {error.get('message', '')}".strip(), error.get("code")
+                )
+            return response.get("result") or {}
+
+    async def initialize(self):
+        """MCP 握手, 返回 initialize 的结果"""
+        result = await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "claude-config-manager", "version": __version__},
+        })
+        await self.notify("notifications/initialized")
+        return result
+
+    async def _wait_stderr(self):
+        """stdout 关闭后等待进程退出、错误输出读完"""
+        try:
+            await asyncio.wait_for(self.process.wait(), 1)
+            if self._stderr_task is not None:
+                await asyncio.wait_for(asyncio.shield(self._stderr_task), 1)
+        except asyncio.TimeoutError:
+            pass
+
+    async def close(self):
+        """关闭 stdin 让服务器退出, 超时后结束进程"""
+        process = self.process
+        if process is None:
+            return
+        if process.returncode is None:
+            try:
+                process.stdin.close()
+                await asyncio.wait_for(process.wait(), 1)
+            except (asyncio.TimeoutError, OSError):
+                pass
+        if process.returncode is None:
+            try:
+                process.terminate()
+                await asyncio.wait_for(process.wait(), 2)
+            except ProcessLookupError:
+                pass
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+
+
+async def probe_server(name, config, timeout=DEFAULT_PROBE_TIMEOUT):
+    """启动一个服务器并完成握手, 返回 ProbeResult; 远程服务器不启动, 状态为 PROBE_SKIPPED"""
+    if is_remote_server(config):
+        return ProbeResult(name, PROBE_SKIPPED, None, None, {}, remote_server_message(config))
+    client = McpStdioClient(config)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.start(), timeout)
+        result = await asyncio.wait_for(client.initialize(), timeout)
+        init_time = time.perf_counter() - start
+        server_info = result.get("serverInfo") if isinstance(result, dict) else None
+        if not isinstance(server_info, dict):
+            server_info = {}
+        return ProbeResult(name, PROBE_OK, client.spawn_time, init_time, server_info, "")
+    except McpError as e:
+        return ProbeResult(name, e.status, client.spawn_time, None, {}, str(e))
+    except asyncio.TimeoutError:
+        detail = client.stderr_tail()
+        message = f"{timeout:g} 秒内没有完成握手" + (f": {detail}" if detail else "")
+        return ProbeResult(name, PROBE_TIMEOUT, client.spawn_time, None, {}, message)
+    except Exception as e:
+        # 单个服务器的意外错误不能中断整个检测
+        return ProbeResult(name, PROBE_ERROR, client.spawn_time, None, {}, unexpected_error_message(e))
+    finally:
+        await client.close()
+
+
+async def run_per_server(servers, func, concurrency=DEFAULT_PROBE_CONCURRENCY, on_result=None, cancelled=None):
+    """对 {名称: 配置} 中的每个服务器并发执行协程 func(名称, 配置), 返回结果列表 (按完成顺序)
+
+    每完成一个调用 on_result(result); cancelled 为返回 bool 的函数, 返回 True 时取消所有尚未完成的任务
+    (已启动的进程由各任务的 finally 关闭)。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(name, config):
+        async with semaphore:
+            return await func(name, config)
+
+    pending = {asyncio.ensure_future(limited(name, config)) for name, config in servers.items()}
+    results = []
+    while pending:
+        done, pending = await asyncio.wait(pending, timeout=0.1, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            result = task.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        if pending and cancelled is not None and cancelled():
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            break
+    return results
+
+
+@timed()
+def probe_servers(servers, timeout=DEFAULT_PROBE_TIMEOUT, concurrency=DEFAULT_PROBE_CONCURRENCY, on_result=None,
+                  cancelled=None):
+    """在新的事件循环中并发检测服务器 (阻塞到全部完成, 应在后台线程中调用)"""
+    servers = {name: config for name, config in servers.items() if isinstance(config, dict)}
+    if not servers:
+        return []
+
+    async def probe(name, config):
+        return await probe_server(name, config, timeout)
+
+    return asyncio.run(run_per_server(servers, probe, concurrency, on_result, cancelled))
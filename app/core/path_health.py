@@ -0,0 +1,228 @@
+"""
+仓库路径检查
+检查 githubRepoPaths 中的每个本地路径是否仍然存在、是否为 git 仓库、远程地址是否指向该仓库。
+stat 和读取 .git/config 在线程池中并发执行 (网络挂载的目录上单次 stat 可能很慢),
+结果按目录和 .git 的修改时间缓存, 未变化的路径只需两次 stat
+"""
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .config_cache import cache_path, read_cache_file, write_cache_file
+
+
+# 路径缓存格式版本
+PATH_CACHE_VERSION = 1
+
+# 默认的并发数
+DEFAULT_WORKERS = 16
+
+# 检查结果
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_NOT_GIT = "not_git"
+STATUS_MISMATCH = "mismatch"
+STATUS_ERROR = "error"
+
+STATUS_LABELS = {
+    STATUS_OK: "正常",
+    STATUS_MISSING: "不存在",
+    STATUS_NOT_GIT: "不是 git 仓库",
+    STATUS_MISMATCH: "远程不匹配",
+    STATUS_ERROR: "无法读取",
+}
+
+# 检查结果: 仓库名称, 本地路径, 状态, 远程仓库 (owner/repo 元组)
+PathHealth = namedtuple("PathHealth", "repo path status remotes")
+
+_REMOTE_URL_RE = re.compile(
+    r"^(?:[a-z+]+://)?(?:[^@/]+@)?(?P<host>[^/:]+)(?::\d+)?[:/](?P<slug>[^?#]+?)(?:\.git)?/*$",
+    re.IGNORECASE,
+)
+
+
+def repo_slug(url):
+    """从远程地址解析 owner/repo, 无法解析时返回 None
+
+    支持 git@host:owner/repo.git、https://host/owner/repo 和 ssh://git@host:22/owner/repo 等形式。
+    """
+    match = _REMOTE_URL_RE.match(url.strip())
+    if match is None:
+        return None
+    parts = match.group("slug").strip("/").split("/")
+    if len(parts) < 2 or not all(parts[-2:]):
+        return None
+    return "/".join(parts[-2:])
+
+
+def parse_remote_urls(text):
+    """从 git 配置文本中取出所有 remote 的 url, origin 排在最前"""
+    urls = []
+    remote = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            remote = None
+            if line.lower().startswith("[remote "):
+                remote = line[len("[remote "):].rstrip("]").strip().strip('"')
+        elif remote is not None and "=" in line:
+            name, _, value = line.partition("=")
+            if name.strip().lower() == "url":
+                urls.append((remote != "origin", value.strip().strip('"')))
+    return [url for _, url in sorted(urls, key=lambda item: item[0])]
+
+
+def git_config_path(path):
+    """仓库的 config 文件 (.git 为文件时按 gitdir 和 commondir 找到主仓库), 不是仓库时返回 None"""
+    dot_git = os.path.join(path, ".git")
+    if os.path.isdir(dot_git):
+        return os.path.join(dot_git, "config")
+    if not os.path.isfile(dot_git):
+        return None
+
+    # 工作树或子模块: .git 文件中为 "gitdir: <路径>"
+    with open(dot_git, encoding='utf-8', errors='replace') as f:
+        line = f.readline().strip()
+    if not line.startswith("gitdir:"):
+        return None
+    git_dir = os.path.join(path, line[len("gitdir:"):].strip())
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding='utf-8') as f:
+            git_dir = os.path.join(git_dir, f.read().strip())
+    except OSError:
+        pass
+    return os.path.join(git_dir, "config")
+
+
+def read_remotes(path):
+    """读取仓库的远程仓库 (owner/repo 元组), 不是 git 仓库时返回 None"""
+    config = git_config_path(path)
+    if config is None:
+        return None
+    try:
+        with open(config, encoding='utf-8', errors='replace') as f:
+            urls = parse_remote_urls(f.read())
+    except FileNotFoundError:
+        return None
+    slugs = (repo_slug(url) for url in urls)
+    return tuple(dict.fromkeys(slug for slug in slugs if slug))
+
+
+def path_signature(path):
+    """路径的签名: (目录的 mtime, .git 的 mtime), 目录不存在时返回 None
+
+    修改远程地址会替换 .git/config, 从而改变 .git 目录的 mtime。
+    """
+    try:
+        dir_mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    try:
+        git_mtime = os.stat(os.path.join(path, ".git")).st_mtime_ns
+    except FileNotFoundError:
+        git_mtime = 0
+    return (dir_mtime, git_mtime)
+
+
+def health_status(repo, remotes):
+    """由远程仓库判断路径状态 (remotes 为 None 表示不是 git 仓库)"""
+    if remotes is None:
+        return STATUS_NOT_GIT
+    # 没有远程的本地仓库无法判断, 视为正常
+    if remotes and repo.lower() not in (slug.lower() for slug in remotes):
+        return STATUS_MISMATCH
+    return STATUS_OK
+
+
+class PathHealthChecker:
+    """仓库路径检查器
+
+    entries 为 {本地路径: (签名, 远程仓库元组或 None)}, 只在检查线程中修改;
+    远程仓库与所属的仓库无关, 同一路径配置在多个仓库下时只检查一次。
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def _inspect(self, path):
+        """检查单个路径, 返回 (签名, 远程仓库); 签名未变时不读取 git 配置"""
+        signature = path_signature(path)
+        if signature is None:
+            return None, None
+        cached = self.entries.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached
+        return signature, read_remotes(path)
+
+    def check(self, repo_paths, max_workers=DEFAULT_WORKERS, cancelled=None, prune=False):
+        """并发检查 [(仓库名称, 路径)], 按完成顺序逐个产出 PathHealth
+
+        cancelled 为返回 bool 的函数, 返回 True 时取消尚未开始的检查。
+        prune 为 True 时 (检查的是全部路径) 检查完成后删除不再出现的路径的缓存。
+        """
+        by_path = {}
+        for repo, path in repo_paths:
+            by_path.setdefault(str(path), []).append(repo)
+        if not by_path:
+            if prune:
+                self.entries = {}
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="path-health")
+        try:
+            futures = {executor.submit(self._inspect, path): path for path in by_path}
+            for future in as_completed(futures):
+                if cancelled is not None and cancelled():
+                    break
+                path = futures[future]
+                try:
+                    signature, remotes = future.result()
+                except OSError:
+                    self.entries.pop(path, None)
+                    for repo in by_path[path]:
+                        yield PathHealth(repo, path, STATUS_ERROR, ())
+                    continue
+
+                if signature is None:
+                    self.entries.pop(path, None)
+                    for repo in by_path[path]:
+                        yield PathHealth(repo, path, STATUS_MISSING, ())
+                    continue
+
+                self.entries[path] = (signature, remotes)
+                for repo in by_path[path]:
+                    yield PathHealth(repo, path, health_status(repo, remotes), remotes or ())
+            else:
+                if prune:
+                    self.entries = {path: self.entries[path] for path in by_path if path in self.entries}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def load(self, config_path):
+        """从磁盘读取上次的缓存, 成功时返回 True"""
+        payload = read_cache_file(cache_path(config_path, "paths"))
+        if (not isinstance(payload, dict) or payload.get("version") != PATH_CACHE_VERSION
+                or payload.get("path") != str(config_path)):
+            return False
+        self.entries = payload["entries"]
+        return True
+
+    def store(self, config_path):
+        """把缓存写入磁盘, 失败时返回 False"""
+        return write_cache_file(cache_path(config_path, "paths"), {
+            "version": PATH_CACHE_VERSION,
+            "path": str(config_path),
+            "entries": self.entries,
+        })
+
+
+def repo_path_pairs(github_repos):
+    """githubRepoPaths 中所有的 (仓库名称, 路径)"""
+    return [
+        (repo, path)
+        for repo, paths in (github_repos or {}).items()
+        if isinstance(paths, list)
+        for path in paths
+        if isinstance(path, str)
+    ]
@@ -0,0 +1,132 @@
+"""
+轻量级性能记录
+把热点操作的耗时和内存块增量记录到环形缓冲区, 可导出为 Chrome Trace JSON
+(chrome://tracing 或 https://ui.perfetto.dev 打开)
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+
+# 环形缓冲区容量, 超出后丢弃最早的记录
+DEFAULT_CAPACITY = 10000
+
+# 一条记录: 开始时间和耗时为纳秒, alloc_blocks 为 sys.getallocatedblocks() 的增量
+ProfileRecord = namedtuple(
+    "ProfileRecord", "name category start_ns duration_ns alloc_blocks thread_id thread_name args"
+)
+
+
+class Profiler:
+    """性能记录器
+
+    deque 的 append 是线程安全的, 后台线程也可以直接记录。
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.records = deque(maxlen=capacity)
+        self.enabled = True
+
+    @property
+    def capacity(self):
+        """环形缓冲区容量"""
+        return self.records.maxlen
+
+    @contextmanager
+    def span(self, name, category="app"):
+        """记录 with 块的耗时; 可向 yield 出的字典中添加附加信息"""
+        if not self.enabled:
+            yield {}
+            return
+
+        args = {}
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            duration = time.perf_counter_ns() - start
+            thread = threading.current_thread()
+            self.records.append(ProfileRecord(
+                name, category, start, duration, sys.getallocatedblocks() - blocks,
+                thread.ident, thread.name, args
+            ))
+
+    def clear(self):
+        """清空记录"""
+        self.records.clear()
+
+    def snapshot(self):
+        """当前记录的列表 (按时间顺序)"""
+        return list(self.records)
+
+    def summary(self):
+        """按名称汇总: {名称: {count, total_ns, max_ns, last_ns, alloc_blocks}}"""
+        result = {}
+        for record in self.snapshot():
+            item = result.get(record.name)
+            if item is None:
+                item = result[record.name] = {
+                    "count": 0, "total_ns": 0, "max_ns": 0, "last_ns": 0, "alloc_blocks": 0
+                }
+            item["count"] += 1
+            item["total_ns"] += record.duration_ns
+            item["max_ns"] = max(item["max_ns"], record.duration_ns)
+            item["last_ns"] = record.duration_ns
+            item["alloc_blocks"] += record.alloc_blocks
+        return result
+
+    def chrome_trace(self):
+        """转换为 Chrome Trace Event 格式"""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for record in self.snapshot():
+            threads[record.thread_id] = record.thread_name
+            args = dict(record.args)
+            args["alloc_blocks"] = record.alloc_blocks
+            events.append({
+                "name": record.name,
+                "cat": record.category,
+                "ph": "X",
+                "ts": record.start_ns / 1000,
+                "dur": record.duration_ns / 1000,
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": args,
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                "args": {"name": thread_name},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """把记录写入 Chrome Trace JSON 文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+# 全局记录器
+profiler = Profiler()
+
+
+def timed(name=None, category="app"):
+    """装饰器: 记录函数每次调用的耗时, 名称默认为函数的限定名"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.span(label, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,174 @@
+"""
+项目用量统计
+汇总 projects 中每个项目最近一次会话的费用、令牌、耗时和代码行数。
+每个项目的统计按内容签名缓存, 配置更新后只重新计算变化的项目;
+projects 尚未解析 (LazySection) 时按字节范围切分, 只解析签名变化的项目
+"""
+import heapq
+import json
+import zlib
+from numbers import Number
+
+from .config_cache import cache_path, read_cache_file, write_cache_file
+from .lazy_config import LazySection, index_members
+from .profiler import timed
+
+
+# 统计缓存格式版本
+STATS_CACHE_VERSION = 1
+
+# (项目中的字段, 统计名), 统计元组按此顺序保存
+STAT_FIELDS = (
+    ("lastCost", "cost"),
+    ("lastDuration", "duration"),
+    ("lastAPIDuration", "api_duration"),
+    ("lastTotalInputTokens", "input_tokens"),
+    ("lastTotalOutputTokens", "output_tokens"),
+    ("lastTotalCacheCreationInputTokens", "cache_creation_tokens"),
+    ("lastTotalCacheReadInputTokens", "cache_read_tokens"),
+    ("lastLinesAdded", "lines_added"),
+    ("lastLinesRemoved", "lines_removed"),
+)
+STAT_NAMES = tuple(name for _, name in STAT_FIELDS)
+
+_COST = STAT_NAMES.index("cost")
+_DURATION = STAT_NAMES.index("duration")
+_TOKENS = tuple(STAT_NAMES.index(name) for name in (
+    "input_tokens", "output_tokens", "cache_creation_tokens", "cache_read_tokens"
+))
+
+# 会话耗时分桶: (上限毫秒, 标签), None 表示无上限
+DURATION_BUCKETS = (
+    (60 * 1000, "< 1 分钟"),
+    (10 * 60 * 1000, "1-10 分钟"),
+    (60 * 60 * 1000, "10-60 分钟"),
+    (4 * 60 * 60 * 1000, "1-4 小时"),
+    (None, "> 4 小时"),
+)
+
+# 排行榜默认长度
+DEFAULT_TOP_N = 20
+
+
+def project_stats(entry):
+    """单个项目的统计元组 (按 STAT_FIELDS 顺序), 没有会话记录时返回 None"""
+    if not isinstance(entry, dict):
+        return None
+    values = [entry.get(field) for field, _ in STAT_FIELDS]
+    if all(value is None for value in values):
+        return None
+    return tuple(
+        value if isinstance(value, Number) and not isinstance(value, bool) else 0
+        for value in values
+    )
+
+
+def total_tokens(stats):
+    """统计元组中各类令牌之和"""
+    return sum(stats[i] for i in _TOKENS)
+
+
+def _iter_raw_projects(raw):
+    """未解析的 projects: 逐个产出 (路径, 签名, 原始字节范围), 格式不符时返回 None"""
+    members = index_members(raw, 4)
+    if members is None:
+        return None
+    view = memoryview(raw)
+    # 签名只用于发现变化, 长度加 CRC32 比加密哈希快数倍
+    return (
+        (path, (stop - start, zlib.crc32(view[start:stop])), start, stop)
+        for path, start, stop in members
+    )
+
+
+class ProjectStatsCache:
+    """按项目缓存的统计
+
+    entries 为 {项目路径: (签名, 统计元组或 None)}。未解析的项目以原始字节的长度和 CRC32 为签名,
+    已解析的项目以统计元组本身为签名 (提取字段的开销与比较签名相当)。
+    """
+
+    def __init__(self):
+        self.entries = {}
+        # 上次统计的未解析 projects 原始字节, 相同时整体跳过
+        self.section_raw = None
+
+    @timed()
+    def update(self, projects):
+        """按当前的 projects 更新缓存, 返回重新计算的项目数"""
+        entries = {}
+        recomputed = 0
+
+        if isinstance(projects, LazySection) and projects.raw == self.section_raw:
+            return 0
+        self.section_raw = None
+
+        raw_projects = _iter_raw_projects(projects.raw) if isinstance(projects, LazySection) else None
+        if raw_projects is not None:
+            raw = projects.raw
+            for path, signature, start, stop in raw_projects:
+                cached = self.entries.get(path)
+                if cached is not None and cached[0] == signature:
+                    entries[path] = cached
+                    continue
+                entries[path] = (signature, project_stats(json.loads(raw[start:stop])))
+                recomputed += 1
+            self.section_raw = raw
+        else:
+            if isinstance(projects, LazySection):
+                projects = projects.materialize()
+            for path, entry in (projects or {}).items():
+                stats = project_stats(entry)
+                cached = self.entries.get(path)
+                if cached is not None and cached[0] == stats:
+                    entries[path] = cached
+                    continue
+                entries[path] = (stats, stats)
+                recomputed += 1
+
+        self.entries = entries
+        return recomputed
+
+    def load(self, config_path):
+        """从磁盘读取上次的缓存, 成功时返回 True"""
+        payload = read_cache_file(cache_path(config_path, "stats"))
+        if (not isinstance(payload, dict) or payload.get("version") != STATS_CACHE_VERSION
+                or payload.get("path") != str(config_path)):
+            return False
+        self.entries = payload["entries"]
+        self.section_raw = None
+        return True
+
+    def store(self, config_path):
+        """把缓存写入磁盘, 失败时返回 False"""
+        return write_cache_file(cache_path(config_path, "stats"), {
+            "version": STATS_CACHE_VERSION,
+            "path": str(config_path),
+            "entries": self.entries,
+        })
+
+    @timed()
+    def summarize(self, top_n=DEFAULT_TOP_N):
+        """汇总: 总计、费用/令牌排行和耗时分桶"""
+        sessions = [(path, stats) for path, (_, stats) in self.entries.items() if stats is not None]
+
+        totals = dict.fromkeys(STAT_NAMES, 0)
+        buckets = [[label, 0, 0] for _, label in DURATION_BUCKETS]
+        for _, stats in sessions:
+            for name, value in zip(STAT_NAMES, stats):
+                totals[name] += value
+            duration = stats[_DURATION]
+            for bucket, (limit, _) in zip(buckets, DURATION_BUCKETS):
+                if limit is None or duration < limit:
+                    bucket[1] += 1
+                    bucket[2] += stats[_COST]
+                    break
+
+        return {
+            "projects": len(self.entries),
+            "sessions": len(sessions),
+            "totals": totals,
+            "top_cost": heapq.nlargest(top_n, sessions, key=lambda item: item[1][_COST]),
+            "top_tokens": heapq.nlargest(top_n, sessions, key=lambda item: total_tokens(item[1])),
+            "duration_buckets": [tuple(bucket) for bucket in buckets],
+        }
@@ -0,0 +1,174 @@
+"""
+仓库发现
+在选定的根目录下并发扫描 git 检出, 从远程地址得到 owner/repo, 生成合并到 githubRepoPaths 的建议。
+每个目录的子目录列表按目录的 mtime 缓存: 再次扫描时未变化的目录只需一次 stat, 不再列出内容
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .config_cache import cache_path, read_cache_file, write_cache_file
+from .path_health import DEFAULT_WORKERS, path_signature, read_remotes
+
+
+# 发现缓存格式版本
+DISCOVERY_CACHE_VERSION = 1
+
+# 默认的扫描深度 (根目录的子目录为 1)
+DEFAULT_SCAN_DEPTH = 4
+
+# 不进入的目录 (依赖、构建产物、虚拟环境等); 以 . 开头的目录也不进入
+IGNORED_DIRS = frozenset({
+    "node_modules", "bower_components", "vendor", "target", "build", "dist", "out",
+    "venv", "env", "site-packages", "__pycache__", "Library", "Applications", "AppData",
+})
+
+# 子项超过此数量的目录不再深入 (多为数据或缓存目录)
+MAX_DIR_ENTRIES = 5000
+
+# 缓存项的类型
+_KIND_DIR = "dir"
+_KIND_REPO = "repo"
+
+# 发现的仓库: 本地路径, 远程仓库 (owner/repo 元组, origin 在前)
+DiscoveredRepo = namedtuple("DiscoveredRepo", "path remotes")
+
+
+def _is_under(path, root):
+    """path 是否为 root 或其下的路径"""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class RepoScanner:
+    """仓库扫描器
+
+    entries 为 {目录: (类型, 签名, 内容)}: 普通目录的签名为 mtime, 内容为要进入的子目录名;
+    仓库的签名为 path_signature, 内容为远程仓库。只在扫描线程中修改。
+    """
+
+    def __init__(self):
+        self.entries = {}
+        # 上次扫描的根目录及扫描的目录数
+        self.roots = []
+        self.scanned_count = 0
+
+    def _scan_dir(self, path):
+        """扫描单个目录, 返回缓存项; 目录不存在时返回 None"""
+        cached = self.entries.get(path)
+        if cached is not None and cached[0] == _KIND_REPO:
+            signature = path_signature(path)
+            if signature is None:
+                return None
+            if signature == cached[1]:
+                return cached
+        else:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                return None
+            if cached is not None and cached[1] == mtime:
+                return cached
+
+        subdirs = []
+        count = 0
+        is_repo = False
+        with os.scandir(path) as entries:
+            for entry in entries:
+                count += 1
+                if entry.name == ".git":
+                    is_repo = True
+                    break
+                if count > MAX_DIR_ENTRIES:
+                    subdirs = []
+                    break
+                if (entry.name.startswith(".") or entry.name in IGNORED_DIRS
+                        or not entry.is_dir(follow_symlinks=False)):
+                    continue
+                subdirs.append(entry.name)
+
+        if is_repo:
+            # 子模块和嵌套的仓库不再单独列出
+            return (_KIND_REPO, path_signature(path), read_remotes(path))
+        mtime = os.stat(path).st_mtime_ns
+        return (_KIND_DIR, mtime, tuple(subdirs))
+
+    def scan(self, roots, max_depth=DEFAULT_SCAN_DEPTH, max_workers=DEFAULT_WORKERS, cancelled=None):
+        """并发扫描根目录, 按发现顺序逐个产出 DiscoveredRepo
+
+        每完成一个目录就提交它的子目录, 慢速目录不会阻塞其他分支。
+        扫描完成后替换这些根目录下的缓存 (删除已不存在的目录), 取消时不修改缓存。
+        """
+        roots = list(dict.fromkeys(os.path.abspath(os.path.expanduser(root)) for root in roots))
+        scanned = {}
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="repo-scan")
+        try:
+            pending = {executor.submit(self._scan_dir, root): (root, 0) for root in roots}
+            while pending:
+                if cancelled is not None and cancelled():
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, depth = pending.pop(future)
+                    try:
+                        entry = future.result()
+                    except OSError:
+                        # 没有权限等, 跳过该目录
+                        continue
+                    if entry is None:
+                        continue
+                    scanned[path] = entry
+                    if entry[0] == _KIND_REPO:
+                        if entry[2] is not None:
+                            yield DiscoveredRepo(path, entry[2])
+                    elif depth < max_depth:
+                        for name in entry[2]:
+                            child = os.path.join(path, name)
+                            pending[executor.submit(self._scan_dir, child)] = (child, depth + 1)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        entries = {
+            path: entry for path, entry in self.entries.items()
+            if not any(_is_under(path, root) for root in roots)
+        }
+        entries.update(scanned)
+        self.entries = entries
+        self.roots = roots
+        self.scanned_count = len(scanned)
+
+    def load(self, config_path):
+        """从磁盘读取上次的缓存, 成功时返回 True"""
+        payload = read_cache_file(cache_path(config_path, "discovery"))
+        if not isinstance(payload, dict) or payload.get("version") != DISCOVERY_CACHE_VERSION:
+            return False
+        self.entries = payload["entries"]
+        self.roots = list(payload["roots"])
+        return True
+
+    def store(self, config_path):
+        """把缓存写入磁盘, 失败时返回 False"""
+        return write_cache_file(cache_path(config_path, "discovery"), {
+            "version": DISCOVERY_CACHE_VERSION,
+            "roots": self.roots,
+            "entries": self.entries,
+        })
+
+
+def plan_repo_merge(github_repos, discovered):
+    """发现的仓库中尚未配置的 [(仓库名称, 路径, 其他远程仓库)]
+
+    仓库名称取 origin (没有时取第一个远程); 已配置在任意仓库下的路径不再建议, 没有远程的仓库无法确定名称, 跳过。
+    """
+    known = {
+        os.path.normpath(path)
+        for paths in (github_repos or {}).values() if isinstance(paths, list)
+        for path in paths if isinstance(path, str)
+    }
+    proposals = []
+    for repo in discovered:
+        if not repo.remotes or os.path.normpath(repo.path) in known:
+            continue
+        proposals.append((repo.remotes[0], repo.path, repo.remotes[1:]))
+    proposals.sort(key=lambda item: (item[0].lower(), item[1]))
+    return proposals
@@ -0,0 +1,277 @@
+"""
+按部分导出和导入
+只导出选中的顶层键或其中的部分成员 (例如 mcpServers, 或 githubRepoPaths 中的几个仓库), 边序列化边写入 (可 gzip 压缩);
+导入时只解析选中的部分并合并到当前配置, 不必传递或解析整个项目历史
+"""
+import gzip
+import json
+import os
+import tempfile
+from collections import namedtuple
+
+from .errors import ConfigError
+from .lazy_config import LazySection, dumps_section, index_members, index_top_level, json_default, load_section
+from .profiler import timed
+
+
+# 写入文件前累积的字符数
+EXPORT_BUFFER_CHARS = 256 * 1024
+
+# gzip 文件头
+GZIP_MAGIC = b"\x1f\x8b"
+
+# 导出文件中的一个顶层键: 键名, 字节数, 成员键列表 (值不是对象时为 None)
+SectionInfo = namedtuple("SectionInfo", "key size members")
+
+
+def parse_selection(specs):
+    """把 "键" 或 "键:成员" 列表解析为选择 {键: None (整个键) 或成员列表}
+
+    成员名中可以含有 ":" 和 "/" (例如项目路径), 只按第一个 ":" 切分。
+    """
+    selection = {}
+    for spec in specs:
+        key, sep, member = spec.partition(":")
+        if not key:
+            raise ConfigError(f"无效的部分: {spec}")
+        if not sep:
+            selection[key] = None
+        elif key not in selection or selection[key] is not None:
+            selection.setdefault(key, []).append(member)
+    return selection
+
+
+def _iter_value(value, indent):
+    """逐段序列化位于 indent 缩进处的值 (str 或 bytes), 与缩进 2 的配置文件中的文本一致"""
+    if isinstance(value, LazySection):
+        # 原始字节即为缩进 2 处的文本, 其他位置需要重新缩进
+        if indent == 2:
+            yield value.raw
+            return
+        value = value.materialize()
+    pad = "\n" + " " * indent
+    encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=json_default)
+    for chunk in encoder.iterencode(value):
+        yield chunk.replace("\n", pad) if "\n" in chunk else chunk
+
+
+def _iter_members(value, members):
+    """逐段序列化对象中选中的成员 (缩进 2 处的对象), 未解析的对象直接切取成员的原始字节"""
+    if isinstance(value, LazySection):
+        indexed = index_members(value.raw, 4)
+        if indexed is None:
+            value = value.materialize()
+        else:
+            wanted = set(members)
+            ranges = [(key, start, stop) for key, start, stop in indexed if key in wanted]
+            if not ranges:
+                yield "{}"
+                return
+            yield "{"
+            for index, (key, start, stop) in enumerate(ranges):
+                yield ("\n" if index == 0 else ",\n") + "    " + json.dumps(key, ensure_ascii=False) + ": "
+                yield value.raw[start:stop]
+            yield "\n  }"
+            return
+
+    if not isinstance(value, dict):
+        raise ConfigError("只能从对象中选择成员")
+    keys = [key for key in members if key in value]
+    if not keys:
+        yield "{}"
+        return
+    yield "{"
+    for index, key in enumerate(keys):
+        yield ("\n" if index == 0 else ",\n") + "    " + json.dumps(key, ensure_ascii=False) + ": "
+        yield from _iter_value(value[key], 4)
+    yield "\n  }"
+
+
+def iter_export(data, selection=None):
+    """逐段序列化配置中选中的部分 (str 或 bytes), 格式与配置文件相同 (缩进 2)
+
+    selection 为 parse_selection 的结果, None 表示整个配置; 配置中不存在的键被忽略。
+    """
+    keys = [key for key in data if selection is None or key in selection]
+    if not keys:
+        yield "{}"
+        return
+    yield "{"
+    for index, key in enumerate(keys):
+        yield ("\n" if index == 0 else ",\n") + "  " + json.dumps(str(key), ensure_ascii=False) + ": "
+        members = None if selection is None else selection[key]
+        if members is None:
+            yield from _iter_value(data[key], 2)
+        else:
+            yield from _iter_members(data[key], members)
+    yield "\n}"
+
+
+@timed()
+def export_sections(data, path, selection=None, compress=None):
+    """把选中的部分写入 path, 返回写入的 (未压缩) 字节数
+
+    compress 为 None 时按扩展名 (.gz) 判断是否 gzip 压缩; 先写同目录的临时文件, 完成后原子替换。
+    """
+    if compress is None:
+        compress = path.suffix == ".gz"
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    written = 0
+    try:
+        with os.fdopen(fd, 'wb') as raw_file:
+            f = gzip.GzipFile(fileobj=raw_file, mode='wb', mtime=0) if compress else raw_file
+            buffer = []
+            buffered = 0
+            for chunk in iter_export(data, selection):
+                if isinstance(chunk, bytes):
+                    pending = "".join(buffer).encode('utf-8')
+                    f.write(pending)
+                    f.write(chunk)
+                    written += len(pending) + len(chunk)
+                    buffer = []
+                    buffered = 0
+                    continue
+                buffer.append(chunk)
+                buffered += len(chunk)
+                if buffered >= EXPORT_BUFFER_CHARS:
+                    pending = "".join(buffer).encode('utf-8')
+                    f.write(pending)
+                    written += len(pending)
+                    buffer = []
+                    buffered = 0
+            pending = "".join(buffer).encode('utf-8')
+            f.write(pending)
+            written += len(pending)
+            if compress:
+                f.close()
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return written
+
+
+def read_raw(path):
+    """读取配置或导出文件的原始字节, gzip 压缩的文件 (按文件头判断) 自动解压"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if raw[:2] == GZIP_MAGIC:
+        return gzip.decompress(raw)
+    return raw
+
+
+def _member_keys(raw):
+    """对象值 (缩进 2 处) 的成员键, 不是对象时返回 None"""
+    if raw[:1] != b"{":
+        return None
+    members = index_members(raw, 4)
+    if members is not None:
+        return [key for key, _, _ in members]
+    value = json.loads(raw)
+    return list(value) if isinstance(value, dict) else None
+
+
+@timed()
+def list_sections(raw):
+    """列出文件中的顶层键 [SectionInfo], 缩进 2 格式的文件不解析值"""
+    sections = index_top_level(raw)
+    if sections is not None:
+        return [SectionInfo(key, stop - start, _member_keys(raw[start:stop])) for key, start, stop in sections]
+
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ConfigError("文件内容不是 JSON 对象")
+    return [
+        SectionInfo(key, len(dumps_section(value).encode('utf-8')), list(value) if isinstance(value, dict) else None)
+        for key, value in data.items()
+    ]
+
+
+def missing_sections(sections, selection):
+    """选择中在文件里不存在的部分, 返回 "键" 或 "键:成员" 列表; sections 为 list_sections 的结果"""
+    available = {section.key: section.members for section in sections}
+    missing = []
+    for key, members in selection.items():
+        if key not in available:
+            missing.append(key)
+        elif members is not None:
+            present = set(available[key] or ())
+            missing.extend(f"{key}:{member}" for member in members if member not in present)
+    return missing
+
+
+@timed()
+def read_sections(raw, selection):
+    """只解析选中的部分, 返回 {键: 值}; 选择成员时值为只含这些成员的对象"""
+    sections = index_top_level(raw)
+    if sections is None:
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ConfigError("文件内容不是 JSON 对象")
+        ranges = None
+    else:
+        data = None
+        ranges = {key: (start, stop) for key, start, stop in sections}
+
+    result = {}
+    for key, members in selection.items():
+        if ranges is not None:
+            if key not in ranges:
+                continue
+            start, stop = ranges[key]
+            section_raw = raw[start:stop]
+            if members is None:
+                result[key] = json.loads(section_raw)
+                continue
+            indexed = index_members(section_raw, 4) if section_raw[:1] == b"{" else None
+            if indexed is not None:
+                wanted = set(members)
+                result[key] = {
+                    member: json.loads(section_raw[member_start:member_stop])
+                    for member, member_start, member_stop in indexed if member in wanted
+                }
+                continue
+            value = json.loads(section_raw)
+        elif key in data:
+            value = data[key]
+        else:
+            continue
+
+        if members is None:
+            result[key] = value
+        elif isinstance(value, dict):
+            result[key] = {member: value[member] for member in members if member in value}
+        else:
+            raise ConfigError(f"{key} 不是对象, 不能选择成员")
+    return result
+
+
+def _merge_member(current, incoming):
+    """合并一个成员的值: 两边都是数组时取并集 (保持顺序), 否则使用导入的值"""
+    if isinstance(current, list) and isinstance(incoming, list):
+        return current + [item for item in incoming if item not in current]
+    return incoming
+
+
+def merge_sections(data, sections):
+    """把 read_sections 的结果合并到配置中, 返回变化的路径列表
+
+    两边都是对象的键逐个成员合并 (导入的成员覆盖同名成员, 数组取并集), 其他值整体替换。
+    """
+    changes = []
+    for key, value in sections.items():
+        current = load_section(data, key) if key in data else None
+        if not isinstance(current, dict) or not isinstance(value, dict):
+            if key not in data or current != value:
+                data[key] = value
+                changes.append((key,))
+            continue
+        for member, incoming in value.items():
+            merged = _merge_member(current[member], incoming) if member in current else incoming
+            if member not in current or current[member] != merged:
+                current[member] = merged
+                changes.append((key, member))
+    return changes
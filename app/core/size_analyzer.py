@@ -0,0 +1,106 @@
+"""
+配置大小分析
+一次扫描配置文件的原始字节, 得到每个键 (直到指定深度) 占用的字节数。
+缩进 2 的文件中每个键独占一行、以固定缩进开头, 因此只需用正则找出这些行,
+子树的范围由下一个同级键或父对象的右括号确定, 不需要解析或重新序列化任何值
+"""
+import json
+import mmap
+import re
+
+from .lazy_config import dumps_config
+from .profiler import timed
+
+
+# 默认分析的深度 (顶层键为 1, projects 中的项目为 2, 项目的字段为 3)
+DEFAULT_MAX_DEPTH = 3
+
+_KEY_LINE_PATTERN = rb'\n( {2,%d})("(?:[^"\\\n]|\\.)*"): ([\[{]?)'
+
+
+class SizeNode:
+    """大小分析树的节点"""
+
+    __slots__ = ('key', 'size', 'children', 'container')
+
+    def __init__(self, key, size=0, container=True):
+        self.key = key
+        # 在文件中占用的字节数 (含键名、缩进和分隔符)
+        self.size = size
+        self.children = []
+        # 值是否为对象或数组
+        self.container = container
+
+    def total_children(self):
+        """子节点数量"""
+        return len(self.children)
+
+    def __repr__(self):
+        return f"SizeNode({self.key!r}, {self.size}, {len(self.children)} children)"
+
+
+@timed()
+def analyze_sizes(raw, max_depth=DEFAULT_MAX_DEPTH):
+    """分析缩进 2 的 JSON 字节 (bytes 或 mmap), 返回根节点; 格式不符时返回 None
+
+    只有对象的成员会成为节点, 数组中的元素计入数组自身的大小。
+    """
+    head = raw[:5]
+    if head[:2] != b"{}" and head != b'{\n  "':
+        return None
+    key_re = re.compile(_KEY_LINE_PATTERN % (2 * max_depth))
+    root = SizeNode(None, len(raw))
+
+    # 栈中每项为 (节点, 键行的起点, 缩进, 值是否为对象)
+    stack = [(root, -1, 0, True)]
+    # 字段名大量重复, 解码结果按原始字节缓存
+    keys = {}
+
+    for match in key_re.finditer(raw):
+        pad, quoted, opener = match.groups()
+        indent = len(pad)
+        start = match.start()
+        # 结束所有缩进不小于当前键的节点: 同级的节点结束于本行之前, 更深的是父对象的最后一个成员
+        while stack[-1][2] >= indent:
+            entry = stack.pop()
+            entry[0].size = (start if entry[2] == indent else _closing_line(raw, entry)) - entry[1]
+        parent = stack[-1]
+        if parent[2] != indent - 2 or not parent[3]:
+            # 数组元素中的对象成员, 不单独统计
+            continue
+
+        key = keys.get(quoted)
+        if key is None:
+            key = keys[quoted] = json.loads(quoted)
+        node = SizeNode(key, container=bool(opener))
+        parent[0].children.append(node)
+        stack.append((node, start, indent, opener == b"{"))
+
+    while len(stack) > 1:
+        entry = stack.pop()
+        entry[0].size = _closing_line(raw, entry) - entry[1]
+    return root
+
+
+def _closing_line(raw, entry):
+    """对象中最后一个成员的结束位置: 父对象右括号所在行的换行符"""
+    _, start, indent, _ = entry
+    end = raw.find(b"\n" + b" " * (indent - 2) + b"}", start + 1)
+    return end if end >= 0 else len(raw)
+
+
+@timed()
+def analyze_file(path, max_depth=DEFAULT_MAX_DEPTH):
+    """分析配置文件, 返回根节点
+
+    文件通过 mmap 读取, 不会整体载入内存; 不是缩进 2 格式时解析后以缩进 2 重新序列化一次再分析。
+    """
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return SizeNode(None, 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+            root = analyze_sizes(raw, max_depth)
+            if root is not None:
+                return root
+            text = dumps_config(json.loads(raw[:]))
+    return analyze_sizes(text.encode('utf-8'), max_depth)
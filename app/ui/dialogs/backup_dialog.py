@@ -0,0 +1,183 @@
+"""
+备份历史对话框
+列出配置的备份, 导出或恢复任意一个版本, 以及修改保留设置
+"""
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QSpinBox, QPushButton, QLabel,
+    QTableWidgetItem, QAbstractItemView, QMessageBox, QFileDialog
+)
+from PySide6.QtCore import Qt
+
+from ...core import BackupStore, backup_config, backup_dir, parse_config, timed
+from ...core.backup_store import BACKUP_LABELS, BACKUP_RESTORE
+from ..widgets.numeric_item import NumericItem, format_size
+from .compaction_dialog import create_check_table, format_time
+
+
+class BackupHistoryDialog(QDialog):
+    """备份历史对话框"""
+
+    @timed()
+    def __init__(self, parent_window):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.store = BackupStore(backup_dir(parent_window.config_path))
+        self.snapshots = []
+        self.init_ui()
+        self.load_snapshots()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("备份历史")
+        self.setMinimumSize(700, 450)
+
+        layout = QVBoxLayout(self)
+        self.table = create_check_table(["时间", "原因", "大小", "编号"])
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setSortingEnabled(True)
+        self.table.doubleClicked.connect(self.restore)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.summary_label)
+
+        # 保留设置
+        keep_last, keep_days = self.store.retention()
+        self.keep_last_spin = QSpinBox()
+        self.keep_last_spin.setRange(1, 100000)
+        self.keep_last_spin.setValue(keep_last)
+        self.keep_days_spin = QSpinBox()
+        self.keep_days_spin.setRange(0, 36500)
+        self.keep_days_spin.setSpecialValueText("不限")
+        self.keep_days_spin.setSuffix(" 天")
+        self.keep_days_spin.setValue(keep_days)
+        apply_btn = QPushButton("应用")
+        apply_btn.clicked.connect(self.apply_retention)
+
+        retention_layout = QHBoxLayout()
+        form = QFormLayout()
+        form.addRow("最多保留备份数:", self.keep_last_spin)
+        form.addRow("最长保留时间:", self.keep_days_spin)
+        retention_layout.addLayout(form)
+        retention_layout.addWidget(apply_btn, alignment=Qt.AlignmentFlag.AlignBottom)
+        retention_layout.addStretch()
+        layout.addLayout(retention_layout)
+
+        button_layout = QHBoxLayout()
+        compare_btn = QPushButton("与当前配置比较")
+        compare_btn.clicked.connect(self.compare_snapshot)
+        export_btn = QPushButton("导出...")
+        export_btn.clicked.connect(self.export_snapshot)
+        restore_btn = QPushButton("恢复此版本")
+        restore_btn.clicked.connect(self.restore)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(compare_btn)
+        button_layout.addWidget(export_btn)
+        button_layout.addWidget(restore_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def load_snapshots(self):
+        """列出备份 (只读取清单, 不解压内容)"""
+        try:
+            self.snapshots = self.store.snapshots()
+            count, total, objects, stored = self.store.usage()
+        except Exception as e:
+            self.summary_label.setText(f"读取备份失败: {str(e)}")
+            return
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self.snapshots))
+        for row, snapshot in enumerate(self.snapshots):
+            time_item = NumericItem(snapshot.created_at, format_time(snapshot.created_at))
+            time_item.setData(Qt.ItemDataRole.UserRole, row)
+            self.table.setItem(row, 0, time_item)
+            self.table.setItem(row, 1, QTableWidgetItem(BACKUP_LABELS.get(snapshot.reason, snapshot.reason)))
+            self.table.setItem(row, 2, NumericItem(snapshot.size, format_size(snapshot.size)))
+            self.table.setItem(row, 3, QTableWidgetItem(snapshot.id))
+        self.table.setSortingEnabled(True)
+        if self.snapshots:
+            self.table.selectRow(0)
+
+        self.summary_label.setText(
+            f"共 {count} 个备份, 原始大小合计 {format_size(total)}, "
+            f"去重压缩后 {objects} 块占用 {format_size(stored)} ({self.store.path})"
+        )
+
+    def selected_snapshot(self):
+        """当前选中的备份, 没有时提示并返回 None"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            QMessageBox.warning(self, "警告", "请先选择一个备份")
+            return None
+        return self.snapshots[self.table.item(rows[0].row(), 0).data(Qt.ItemDataRole.UserRole)]
+
+    def apply_retention(self):
+        """保存保留设置并立即清理"""
+        try:
+            self.store.set_retention(self.keep_last_spin.value(), self.keep_days_spin.value())
+            removed = self.store.prune()
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"修改保留设置失败:\n{str(e)}")
+            return
+        self.load_snapshots()
+        self.parent_window.statusBar().showMessage(f"保留设置已更新, 删除了 {removed} 个旧备份")
+
+    def compare_snapshot(self):
+        """比较选中的备份与当前配置"""
+        snapshot = self.selected_snapshot()
+        if snapshot is None:
+            return
+        from .config_diff_dialog import ConfigDiffDialog, SOURCE_CURRENT
+        ConfigDiffDialog(self.parent_window, ("backup", snapshot), SOURCE_CURRENT).exec()
+
+    def export_snapshot(self):
+        """把选中的备份另存为文件"""
+        snapshot = self.selected_snapshot()
+        if snapshot is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出备份",
+            str(Path.home() / f"claude_config_{snapshot.id}.json"),
+            "JSON 文件 (*.json);;所有文件 (*.*)"
+        )
+        if not file_path:
+            return
+        try:
+            Path(file_path).write_bytes(self.store.read(snapshot))
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导出失败:\n{str(e)}")
+            return
+        self.parent_window.statusBar().showMessage(f"备份已导出: {file_path}")
+
+    def restore(self):
+        """用选中的备份替换当前配置 (替换前先备份当前配置)"""
+        snapshot = self.selected_snapshot()
+        if snapshot is None:
+            return
+        reply = QMessageBox.question(
+            self, "确认恢复",
+            f"确定要把配置恢复到 {format_time(snapshot.created_at)} 的版本吗?\n当前配置会先加入备份历史。",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        window = self.parent_window
+        try:
+            data = parse_config(self.store.read(snapshot))
+            backup_config(window.config_path, BACKUP_RESTORE)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"恢复失败:\n{str(e)}")
+            return
+
+        window.set_config_data(data)
+        window.save_config_to_file()
+        window.notify_changed()
+        window.statusBar().showMessage(f"配置已恢复到备份 {snapshot.id}")
+        self.accept()
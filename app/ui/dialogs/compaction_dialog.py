@@ -0,0 +1,346 @@
+"""
+配置压缩对话框
+预览可清理的项目及可节省的字节, 把选中的项目移到归档; 以及从归档恢复项目
+"""
+import os
+from datetime import datetime
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QCheckBox, QSpinBox, QPushButton, QLabel,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import Qt
+
+from ...core import ProjectArchive, archive_path, archive_projects, backup_config, member_keys, timed
+from ...core.backup_store import BACKUP_COMPACT
+from ...core.compaction import DEFAULT_IDLE_DAYS, REASON_IDLE, REASON_MISSING
+from ..widgets.numeric_item import NumericItem, format_size
+from ..workers.compaction_worker import CompactionScanThread
+
+
+REASON_LABELS = {
+    REASON_MISSING: "目录不存在",
+    REASON_IDLE: "闲置",
+}
+
+
+def format_time(timestamp):
+    """格式化时间戳, 未知时返回 -"""
+    if not timestamp:
+        return "-"
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def create_check_table(headers):
+    """创建首列带复选框的只读表格"""
+    table = QTableWidget()
+    table.setColumnCount(len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+    table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    return table
+
+
+def make_check_item(text, checked=True):
+    """可勾选的表格项"""
+    item = QTableWidgetItem(text)
+    item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+    item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+    item.setToolTip(text)
+    return item
+
+
+def set_all_checked(table, checked):
+    """勾选/取消勾选所有行 (不逐行发出 itemChanged)"""
+    state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+    table.blockSignals(True)
+    for row in range(table.rowCount()):
+        table.item(row, 0).setCheckState(state)
+    table.blockSignals(False)
+
+
+class CompactionDialog(QDialog):
+    """配置压缩对话框"""
+
+    @timed()
+    def __init__(self, parent_window):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.candidates = []
+        self.scan_thread = None
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("压缩配置")
+        self.setMinimumSize(800, 500)
+
+        layout = QVBoxLayout(self)
+
+        options_layout = QFormLayout()
+        self.missing_checkbox = QCheckBox("清理目录已不存在的项目")
+        self.missing_checkbox.setChecked(True)
+        options_layout.addRow(self.missing_checkbox)
+
+        idle_layout = QHBoxLayout()
+        self.idle_checkbox = QCheckBox("清理闲置超过")
+        self.idle_checkbox.setChecked(True)
+        self.idle_spin = QSpinBox()
+        self.idle_spin.setRange(1, 3650)
+        self.idle_spin.setValue(DEFAULT_IDLE_DAYS)
+        self.idle_spin.setSuffix(" 天")
+        self.idle_checkbox.toggled.connect(self.idle_spin.setEnabled)
+        idle_layout.addWidget(self.idle_checkbox)
+        idle_layout.addWidget(self.idle_spin)
+        idle_layout.addWidget(QLabel("的项目 (按会话记录或目录的修改时间)"))
+        idle_layout.addStretch()
+        options_layout.addRow(idle_layout)
+        layout.addLayout(options_layout)
+
+        scan_layout = QHBoxLayout()
+        self.scan_btn = QPushButton("扫描")
+        self.scan_btn.clicked.connect(self.start_scan)
+        select_all_btn = QPushButton("全选")
+        select_none_btn = QPushButton("全不选")
+        select_all_btn.clicked.connect(lambda: self.set_all_checked(True))
+        select_none_btn.clicked.connect(lambda: self.set_all_checked(False))
+        scan_layout.addWidget(self.scan_btn)
+        scan_layout.addWidget(select_all_btn)
+        scan_layout.addWidget(select_none_btn)
+        scan_layout.addStretch()
+        layout.addLayout(scan_layout)
+
+        self.table = create_check_table(["项目", "原因", "大小", "最近活动"])
+        self.table.setSortingEnabled(True)
+        self.table.itemChanged.connect(self.update_summary)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("点击 \"扫描\" 查找可清理的项目")
+        layout.addWidget(self.summary_label)
+
+        info = QLabel(
+            f"清理的项目会移到 {archive_path(self.parent_window.config_path).name}, "
+            "可随时从归档恢复; 压缩前会创建带时间戳的配置备份"
+        )
+        info.setStyleSheet("color: #666; font-size: 10px;")
+        layout.addWidget(info)
+
+        button_layout = QHBoxLayout()
+        self.compact_btn = QPushButton("压缩并归档")
+        self.compact_btn.setEnabled(False)
+        self.compact_btn.clicked.connect(self.compact)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(self.compact_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def start_scan(self):
+        """在后台扫描可清理的项目"""
+        if self.scan_thread is not None:
+            return
+        if not self.missing_checkbox.isChecked() and not self.idle_checkbox.isChecked():
+            QMessageBox.warning(self, "警告", "请至少选择一种清理条件")
+            return
+
+        config_data = self.parent_window.get_config_data()
+        self.scan_btn.setEnabled(False)
+        self.compact_btn.setEnabled(False)
+        self.summary_label.setText("正在扫描...")
+        self.scan_thread = CompactionScanThread(
+            config_data.get("projects", {}),
+            self.idle_spin.value() if self.idle_checkbox.isChecked() else None,
+            self.missing_checkbox.isChecked(),
+            parent=self
+        )
+        self.scan_thread.scanned.connect(self.on_scanned)
+        self.scan_thread.failed.connect(self.summary_label.setText)
+        self.scan_thread.finished.connect(self.on_scan_finished)
+        self.scan_thread.start()
+
+    def on_scan_finished(self):
+        """扫描线程结束"""
+        self.scan_thread.deleteLater()
+        self.scan_thread = None
+        self.scan_btn.setEnabled(True)
+
+    @timed()
+    def on_scanned(self, candidates):
+        """显示扫描结果"""
+        self.candidates = candidates
+        self.table.blockSignals(True)
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(candidates))
+        for row, candidate in enumerate(candidates):
+            path_item = make_check_item(candidate.path)
+            # 排序后仍能找到对应的候选
+            path_item.setData(Qt.ItemDataRole.UserRole, row)
+            self.table.setItem(row, 0, path_item)
+            self.table.setItem(row, 1, QTableWidgetItem(REASON_LABELS.get(candidate.reason, candidate.reason)))
+            self.table.setItem(row, 2, NumericItem(candidate.size, format_size(candidate.size)))
+            self.table.setItem(row, 3, NumericItem(candidate.last_active or 0, format_time(candidate.last_active)))
+        self.table.setSortingEnabled(True)
+        self.table.blockSignals(False)
+        self.update_summary()
+
+    def set_all_checked(self, checked):
+        """全选/全不选"""
+        set_all_checked(self.table, checked)
+        self.update_summary()
+
+    def done(self, result):
+        """关闭前等待扫描线程结束"""
+        if self.scan_thread is not None:
+            self.scan_thread.wait()
+        super().done(result)
+
+    def checked_candidates(self):
+        """勾选的候选"""
+        return [
+            self.candidates[self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)]
+            for row in range(self.table.rowCount())
+            if self.table.item(row, 0).checkState() == Qt.CheckState.Checked
+        ]
+
+    def update_summary(self):
+        """更新选中项目数与可节省的字节数"""
+        checked = self.checked_candidates()
+        saved = sum(candidate.size for candidate in checked)
+        try:
+            file_size = self.parent_window.config_path.stat().st_size
+        except OSError:
+            file_size = 0
+        text = f"找到 {len(self.candidates)} 个可清理的项目, 已选 {len(checked)} 个, 可节省 {format_size(saved)}"
+        if file_size:
+            text += f" (配置文件 {format_size(file_size)}, 约 {saved * 100 / file_size:.0f}%)"
+        self.summary_label.setText(text)
+        self.compact_btn.setEnabled(bool(checked))
+
+    def compact(self):
+        """把选中的项目移到归档并保存配置"""
+        checked = self.checked_candidates()
+        if not checked:
+            return
+        reply = QMessageBox.question(
+            self, "确认压缩",
+            f"确定要把 {len(checked)} 个项目从配置中移到归档吗?\n归档的项目可以随时恢复。",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        window = self.parent_window
+        config_data = window.get_config_data()
+        reasons = {candidate.path: candidate.reason for candidate in checked}
+        try:
+            backup_config(window.config_path, BACKUP_COMPACT)
+            # 写入归档失败时 archive_projects 会恢复配置中的项目
+            changes, removed = archive_projects(
+                config_data, list(reasons), ProjectArchive(archive_path(window.config_path)), reasons
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"压缩失败:\n{str(e)}")
+            return
+
+        saved = sum(candidate.size for candidate in checked if candidate.path in removed)
+        window.notify_changes(changes)
+        window.save_config_to_file()
+        window.statusBar().showMessage(f"已归档 {len(removed)} 个项目, 配置减小约 {format_size(saved)}")
+        self.accept()
+
+
+class ArchiveRestoreDialog(QDialog):
+    """从归档恢复项目对话框"""
+
+    @timed()
+    def __init__(self, parent_window):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.archive = ProjectArchive(archive_path(parent_window.config_path))
+        self.items = []
+        self.init_ui()
+        self.load_entries()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("恢复归档的项目")
+        self.setMinimumSize(800, 450)
+
+        layout = QVBoxLayout(self)
+        self.table = create_check_table(["项目", "归档时间", "原因", "大小", "状态"])
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        restore_btn = QPushButton("恢复选中的项目")
+        restore_btn.clicked.connect(self.restore)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(restore_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def load_entries(self):
+        """列出归档 (只读取 zip 目录, 不解压内容)"""
+        try:
+            self.items = self.archive.entries()
+        except Exception as e:
+            self.summary_label.setText(f"读取归档失败: {str(e)}")
+            return
+
+        config_data = self.parent_window.get_config_data()
+        existing = set(member_keys(config_data.get("projects", {})))
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self.items))
+        for row, item in enumerate(self.items):
+            in_config = item.path in existing
+            path_item = make_check_item(item.path, checked=False)
+            path_item.setData(Qt.ItemDataRole.UserRole, row)
+            if in_config:
+                path_item.setFlags(path_item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable)
+            self.table.setItem(row, 0, path_item)
+            self.table.setItem(row, 1, NumericItem(item.archived_at, format_time(item.archived_at)))
+            self.table.setItem(row, 2, QTableWidgetItem(REASON_LABELS.get(item.reason, item.reason)))
+            self.table.setItem(row, 3, NumericItem(item.size, format_size(item.size)))
+            if in_config:
+                status = "已在配置中"
+            elif not os.path.isdir(item.path):
+                status = "目录不存在"
+            else:
+                status = ""
+            self.table.setItem(row, 4, QTableWidgetItem(status))
+        self.table.setSortingEnabled(True)
+
+        size = self.archive.path.stat().st_size if self.archive.exists() else 0
+        self.summary_label.setText(f"归档中共 {len(self.items)} 个项目 ({self.archive.path}, {format_size(size)})")
+
+    def restore(self):
+        """恢复勾选的项目 (只解压这些成员)"""
+        checked = [
+            self.items[self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)]
+            for row in range(self.table.rowCount())
+            if self.table.item(row, 0).checkState() == Qt.CheckState.Checked
+        ]
+        if not checked:
+            QMessageBox.warning(self, "警告", "请先勾选要恢复的项目")
+            return
+
+        window = self.parent_window
+        try:
+            changes = self.archive.restore(window.get_config_data(), checked)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"恢复失败:\n{str(e)}")
+            return
+
+        if changes:
+            window.notify_changes(changes)
+            window.save_config_to_file()
+        window.statusBar().showMessage(f"已从归档恢复 {len(changes)} 个项目")
+        self.accept()
@@ -0,0 +1,251 @@
+"""
+配置比较对话框
+比较当前配置、备份和其他文件, 只列出变化的路径; 也用作导入前的预览
+"""
+import json
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QComboBox, QLineEdit, QPushButton, QLabel,
+    QTableView, QHeaderView, QAbstractItemView, QSplitter, QPlainTextEdit, QWidget, QFileDialog
+)
+from PySide6.QtCore import Qt
+
+from ...core import (
+    BackupStore, LazySection, backup_dir, dumps_config, json_default, read_raw, summarize_diff, timed
+)
+from ...core.backup_store import BACKUP_LABELS
+from ...core.json_diff import DIFF_ADDED, DIFF_LABELS, DIFF_REMOVED
+from ..models.config_diff_model import ConfigDiffModel
+from ..models.search_filter_proxy_model import SearchFilterProxyModel
+from ..workers.config_diff_worker import ConfigDiffThread
+from .compaction_dialog import format_time
+
+
+# 比较的对象: ("current",) 当前配置, ("backup", Snapshot) 备份, ("file", 路径) 文件
+SOURCE_CURRENT = ("current",)
+
+# 详情中显示的最大字符数
+DETAIL_CHARS = 200000
+
+
+def detail_text(value):
+    """详情中显示的值 (缩进 2 的 JSON, 过长时截断)"""
+    if isinstance(value, LazySection):
+        text = value.raw[:DETAIL_CHARS * 4].decode('utf-8', errors='replace')
+    else:
+        text = json.dumps(value, indent=2, ensure_ascii=False, default=json_default)
+    if len(text) > DETAIL_CHARS:
+        return text[:DETAIL_CHARS] + "\n…"
+    return text
+
+
+class ConfigDiffDialog(QDialog):
+    """配置比较对话框
+
+    accept_text 不为空时为预览模式: 比较对象固定, 显示确认按钮, exec() 返回是否确认。
+    """
+
+    @timed()
+    def __init__(self, parent_window, old=SOURCE_CURRENT, new=None, accept_text=""):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.accept_text = accept_text
+        self.diff_thread = None
+        # 比较线程运行期间比较对象改变, 完成后重新比较
+        self.diff_pending = False
+        self.init_ui()
+        self.populate_sources(old, new)
+        self.start_diff()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("预览变化" if self.accept_text else "比较配置")
+        self.setMinimumSize(900, 600)
+
+        layout = QVBoxLayout(self)
+
+        source_layout = QGridLayout()
+        self.old_combo = QComboBox()
+        self.new_combo = QComboBox()
+        for row, (label, combo) in enumerate((("原配置:", self.old_combo), ("新配置:", self.new_combo))):
+            combo.setEnabled(not self.accept_text)
+            combo.activated.connect(lambda _, combo=combo: self.on_source_activated(combo))
+            source_layout.addWidget(QLabel(label), row, 0)
+            source_layout.addWidget(combo, row, 1)
+        source_layout.setColumnStretch(1, 1)
+        layout.addLayout(source_layout)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("按路径或变化类型过滤...")
+        self.filter_edit.textChanged.connect(lambda text: self.proxy.set_filter_text(text))
+        layout.addWidget(self.filter_edit)
+
+        self.model = ConfigDiffModel(self)
+        self.proxy = SearchFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        header.resizeSection(0, 320)
+        header.resizeSection(1, 70)
+        header.resizeSection(2, 220)
+        self.table.selectionModel().currentRowChanged.connect(self.show_detail)
+
+        # 选中变化的完整值
+        detail = QWidget()
+        detail_layout = QHBoxLayout(detail)
+        detail_layout.setContentsMargins(0, 0, 0, 0)
+        self.old_text = QPlainTextEdit()
+        self.new_text = QPlainTextEdit()
+        for title, text in (("原值", self.old_text), ("新值", self.new_text)):
+            text.setReadOnly(True)
+            text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+            column = QVBoxLayout()
+            column.addWidget(QLabel(title))
+            column.addWidget(text)
+            detail_layout.addLayout(column)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.table)
+        splitter.addWidget(detail)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        if self.accept_text:
+            self.accept_btn = QPushButton(self.accept_text)
+            self.accept_btn.setEnabled(False)
+            self.accept_btn.clicked.connect(self.accept)
+            button_layout.addWidget(self.accept_btn)
+        close_btn = QPushButton("取消" if self.accept_text else "关闭")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def populate_sources(self, old, new):
+        """填充比较对象: 当前配置、各个备份和 "其他文件..." """
+        try:
+            snapshots = BackupStore(backup_dir(self.parent_window.config_path)).snapshots()
+        except OSError:
+            snapshots = []
+        for combo in (self.old_combo, self.new_combo):
+            combo.addItem("当前配置", SOURCE_CURRENT)
+            for snapshot in snapshots:
+                label = BACKUP_LABELS.get(snapshot.reason, snapshot.reason)
+                combo.addItem(f"备份 {format_time(snapshot.created_at)} ({label}) {snapshot.id}", ("backup", snapshot))
+            combo.addItem("其他文件...", None)
+
+        if new is None:
+            # 默认比较最新的备份与当前配置
+            old, new = (("backup", snapshots[0]) if snapshots else SOURCE_CURRENT), SOURCE_CURRENT
+        self.select_source(self.old_combo, old)
+        self.select_source(self.new_combo, new)
+
+    def select_source(self, combo, source):
+        """选中比较对象, 不在列表中的文件加到 "其他文件..." 之前"""
+        for row in range(combo.count()):
+            data = combo.itemData(row)
+            if data is not None and data[0] == source[0] and data[1:] == source[1:]:
+                combo.setCurrentIndex(row)
+                return
+        row = combo.count() - 1
+        combo.insertItem(row, f"文件 {source[1]}", source)
+        combo.setCurrentIndex(row)
+
+    def on_source_activated(self, combo):
+        """切换比较对象; 选择 "其他文件..." 时打开文件选择框"""
+        if combo.currentData() is None:
+            file_path, _ = QFileDialog.getOpenFileName(
+                self, "选择配置文件", str(Path.home()), "JSON 文件 (*.json *.json.gz);;所有文件 (*.*)"
+            )
+            if not file_path:
+                combo.setCurrentIndex(0)
+            else:
+                self.select_source(combo, ("file", Path(file_path)))
+        self.start_diff()
+
+    def make_loader(self, source):
+        """返回在比较线程中读取原始字节的函数 (当前配置在此处做浅拷贝)"""
+        if source[0] == "backup":
+            store = BackupStore(backup_dir(self.parent_window.config_path))
+            return lambda: store.read(source[1])
+        if source[0] == "file":
+            return lambda: read_raw(source[1])
+        snapshot = dict(self.parent_window.get_config_data())
+        return lambda: dumps_config(snapshot).encode('utf-8')
+
+    def start_diff(self):
+        """在后台比较选中的两份配置"""
+        if self.diff_thread is not None:
+            self.diff_pending = True
+            self.diff_thread.requestInterruption()
+            return
+
+        self.diff_pending = False
+        self.model.set_entries([])
+        self.show_detail()
+        if self.accept_text:
+            self.accept_btn.setEnabled(False)
+        self.summary_label.setText("正在比较...")
+        self.diff_thread = ConfigDiffThread(
+            self.make_loader(self.old_combo.currentData()), self.make_loader(self.new_combo.currentData()),
+            parent=self
+        )
+        self.diff_thread.completed.connect(self.on_diff_completed)
+        self.diff_thread.failed.connect(self.summary_label.setText)
+        self.diff_thread.finished.connect(self.on_diff_finished)
+        self.diff_thread.start()
+
+    def on_diff_finished(self):
+        """比较线程结束"""
+        self.diff_thread.deleteLater()
+        self.diff_thread = None
+        if self.diff_pending:
+            self.start_diff()
+
+    @timed()
+    def on_diff_completed(self, entries, skipped, elapsed):
+        """显示比较结果"""
+        if self.diff_pending:
+            return
+        self.model.set_entries(entries)
+        if self.accept_text:
+            self.accept_btn.setEnabled(True)
+        if not entries:
+            self.summary_label.setText(f"两份配置相同 (耗时 {elapsed * 1000:.0f} ms)")
+            return
+        counts = summarize_diff(entries)
+        parts = [f"{DIFF_LABELS[kind]} {count}" for kind, count in counts.items() if count]
+        self.summary_label.setText(
+            f"{len(entries)} 处变化: {', '.join(parts)} (跳过 {skipped} 个相同的成员, 耗时 {elapsed * 1000:.0f} ms)"
+        )
+
+    def show_detail(self, current=None, previous=None):
+        """显示选中变化的完整原值和新值"""
+        if current is None or not current.isValid():
+            self.old_text.clear()
+            self.new_text.clear()
+            return
+        entry = self.model.entry(self.proxy.mapToSource(current).row())
+        self.old_text.setPlainText("" if entry.kind == DIFF_ADDED else detail_text(entry.old))
+        self.new_text.setPlainText("" if entry.kind == DIFF_REMOVED else detail_text(entry.new))
+
+    def done(self, result):
+        """关闭前停止比较线程"""
+        if self.diff_thread is not None:
+            self.diff_thread.requestInterruption()
+            self.diff_thread.wait()
+        super().done(result)
@@ -9,14 +9,20 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from ...core import timed
+from ..widgets.mcp_inventory_view import McpInventoryView
+
 
 class MCPServerDialog(QDialog):
     """MCP 服务器配置对话框"""
 
-    def __init__(self, parent, name="", config=None):
+    @timed()
+    def __init__(self, parent, name="", config=None, inventory=None):
         super().__init__(parent)
         self.name = name
         self.config = config or {}
+        # 服务器的工具和资源清单 (McpInventory), 有时只读显示
+        self.inventory = inventory
         self.init_ui()
         self.load_data()
 
@@ -68,6 +74,14 @@ class MCPServerDialog(QDialog):
 
         layout.addRow(env_group)
 
+        if self.inventory is not None:
+            inventory_group = QGroupBox("工具与资源")
+            inventory_layout = QVBoxLayout(inventory_group)
+            inventory_view = McpInventoryView()
+            inventory_view.set_inventory(self.inventory)
+            inventory_layout.addWidget(inventory_view)
+            layout.addRow(inventory_group)
+
         # 按钮
         button_layout = QHBoxLayout()
         ok_btn = QPushButton("确定")
@@ -79,6 +93,7 @@ class MCPServerDialog(QDialog):
         button_layout.addWidget(cancel_btn)
         layout.addRow(button_layout)
 
+    @timed()
     def load_data(self):
         """加载数据"""
         if self.config:
@@ -3,10 +3,13 @@ GitHub 仓库对话框
 """
 from PySide6.QtWidgets import QDialog, QFormLayout, QLineEdit, QPushButton, QMessageBox, QHBoxLayout
 
+from ...core import timed
+
 
 class RepoDialog(QDialog):
     """GitHub 仓库对话框"""
 
+    @timed()
     def __init__(self, parent):
         super().__init__(parent)
         self.init_ui()
@@ -0,0 +1,223 @@
+"""
+仓库发现对话框
+在选定的根目录下查找 git 检出, 勾选后一次性合并到 githubRepoPaths
+"""
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QSpinBox, QPushButton, QLabel,
+    QTableWidgetItem, QFileDialog, QMessageBox
+)
+from PySide6.QtCore import Qt
+
+from ...core import config_ops, timed
+from ...core.repo_discovery import DEFAULT_SCAN_DEPTH, RepoScanner, plan_repo_merge
+from ..workers.repo_discovery_worker import RepoDiscoveryThread
+from .compaction_dialog import create_check_table, make_check_item, set_all_checked
+
+
+class RepoDiscoveryDialog(QDialog):
+    """仓库发现对话框"""
+
+    @timed()
+    def __init__(self, parent_window):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.scanner = RepoScanner()
+        self.scanner.load(parent_window.config_path)
+        # [(仓库名称, 路径, 其他远程仓库)]
+        self.proposals = []
+        self.scan_thread = None
+        # 上次扫描的统计, 显示在摘要后
+        self.scan_info = ""
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("发现仓库")
+        self.setMinimumSize(800, 550)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("扫描的根目录:"))
+
+        roots_layout = QHBoxLayout()
+        self.roots_list = QListWidget()
+        self.roots_list.setMaximumHeight(100)
+        self.roots_list.addItems(self.scanner.roots or [str(Path.home())])
+        roots_layout.addWidget(self.roots_list)
+
+        roots_btn_layout = QVBoxLayout()
+        add_root_btn = QPushButton("添加目录...")
+        remove_root_btn = QPushButton("移除")
+        add_root_btn.clicked.connect(self.add_root)
+        remove_root_btn.clicked.connect(self.remove_root)
+        self.depth_spin = QSpinBox()
+        self.depth_spin.setRange(1, 12)
+        self.depth_spin.setValue(DEFAULT_SCAN_DEPTH)
+        self.depth_spin.setPrefix("深度: ")
+        roots_btn_layout.addWidget(add_root_btn)
+        roots_btn_layout.addWidget(remove_root_btn)
+        roots_btn_layout.addWidget(self.depth_spin)
+        roots_btn_layout.addStretch()
+        roots_layout.addLayout(roots_btn_layout)
+        layout.addLayout(roots_layout)
+
+        scan_layout = QHBoxLayout()
+        self.scan_btn = QPushButton("扫描")
+        self.scan_btn.clicked.connect(self.start_scan)
+        self.stop_btn = QPushButton("停止")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_scan)
+        select_all_btn = QPushButton("全选")
+        select_none_btn = QPushButton("全不选")
+        select_all_btn.clicked.connect(lambda: self.set_all_checked(True))
+        select_none_btn.clicked.connect(lambda: self.set_all_checked(False))
+        scan_layout.addWidget(self.scan_btn)
+        scan_layout.addWidget(self.stop_btn)
+        scan_layout.addWidget(select_all_btn)
+        scan_layout.addWidget(select_none_btn)
+        scan_layout.addStretch()
+        layout.addLayout(scan_layout)
+
+        self.table = create_check_table(["本地路径", "仓库", "其他远程"])
+        self.table.itemChanged.connect(self.update_summary)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("点击 \"扫描\" 查找尚未配置的 git 检出")
+        layout.addWidget(self.summary_label)
+
+        info = QLabel("仓库名称取自 origin 远程; 不进入隐藏目录、依赖和构建目录; 再次扫描时跳过未修改的目录")
+        info.setStyleSheet("color: #666; font-size: 10px;")
+        layout.addWidget(info)
+
+        button_layout = QHBoxLayout()
+        self.merge_btn = QPushButton("添加选中的路径")
+        self.merge_btn.setEnabled(False)
+        self.merge_btn.clicked.connect(self.merge)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(self.merge_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def add_root(self):
+        """添加根目录"""
+        folder_path = QFileDialog.getExistingDirectory(self, "选择扫描的根目录")
+        if folder_path and not self.roots_list.findItems(folder_path, Qt.MatchFlag.MatchExactly):
+            self.roots_list.addItem(folder_path)
+
+    def remove_root(self):
+        """移除选中的根目录"""
+        for item in self.roots_list.selectedItems():
+            self.roots_list.takeItem(self.roots_list.row(item))
+
+    def roots(self):
+        """根目录列表"""
+        return [self.roots_list.item(row).text() for row in range(self.roots_list.count())]
+
+    def start_scan(self):
+        """在后台扫描根目录"""
+        if self.scan_thread is not None:
+            return
+        roots = self.roots()
+        if not roots:
+            QMessageBox.warning(self, "警告", "请至少添加一个根目录")
+            return
+
+        self.proposals = []
+        self.scan_info = ""
+        self.table.setRowCount(0)
+        self.scan_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.merge_btn.setEnabled(False)
+        self.summary_label.setText("正在扫描...")
+        self.scan_thread = RepoDiscoveryThread(
+            self.scanner, self.parent_window.config_path, roots, self.depth_spin.value(), parent=self
+        )
+        self.scan_thread.found.connect(self.on_found)
+        self.scan_thread.completed.connect(self.on_completed)
+        self.scan_thread.failed.connect(self.summary_label.setText)
+        self.scan_thread.finished.connect(self.on_scan_finished)
+        self.scan_thread.start()
+
+    def stop_scan(self):
+        """停止扫描 (已发现的仓库保留在列表中)"""
+        if self.scan_thread is not None:
+            self.scan_thread.requestInterruption()
+
+    def on_scan_finished(self):
+        """扫描线程结束"""
+        self.scan_thread.deleteLater()
+        self.scan_thread = None
+        self.scan_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.update_summary()
+
+    @timed()
+    def on_found(self, repos):
+        """追加一批尚未配置的仓库"""
+        github_repos = self.parent_window.get_config_data().get("githubRepoPaths", {})
+        proposals = plan_repo_merge(github_repos, repos)
+        if not proposals:
+            return
+
+        self.table.blockSignals(True)
+        row = self.table.rowCount()
+        self.table.setRowCount(row + len(proposals))
+        for name, path, others in proposals:
+            self.table.setItem(row, 0, make_check_item(path))
+            self.table.setItem(row, 1, QTableWidgetItem(name))
+            self.table.setItem(row, 2, QTableWidgetItem(", ".join(others)))
+            row += 1
+        self.table.blockSignals(False)
+        self.proposals.extend(proposals)
+        self.update_summary()
+
+    def on_completed(self, directories, elapsed):
+        """扫描完成"""
+        self.scan_info = f"扫描 {directories} 个目录, 耗时 {elapsed * 1000:.0f} ms"
+
+    def set_all_checked(self, checked):
+        """全选/全不选"""
+        set_all_checked(self.table, checked)
+        self.update_summary()
+
+    def done(self, result):
+        """关闭前停止扫描线程"""
+        if self.scan_thread is not None:
+            self.scan_thread.requestInterruption()
+            self.scan_thread.wait()
+        super().done(result)
+
+    def checked_proposals(self):
+        """勾选的 (仓库名称, 路径)"""
+        return [
+            (name, path)
+            for row, (name, path, _) in enumerate(self.proposals)
+            if self.table.item(row, 0).checkState() == Qt.CheckState.Checked
+        ]
+
+    def update_summary(self):
+        """更新发现和选中的路径数"""
+        checked = self.checked_proposals()
+        repos = {name for name, _ in checked}
+        text = f"发现 {len(self.proposals)} 个未配置的路径, 已选 {len(checked)} 个 (涉及 {len(repos)} 个仓库)"
+        if self.scan_info:
+            text += f"; {self.scan_info}"
+        self.summary_label.setText(text)
+        self.merge_btn.setEnabled(bool(checked) and self.scan_thread is None)
+
+    def merge(self):
+        """把勾选的路径合并到 githubRepoPaths, 只保存一次"""
+        checked = self.checked_proposals()
+        if not checked:
+            return
+
+        window = self.parent_window
+        changes = config_ops.add_repo_paths(window.get_config_data(), checked)
+        if changes:
+            window.notify_changes(changes)
+            window.save_config_to_file()
+        window.statusBar().showMessage(f"已添加 {len(checked)} 个路径到 {len(changes)} 个仓库")
+        self.accept()
@@ -0,0 +1,258 @@
+"""
+按部分导出/导入对话框
+导出时只写入勾选的顶层键或成员 (可 gzip 压缩); 导入时只解析勾选的部分并合并到当前配置
+"""
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLabel, QMessageBox, QFileDialog
+)
+
+from ...core import (
+    LazySection, SectionInfo, backup_config, dumps_section, member_keys, merge_sections, parse_config,
+    read_sections, timed
+)
+from ...core.backup_store import BACKUP_IMPORT
+from ..widgets.numeric_item import format_size
+from ..widgets.section_tree import SectionTree
+from ..workers.section_transfer_worker import SectionExportThread, SectionScanThread
+
+
+# 导出时默认勾选的键
+DEFAULT_EXPORT_KEYS = ("mcpServers",)
+
+
+def config_sections(data):
+    """当前配置的顶层键 [SectionInfo] (未解析的键按原始字节计算大小)"""
+    sections = []
+    for key, value in data.items():
+        if isinstance(value, LazySection):
+            size = value.size
+        else:
+            size = len(dumps_section(value).encode('utf-8'))
+        members = member_keys(value) if isinstance(value, (dict, LazySection)) else None
+        sections.append(SectionInfo(key, size, members))
+    return sections
+
+
+class SectionExportDialog(QDialog):
+    """按部分导出对话框"""
+
+    @timed()
+    def __init__(self, parent_window):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.export_thread = None
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("导出配置")
+        self.setMinimumSize(600, 500)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("勾选要导出的部分 (展开可只选择其中的成员):"))
+        self.tree = SectionTree()
+        self.tree.set_sections(config_sections(self.parent_window.get_config_data()), DEFAULT_EXPORT_KEYS)
+        layout.addWidget(self.tree)
+
+        self.compress_check = QCheckBox("gzip 压缩 (.json.gz)")
+        self.compress_check.setChecked(True)
+        layout.addWidget(self.compress_check)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.export_btn = QPushButton("导出...")
+        self.export_btn.clicked.connect(self.export)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(self.export_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def export(self):
+        """选择文件后在后台导出"""
+        selection = self.tree.selection()
+        if not selection:
+            QMessageBox.warning(self, "警告", "请至少勾选一个部分")
+            return
+
+        compress = self.compress_check.isChecked()
+        suffix = ".json.gz" if compress else ".json"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出配置",
+            str(Path.home() / f"claude_config_sections{suffix}"),
+            "压缩的 JSON 文件 (*.json.gz);;JSON 文件 (*.json);;所有文件 (*.*)"
+        )
+        if not file_path:
+            return
+
+        self.export_btn.setEnabled(False)
+        self.status_label.setText("正在导出...")
+        self.export_thread = SectionExportThread(
+            dict(self.parent_window.get_config_data()), Path(file_path), selection, compress, parent=self
+        )
+        self.export_thread.completed.connect(lambda size, elapsed: self.on_exported(file_path, size, elapsed))
+        self.export_thread.failed.connect(self.on_export_failed)
+        self.export_thread.finished.connect(self.on_export_finished)
+        self.export_thread.start()
+
+    def on_exported(self, file_path, size, elapsed):
+        """导出完成"""
+        self.parent_window.statusBar().showMessage(
+            f"配置已导出: {file_path} ({format_size(size)}, 耗时 {elapsed * 1000:.0f} ms)"
+        )
+        self.accept()
+
+    def on_export_failed(self, message):
+        """导出失败"""
+        self.status_label.setText("")
+        QMessageBox.critical(self, "错误", message)
+
+    def on_export_finished(self):
+        """导出线程结束"""
+        self.export_thread.deleteLater()
+        self.export_thread = None
+        self.export_btn.setEnabled(True)
+
+    def done(self, result):
+        """关闭前等待导出完成 (写入临时文件后才替换, 不会留下半个文件)"""
+        if self.export_thread is not None:
+            self.export_thread.wait()
+        super().done(result)
+
+
+class SectionImportDialog(QDialog):
+    """按部分导入对话框"""
+
+    @timed()
+    def __init__(self, parent_window, path):
+        super().__init__(parent_window)
+        self.parent_window = parent_window
+        self.path = path
+        # 文件的原始字节 (已解压), 读取完成后设置
+        self.raw = None
+        self.scan_thread = None
+        self.init_ui()
+        self.start_scan()
+
+    def init_ui(self):
+        """初始化UI"""
+        self.setWindowTitle("导入配置")
+        self.setMinimumSize(600, 500)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"文件: {self.path}"))
+        layout.addWidget(QLabel("勾选要合并到当前配置的部分 (同名成员会被覆盖, 路径列表取并集):"))
+        self.tree = SectionTree()
+        layout.addWidget(self.tree)
+
+        self.status_label = QLabel("正在读取...")
+        self.status_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.replace_btn = QPushButton("覆盖整个配置...")
+        self.replace_btn.setEnabled(False)
+        self.replace_btn.clicked.connect(self.replace_all)
+        self.import_btn = QPushButton("导入选中的部分")
+        self.import_btn.setEnabled(False)
+        self.import_btn.clicked.connect(self.import_selected)
+        close_btn = QPushButton("取消")
+        close_btn.clicked.connect(self.reject)
+        button_layout.addWidget(self.replace_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def start_scan(self):
+        """在后台读取文件并列出顶层键"""
+        self.scan_thread = SectionScanThread(self.path, parent=self)
+        self.scan_thread.listed.connect(self.on_listed)
+        self.scan_thread.failed.connect(self.status_label.setText)
+        self.scan_thread.finished.connect(self.on_scan_finished)
+        self.scan_thread.start()
+
+    def on_scan_finished(self):
+        """读取线程结束"""
+        self.scan_thread.deleteLater()
+        self.scan_thread = None
+
+    @timed()
+    def on_listed(self, raw, sections):
+        """显示文件中的部分及合并后的状态"""
+        self.raw = raw
+        config_data = self.parent_window.get_config_data()
+        existing = {}
+
+        def status(key, member):
+            if key not in config_data:
+                return "新增"
+            if member is None:
+                return "合并" if isinstance(config_data[key], (dict, LazySection)) else "替换"
+            if key not in existing:
+                existing[key] = set(member_keys(config_data[key]))
+            return "覆盖" if member in existing[key] else "新增"
+
+        self.tree.set_sections(sections, status=status)
+        self.status_label.setText(f"文件中共 {len(sections)} 个顶层键, {format_size(len(raw))}")
+        self.import_btn.setEnabled(True)
+        self.replace_btn.setEnabled(True)
+
+    def import_selected(self):
+        """只解析勾选的部分并合并"""
+        selection = self.tree.selection()
+        if not selection:
+            QMessageBox.warning(self, "警告", "请至少勾选一个部分")
+            return
+
+        window = self.parent_window
+        try:
+            sections = read_sections(self.raw, selection)
+            backup_config(window.config_path, BACKUP_IMPORT)
+            changes = merge_sections(window.get_config_data(), sections)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导入失败:\n{str(e)}")
+            return
+
+        if changes:
+            window.notify_changes(changes)
+            window.save_config_to_file()
+        window.statusBar().showMessage(f"已从 {self.path} 导入 {len(changes)} 处变化")
+        self.accept()
+
+    def replace_all(self):
+        """预览变化后用整个文件覆盖当前配置"""
+        from .config_diff_dialog import ConfigDiffDialog, SOURCE_CURRENT
+        preview = ConfigDiffDialog(
+            self.parent_window, SOURCE_CURRENT, ("file", self.path), accept_text="导入并覆盖当前配置"
+        )
+        if preview.exec() != QDialog.DialogCode.Accepted:
+            return
+
+        window = self.parent_window
+        try:
+            data = parse_config(self.raw)
+            if not isinstance(data, dict):
+                raise ValueError("文件内容不是 JSON 对象")
+            backup_config(window.config_path, BACKUP_IMPORT)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导入失败:\n{str(e)}")
+            return
+
+        window.set_config_data(data)
+        window.save_config_to_file()
+        window.notify_changed()
+        window.statusBar().showMessage(f"配置已导入: {self.path}")
+        self.accept()
+
+    def done(self, result):
+        """关闭前等待读取线程"""
+        if self.scan_thread is not None:
+            self.scan_thread.wait()
+        super().done(result)
@@ -1,32 +1,71 @@
 """
 Claude 配置管理器主窗口
 """
-import json
-import shutil
-from pathlib import Path
-from datetime import datetime
+import copy
+import time
 
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QTextEdit, QTableWidget, QTableWidgetItem,
-    QPushButton, QDialog, QFormLayout, QLineEdit, QFileDialog,
-    QMessageBox, QLabel, QHeaderView, QAbstractItemView,
-    QGroupBox, QSplitter, QCheckBox
+    QMainWindow, QWidget, QVBoxLayout, QTabWidget, QPushButton, QMessageBox, QLabel, QProgressBar
 )
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QCoreApplication, QEvent, QThread, QTimer, Signal
+from PySide6.QtGui import QKeySequence, QShortcut
 
-from .widgets.json_highlighter import JsonHighlighter
+from ..core import default_config_path, load_cache, save_config, timed
+from .workers.config_loader import ConfigLoadThread, ConfigReloadThread
+from .workers.config_saver import ConfigSaveThread
+from .workers.config_watcher import ConfigWatcher
+
+
+# 连续修改合并为一次保存的等待时间 (毫秒)
+SAVE_DEBOUNCE_MS = 400
 
 
 class ClaudeConfigGUI(QMainWindow):
     """Claude 配置管理器主窗口"""
 
+    # 配置中某个路径的值已改变 (键路径元组, 空元组表示整个配置)
+    config_changed = Signal(tuple)
+
     def __init__(self):
         super().__init__()
-        self.config_path = Path.home() / ".claude.json"
+        self.config_path = default_config_path()
         self.config_data = {}
+        self.load_thread = None
+
+        # 延迟创建的标签页: 名称 -> 容器 / 工厂方法
+        self.tab_hosts = {}
+        self.tab_factories = {}
+        self.stale_views = set()
+
+        # 保存管线: 防抖定时器 + 后台保存线程
+        self.save_thread = None
+        self.save_pending = False
+        self.save_requested_at = None
+        # 自合并基准 (上次读取/写入的文件) 以来本地修改过的路径, 以及正在保存的路径
+        self.local_changes = set()
+        self.saving_changes = set()
+        # 有外部修改因与本地修改重叠而未应用, 下次保存必须重新读取并合并
+        self.force_merge = False
+        # 合并基准: 本程序最近一次读取或写入时的文件指纹。与监视器记录的指纹不同,
+        # 外部修改被检测到但尚未读取时不会前移, 否则等待保存期间 CLI 的修改会被覆盖
+        self.merge_fingerprint = None
+        # flush_save 正在等待后台保存线程, 线程结束后不再排队新的保存
+        self.flushing = False
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self.save_timer.timeout.connect(self.start_save)
+        self.config_changed.connect(self.on_config_changed)
+
+        # 外部修改监视: CLI 重写配置文件后只应用变化的键
+        self.reload_thread = None
+        self.reload_pending = False
+        self.applying_external = False
+        self.watcher = ConfigWatcher(self.config_path, self)
+        self.watcher.file_changed.connect(self.on_config_file_changed)
+
         self.init_ui()
-        self.load_config()
+        self.load_config(use_cache=True)
 
     def init_ui(self):
         """初始化UI"""
@@ -51,96 +90,469 @@ class ClaudeConfigGUI(QMainWindow):
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
 
-        # Create tabs
-        self.create_general_settings_tab()
-        self.create_mcp_servers_tab()
-        self.create_projects_tab()
-        self.create_user_info_tab()
-        self.create_experimental_features_tab()
-        self.create_raw_config_tab()
+        # Create tabs (标签页内容在首次显示时才创建)
+        self.add_lazy_tab("general_settings_tab", "通用设置", self.create_general_settings_tab)
+        self.add_lazy_tab("mcp_servers_tab", "MCP 服务器", self.create_mcp_servers_tab)
+        self.add_lazy_tab("projects_tab", "项目列表", self.create_projects_tab)
+        self.add_lazy_tab("user_info_tab", "用户信息", self.create_user_info_tab)
+        self.add_lazy_tab("analytics_tab", "用量统计", self.create_analytics_tab)
+        self.add_lazy_tab("size_analyzer_tab", "大小分析", self.create_size_analyzer_tab)
+        self.add_lazy_tab("experimental_features_tab", "实验性功能", self.create_experimental_features_tab)
+        self.add_lazy_tab("raw_config_tab", "完整配置 (JSON)", self.create_raw_config_tab)
+        self.add_lazy_tab("profiler_tab", "性能", self.create_profiler_tab)
+        self.tab_widget.setTabVisible(self.tab_widget.indexOf(self.tab_hosts["profiler_tab"]), False)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+
+        # 隐藏的性能诊断标签页
+        profiler_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        profiler_shortcut.activated.connect(self.toggle_profiler_tab)
+        self.ensure_view(self.current_view_name())
 
         # Status bar
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setRange(0, 100)
+        self.load_progress.hide()
+        self.cancel_load_btn = QPushButton("取消")
+        self.cancel_load_btn.clicked.connect(self.cancel_load)
+        self.cancel_load_btn.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+        self.statusBar().addPermanentWidget(self.cancel_load_btn)
         self.statusBar().showMessage("就绪")
 
+    def add_lazy_tab(self, name, title, factory):
+        """添加一个占位标签页, 内容在首次激活时由 factory 创建"""
+        host = QWidget()
+        host_layout = QVBoxLayout(host)
+        host_layout.setContentsMargins(0, 0, 0, 0)
+        setattr(self, name, None)
+        self.tab_hosts[name] = host
+        self.tab_factories[name] = factory
+        self.stale_views.add(name)
+        self.tab_widget.addTab(host, title)
+
+    def ensure_view(self, name):
+        """获取标签页, 尚未创建时立即创建"""
+        tab = getattr(self, name)
+        if tab is None:
+            tab = self.tab_factories[name]()
+            setattr(self, name, tab)
+            self.tab_hosts[name].layout().addWidget(tab)
+        return tab
+
+    def current_view_name(self):
+        """当前标签页的名称"""
+        current = self.tab_widget.currentWidget()
+        for name, host in self.tab_hosts.items():
+            if host is current:
+                return name
+        return None
+
+    def on_tab_changed(self, index):
+        """切换标签页时创建/刷新过期的内容"""
+        _ = index
+        self.refresh_current_view()
+
+    def refresh_current_view(self):
+        """刷新当前标签页 (仅在内容过期时)"""
+        name = self.current_view_name()
+        if name is None:
+            return
+        tab = self.ensure_view(name)
+        if name in self.stale_views:
+            self.stale_views.discard(name)
+            tab.load_data(self.config_data)
+
+    def invalidate_view(self, name):
+        """标记视图过期; 当前可见的视图立即刷新"""
+        self.stale_views.add(name)
+        if self.current_view_name() == name:
+            self.refresh_current_view()
+
     def create_general_settings_tab(self):
         """创建通用设置标签页"""
         from .tabs.general_settings_tab import GeneralSettingsTab
-        tab = GeneralSettingsTab(self)
-        self.general_settings_tab = tab
-        self.tab_widget.addTab(tab, "通用设置")
+        return GeneralSettingsTab(self)
 
     def create_mcp_servers_tab(self):
         """创建 MCP 服务器标签页"""
         from .tabs.mcp_servers_tab import MCPServersTab
-        tab = MCPServersTab(self)
-        self.mcp_servers_tab = tab
-        self.tab_widget.addTab(tab, "MCP 服务器")
+        return MCPServersTab(self)
 
     def create_projects_tab(self):
         """创建项目列表标签页"""
         from .tabs.projects_tab import ProjectsTab
-        tab = ProjectsTab(self)
-        self.projects_tab = tab
-        self.tab_widget.addTab(tab, "项目列表")
+        return ProjectsTab(self)
 
     def create_user_info_tab(self):
         """创建用户信息标签页"""
         from .tabs.user_info_tab import UserInfoTab
-        tab = UserInfoTab(self)
-        self.user_info_tab = tab
-        self.tab_widget.addTab(tab, "用户信息")
+        return UserInfoTab(self)
+
+    def create_analytics_tab(self):
+        """创建用量统计标签页"""
+        from .tabs.analytics_tab import AnalyticsTab
+        return AnalyticsTab(self)
+
+    def create_size_analyzer_tab(self):
+        """创建配置大小分析标签页"""
+        from .tabs.size_analyzer_tab import SizeAnalyzerTab
+        return SizeAnalyzerTab(self)
 
     def create_experimental_features_tab(self):
         """创建实验性功能标签页"""
         from .tabs.experimental_features_tab import ExperimentalFeaturesTab
-        tab = ExperimentalFeaturesTab(self)
-        self.experimental_features_tab = tab
-        self.tab_widget.addTab(tab, "实验性功能")
+        return ExperimentalFeaturesTab(self)
 
     def create_raw_config_tab(self):
         """创建原始 JSON 配置标签页"""
         from .tabs.raw_config_tab import RawConfigTab
-        tab = RawConfigTab(self)
-        self.raw_config_tab = tab
-        self.tab_widget.addTab(tab, "完整配置 (JSON)")
+        return RawConfigTab(self)
+
+    def create_profiler_tab(self):
+        """创建性能诊断标签页"""
+        from .tabs.profiler_tab import ProfilerTab
+        return ProfilerTab(self)
+
+    def toggle_profiler_tab(self):
+        """显示/隐藏性能诊断标签页"""
+        index = self.tab_widget.indexOf(self.tab_hosts["profiler_tab"])
+        visible = not self.tab_widget.isTabVisible(index)
+        self.tab_widget.setTabVisible(index, visible)
+        if visible:
+            self.tab_widget.setCurrentIndex(index)
+            self.ensure_view("profiler_tab").refresh()
+
+    @timed()
+    def load_config(self, use_cache=False):
+        """加载配置文件 (在后台线程中读取和解析)
+
+        use_cache 为 True 时先显示上次的解析缓存, 再在后台校验并合并差异。
+        """
+        self.cancel_load()
+        self.flush_save()
+        if use_cache and self.load_cached_config():
+            return
+
+        self.load_thread = ConfigLoadThread(self.config_path, self)
+        self.load_thread.progress.connect(self.on_load_progress)
+        self.load_thread.loaded.connect(self.on_config_loaded)
+        self.load_thread.failed.connect(self.on_load_failed)
+        self.load_thread.finished.connect(self.load_thread.deleteLater)
+
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.cancel_load_btn.show()
+        self.statusBar().showMessage(f"正在加载配置: {self.config_path}")
+        self.load_thread.start()
+
+    def load_cached_config(self):
+        """立即显示缓存的配置并在后台校验, 没有可用的缓存时返回 False"""
+        cached = load_cache(self.config_path)
+        if cached is None:
+            return False
 
-    def load_config(self):
-        """加载配置文件"""
         try:
-            if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.config_data = json.load(f)
-            else:
-                self.config_data = {}
+            self.set_loaded_config(cached.data, cached.fingerprint)
+        except Exception:
+            # 缓存内容无法显示, 改为完整加载
+            return False
 
-            # 更新所有视图
-            self.general_settings_tab.load_data(self.config_data)
-            self.raw_config_tab.load_data(self.config_data)
-            self.mcp_servers_tab.load_data(self.config_data)
-            self.projects_tab.load_data(self.config_data)
-            self.user_info_tab.load_data(self.config_data)
-            self.experimental_features_tab.load_data(self.config_data)
+        self.statusBar().showMessage(f"已从缓存加载, 正在后台校验: {self.config_path}")
+        self.on_config_file_changed(expected_hash=cached.content_hash)
+        return True
 
-            self.statusBar().showMessage(f"配置已加载: {self.config_path}")
+    def cancel_load(self):
+        """取消正在进行的加载"""
+        if self.load_thread is not None:
+            thread = self.load_thread
+            self.load_thread = None
+            thread.progress.disconnect(self.on_load_progress)
+            thread.loaded.disconnect(self.on_config_loaded)
+            thread.failed.disconnect(self.on_load_failed)
+            thread.requestInterruption()
+            self.statusBar().showMessage("已取消加载")
+        self.load_progress.hide()
+        self.cancel_load_btn.hide()
+
+    def on_load_progress(self, value):
+        """读取/解析进度 (占总进度的 80%)"""
+        if self.sender() is not self.load_thread:
+            return
+        self.load_progress.setValue(value * 80 // 100)
+
+    def on_load_failed(self, message):
+        """加载失败"""
+        if self.sender() is not self.load_thread:
+            return
+        self.load_thread = None
+        self.load_progress.hide()
+        self.cancel_load_btn.hide()
+        QMessageBox.critical(self, "错误", f"加载配置文件失败:\n{message}")
+        self.statusBar().showMessage("加载失败")
+
+    @timed()
+    def on_config_loaded(self, data):
+        """解析完成, 刷新当前标签页, 其余标签页标记为过期"""
+        if self.sender() is not self.load_thread:
+            return
+        self.load_thread = None
+        self.cancel_load_btn.hide()
+
+        try:
+            self.set_loaded_config(data, self.sender().fingerprint)
         except Exception as e:
             QMessageBox.critical(self, "错误", f"加载配置文件失败:\n{str(e)}")
             self.statusBar().showMessage("加载失败")
+        else:
+            self.statusBar().showMessage(f"配置已加载: {self.config_path}")
+        finally:
+            self.load_progress.hide()
 
+    @timed()
+    def set_loaded_config(self, data, fingerprint):
+        """替换内存中的配置 (作为新的合并基准) 并刷新视图"""
+        self.config_data = data
+        self.local_changes = set()
+        self.force_merge = False
+        self.remember_file(fingerprint)
+        self.refresh_all_views()
+
+    def remember_file(self, fingerprint):
+        """记录本程序读取/写入后的文件指纹 (合并基准), 监视器不会把它当作外部修改"""
+        self.merge_fingerprint = fingerprint
+        self.watcher.remember(fingerprint)
+
+    @timed()
     def save_config_to_file(self):
-        """保存配置到文件"""
-        try:
-            # 备份原文件
-            if self.config_path.exists():
-                backup_path = self.config_path.with_suffix('.json.bak')
-                shutil.copy2(self.config_path, backup_path)
+        """保存配置到文件
+
+        连续的修改会被合并为一次写入, 写入在后台线程中完成。
+        """
+        self.save_pending = True
+        if self.save_requested_at is None:
+            self.save_requested_at = time.perf_counter()
+        self.save_timer.start()
 
-            # 写入新配置
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=2, ensure_ascii=False)
+    def on_config_changed(self, path):
+        """记录自上次保存以来本地修改过的路径"""
+        if not self.applying_external:
+            self.local_changes.add(path)
 
-            self.statusBar().showMessage(f"配置已保存到: {self.config_path}")
+    def is_locally_modified(self, path):
+        """path 是否与尚未写入文件的本地修改重叠"""
+        for changed in self.local_changes | self.saving_changes:
+            if changed[:len(path)] == path[:len(changed)]:
+                return True
+        return False
+
+    def take_save_snapshot(self):
+        """生成保存用的快照
+
+        顶层只做浅拷贝; 最近被修改的键做深拷贝, 避免后台序列化时被 GUI 线程改动。
+        """
+        snapshot = dict(self.config_data)
+        for key in {path[0] for path in self.local_changes if path}:
+            if key in snapshot:
+                snapshot[key] = copy.deepcopy(snapshot[key])
+        self.saving_changes = self.local_changes
+        self.local_changes = set()
+        return snapshot
+
+    @timed()
+    def start_save(self):
+        """启动后台保存"""
+        if not self.save_pending:
+            return
+        if self.save_thread is not None:
+            # 上一次保存完成后再写
+            return
+
+        self.save_pending = False
+        snapshot = self.take_save_snapshot()
+        self.save_thread = ConfigSaveThread(
+            self.config_path, snapshot,
+            local_paths=self.saving_changes,
+            base_fingerprint=None if self.force_merge else self.merge_fingerprint,
+            backup=True, parent=self
+        )
+        self.force_merge = False
+        self.save_thread.merged.connect(self.on_save_merged)
+        self.save_thread.saved.connect(self.on_config_saved)
+        self.save_thread.failed.connect(self.on_save_failed)
+        self.save_thread.conflicted.connect(self.on_save_conflicted)
+        self.save_thread.finished.connect(self.on_save_finished)
+        self.save_thread.start()
+
+    def on_config_saved(self, elapsed, fingerprint):
+        """保存完成"""
+        self.remember_file(fingerprint)
+        self.saving_changes = set()
+        latency = time.perf_counter() - self.save_requested_at if self.save_requested_at else elapsed
+        if not self.save_pending:
+            self.save_requested_at = None
+        self.statusBar().showMessage(
+            f"配置已保存到: {self.config_path} (写入 {elapsed * 1000:.0f} ms, 总延迟 {latency * 1000:.0f} ms)"
+        )
+
+    def on_save_merged(self, data, changes):
+        """保存时合并了 CLI 的并发修改, 同步到内存配置"""
+        # 正在保存的本地修改已包含在合并结果中
+        self.saving_changes = set()
+        self.apply_external_changes(data, changes)
+
+    def on_save_failed(self, message):
+        """保存失败"""
+        self.restore_saving_changes()
+        self.save_requested_at = None
+        QMessageBox.critical(self, "错误", message)
+        self.statusBar().showMessage("保存失败")
+
+    def on_save_conflicted(self):
+        """序列化期间配置被修改, 重新保存"""
+        self.restore_saving_changes()
+        self.save_pending = True
+
+    def restore_saving_changes(self):
+        """保存未完成, 这些修改仍需在下次保存时合并"""
+        self.local_changes |= self.saving_changes
+        self.saving_changes = set()
+        self.force_merge = True
+
+    def on_save_finished(self):
+        """保存线程结束, 处理排队中的保存"""
+        self.save_thread.deleteLater()
+        self.save_thread = None
+        if self.flushing:
+            # flush_save 会同步写入剩余的修改
+            return
+        if self.save_pending and not self.save_timer.isActive():
+            self.start_save()
+        elif self.reload_pending:
+            self.on_config_file_changed()
+
+    @timed()
+    def flush_save(self):
+        """立即同步写入尚未保存的修改 (用于退出和重新加载前)
+
+        与后台保存相同: 先备份, 再与磁盘上的新内容合并后写入, 不会覆盖 CLI 的并发修改。
+        """
+        self.save_timer.stop()
+        if self.save_thread is not None:
+            self.flushing = True
+            try:
+                self.save_thread.wait()
+                # 交付线程排队中的 saved/merged/conflicted/failed 信号
+                QCoreApplication.sendPostedEvents(self, QEvent.Type.MetaCall)
+            finally:
+                self.flushing = False
+        if not self.save_pending:
+            return
+
+        self.save_pending = False
+        self.save_requested_at = None
+        local_paths = self.local_changes | self.saving_changes
+        base_fingerprint = None if self.force_merge else self.merge_fingerprint
+        try:
+            data, changes, fingerprint = save_config(self.config_path, self.config_data, local_paths, base_fingerprint)
         except Exception as e:
-            raise Exception(f"保存到文件失败: {str(e)}")
+            # 合并失败时不写入, 保留本地修改
+            self.local_changes = local_paths
+            self.saving_changes = set()
+            self.force_merge = True
+            QMessageBox.warning(
+                self, "警告", f"无法与磁盘上的配置合并, 未保存的修改没有写入:\n{str(e)}"
+            )
+            return
+
+        self.local_changes = set()
+        self.saving_changes = set()
+        self.force_merge = False
+        self.remember_file(fingerprint)
+        if changes:
+            self.apply_external_changes(data, changes)
+
+    def on_config_file_changed(self, expected_hash=None):
+        """配置文件被外部修改, 在后台重新读取并比较
+
+        expected_hash 为内存中配置对应的内容哈希, 文件内容相同时跳过解析。
+        """
+        if self.load_thread is not None:
+            return
+        if self.reload_thread is not None or self.save_pending or self.save_thread is not None:
+            # 等当前的读取/保存完成后再处理
+            self.reload_pending = True
+            return
+
+        self.reload_pending = False
+        self.reload_thread = ConfigReloadThread(self.config_path, self.config_data, expected_hash, self)
+        self.reload_thread.diffed.connect(self.on_external_changes)
+        self.reload_thread.failed.connect(self.on_reload_failed)
+        self.reload_thread.finished.connect(self.on_reload_finished)
+        self.reload_thread.start()
+
+    def on_external_changes(self, data, changes):
+        """配置文件被外部修改后重新读取完成"""
+        self.remember_file(self.reload_thread.fingerprint)
+        self.apply_external_changes(data, changes)
+        if self.reload_thread.expected_hash is None:
+            return
+        if changes:
+            # 保存时不更新缓存, 上次保存后的启动会在这里更新
+            self.statusBar().showMessage(f"配置已加载 (缓存已过期, 已更新 {len(changes)} 处): {self.config_path}")
+        else:
+            self.statusBar().showMessage(f"配置已加载 (缓存已校验): {self.config_path}")
+
+    @timed()
+    def apply_external_changes(self, data, changes):
+        """只把外部修改过的键应用到内存配置和视图"""
+        applied = 0
+        self.applying_external = True
+        try:
+            for path in changes:
+                # 尚未保存的本地修改优先, 保存时再与文件合并
+                if self.is_locally_modified(path):
+                    self.force_merge = True
+                    continue
+                self.apply_external_change(data, path)
+                self.notify_changed(*path)
+                applied += 1
+        finally:
+            self.applying_external = False
+
+        if applied:
+            self.statusBar().showMessage(f"检测到配置文件被外部修改, 已更新 {applied} 处")
+
+    def apply_external_change(self, data, path):
+        """把新配置中 path 处的值写入内存配置"""
+        key = path[0]
+        if len(path) == 1:
+            if key in data:
+                self.config_data[key] = data[key]
+            else:
+                self.config_data.pop(key, None)
+            return
+
+        sub = path[1]
+        container = self.config_data.get(key)
+        if not isinstance(container, dict):
+            container = {}
+            self.config_data[key] = container
+        if sub in data[key]:
+            container[sub] = data[key][sub]
+        else:
+            container.pop(sub, None)
+
+    def on_reload_failed(self, message):
+        """重新读取失败 (例如 CLI 正在写入), 保留当前配置"""
+        self.statusBar().showMessage(f"重新读取配置文件失败: {message}")
+
+    def on_reload_finished(self):
+        """重新读取线程结束"""
+        self.reload_thread.deleteLater()
+        self.reload_thread = None
+        if self.reload_pending:
+            self.on_config_file_changed()
 
     def get_config_data(self):
         """获取配置数据"""
@@ -150,11 +562,64 @@ class ClaudeConfigGUI(QMainWindow):
         """设置配置数据"""
         self.config_data = data
 
+    def closeEvent(self, event):
+        """关闭窗口时停止后台加载并写入未保存的修改"""
+        thread = self.load_thread
+        self.cancel_load()
+        if thread is not None:
+            thread.wait()
+        if self.reload_thread is not None:
+            self.reload_thread.requestInterruption()
+            self.reload_thread.wait()
+        self.flush_save()
+        # 已交回结果的线程可能仍在写入解析缓存; 可以中断的线程 (如路径检查) 不再等待剩余的工作
+        workers = self.findChildren(QThread)
+        for worker in workers:
+            worker.requestInterruption()
+        for worker in workers:
+            worker.wait()
+        super().closeEvent(event)
+
+    def notify_changed(self, *path, source=None):
+        """通知配置中 path 处的值已改变, 只更新依赖该键的视图
+
+        标签页通过 CONFIG_KEYS 声明依赖的顶层键 (None 表示全部),
+        实现了 apply_change 的标签页只更新受影响的行, 其余标签页标记为过期。
+        source 为发起修改的标签页, 它自身不会被刷新。
+        """
+        if not path:
+            self.refresh_all_views()
+            self.config_changed.emit(path)
+            return
+
+        self.update_views(path, source)
+        self.config_changed.emit(path)
+
+    def notify_changes(self, paths, source=None):
+        """批量通知多个路径已改变 (例如压缩删除了大量项目)
+
+        每个顶层键的视图只更新一次, 保存时仍按各自的路径与文件合并。
+        """
+        for key in dict.fromkeys(path[0] for path in paths):
+            self.update_views((key,), source)
+        for path in paths:
+            self.config_changed.emit(path)
+
+    def update_views(self, path, source=None):
+        """更新依赖 path 的视图"""
+        for name in self.tab_hosts:
+            tab = getattr(self, name)
+            if tab is None or tab is source or name in self.stale_views:
+                continue
+            keys = getattr(tab, "CONFIG_KEYS", None)
+            if keys is not None and path[0] not in keys:
+                continue
+            if hasattr(tab, "apply_change"):
+                tab.apply_change(self.config_data, path)
+            else:
+                self.invalidate_view(name)
+
     def refresh_all_views(self):
-        """刷新所有视图"""
-        self.general_settings_tab.load_data(self.config_data)
-        self.raw_config_tab.load_data(self.config_data)
-        self.mcp_servers_tab.load_data(self.config_data)
-        self.projects_tab.load_data(self.config_data)
-        self.user_info_tab.load_data(self.config_data)
-        self.experimental_features_tab.load_data(self.config_data)
+        """刷新所有视图 (只重新加载当前标签页, 其余在激活时刷新)"""
+        self.stale_views.update(self.tab_hosts)
+        self.refresh_current_view()
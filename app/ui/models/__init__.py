@@ -0,0 +1,15 @@
+"""
+数据模型 (Model/View)
+"""
+from .json_tree_model import JsonTreeModel
+from .config_diff_model import ConfigDiffModel
+from .mcp_servers_model import McpServersModel
+from .repo_paths_model import RepoPathsModel
+from .feature_flags_model import FeatureFlagsModel
+from .search_filter_proxy_model import SearchFilterProxyModel
+from .size_tree_model import SizeTreeModel
+
+__all__ = [
+    'JsonTreeModel', 'McpServersModel', 'RepoPathsModel', 'FeatureFlagsModel', 'SearchFilterProxyModel',
+    'SizeTreeModel', 'ConfigDiffModel',
+]
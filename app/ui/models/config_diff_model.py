@@ -0,0 +1,115 @@
+"""
+配置比较结果表格模型
+每行一处变化 (DiffEntry), 值的预览在显示时才生成
+"""
+import json
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from ...core import LazySection, json_default
+from ...core.json_diff import DIFF_ADDED, DIFF_LABELS, DIFF_REMOVED, DIFF_REORDERED
+from ...core.json_pointer import format_pointer
+
+
+# 单元格和提示中预览的最大字符数
+PREVIEW_CHARS = 200
+TOOLTIP_CHARS = 4000
+
+KIND_COLORS = {
+    DIFF_ADDED: QColor("#22863a"),
+    DIFF_REMOVED: QColor("#d73a49"),
+    DIFF_REORDERED: QColor("#666666"),
+}
+
+
+def preview_value(value, limit):
+    """值的预览文本, 超过 limit 个字符时截断; 较大的 LazySection 不解析, 只截取原始文本"""
+    if isinstance(value, LazySection):
+        text = value.raw[:limit * 4].decode('utf-8', errors='replace')
+        text = " ".join(text.split())
+        truncated = len(value.raw) > limit * 4
+    else:
+        text = json.dumps(value, ensure_ascii=False, default=json_default)
+        truncated = False
+    if truncated or len(text) > limit:
+        return text[:limit] + "…"
+    return text
+
+
+class ConfigDiffModel(QAbstractTableModel):
+    """配置比较结果表格模型"""
+
+    HEADERS = ["路径", "变化", "原值", "新值"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        self._pointers = []
+        self._search = []
+        # 已生成的预览 {(行, 列, 长度): 文本}, 较大的值每次序列化代价较高
+        self._previews = {}
+
+    def set_entries(self, entries):
+        """设置比较结果 (整体重置)"""
+        self.beginResetModel()
+        self.entries = entries
+        self._pointers = [format_pointer(entry.path) or "/" for entry in entries]
+        self._search = [
+            f"{pointer}\n{DIFF_LABELS[entry.kind]}".lower() for pointer, entry in zip(self._pointers, entries)
+        ]
+        self._previews = {}
+        self.endResetModel()
+
+    def entry(self, row):
+        """行对应的 DiffEntry"""
+        return self.entries[row]
+
+    def search_key(self, row):
+        """行的搜索键 (供 SearchFilterProxyModel 使用)"""
+        return self._search[row]
+
+    # ---- QAbstractTableModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry = self.entries[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            return KIND_COLORS.get(entry.kind)
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+
+        if column == 0:
+            return self._pointers[index.row()]
+        if column == 1:
+            return DIFF_LABELS[entry.kind]
+
+        if entry.kind == DIFF_REORDERED:
+            return "(元素相同, 顺序不同)" if role == Qt.ItemDataRole.DisplayRole else None
+        value = entry.old if column == 2 else entry.new
+        if (column == 2 and entry.kind == DIFF_ADDED) or (column == 3 and entry.kind == DIFF_REMOVED):
+            return None
+        limit = PREVIEW_CHARS if role == Qt.ItemDataRole.DisplayRole else TOOLTIP_CHARS
+        key = (index.row(), column, limit)
+        text = self._previews.get(key)
+        if text is None:
+            text = self._previews[key] = preview_value(value, limit)
+        return text
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
@@ -0,0 +1,179 @@
+"""
+功能开关表格模型
+用于 cachedStatsigGates (复选框) 和 cachedGrowthBookFeatures (可编辑的值)
+"""
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class FeatureFlagsModel(QAbstractTableModel):
+    """功能开关表格模型
+
+    checkable 为 True 时第二列是复选框 (布尔值), 否则是可编辑的文本。
+    修改只保存在模型中, 由标签页在点击保存时写回配置; 外部修改只更新未被用户修改的行。
+    """
+
+    def __init__(self, headers, checkable=False, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.checkable = checkable
+        self._names = []
+        self._values = []
+        self._texts = []
+        # 用户修改过 (尚未保存) 的开关名称
+        self._edited = set()
+        self._search = []
+
+    def set_flags(self, flags):
+        """设置开关字典 (整体重置)"""
+        self.beginResetModel()
+        self._names = list(flags)
+        self._values = list(flags.values())
+        self._texts = [self._format_value(value) for value in self._values]
+        self._edited = set()
+        self._search = [self._make_search_key(row) for row in range(len(self._names))]
+        self.endResetModel()
+
+    def update_flag(self, name, flags):
+        """按外部修改更新一个开关 (新增、修改或删除), 用户修改过的行保持不变; 跳过时返回 False"""
+        if name in self._edited:
+            return False
+        row = self._names.index(name) if name in self._names else None
+        if name not in flags:
+            if row is not None:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                for column in (self._names, self._values, self._texts, self._search):
+                    del column[row]
+                self.endRemoveRows()
+            return True
+
+        if row is None:
+            row = len(self._names)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._names.append(name)
+            self._values.append(flags[name])
+            self._texts.append(self._format_value(flags[name]))
+            self._search.append(self._make_search_key(row))
+            self.endInsertRows()
+            return True
+
+        self._values[row] = flags[name]
+        self._texts[row] = self._format_value(flags[name])
+        self._search[row] = self._make_search_key(row)
+        self.dataChanged.emit(self.index(row, 1), self.index(row, 1))
+        return True
+
+    def sync_flags(self, flags):
+        """整个开关字典被外部替换: 没有用户修改时整体重置, 否则逐行更新, 返回跳过的行数"""
+        if not self._edited:
+            self.set_flags(flags)
+            return 0
+        names = list(self._names) + [name for name in flags if name not in self._names]
+        return sum(1 for name in names if not self.update_flag(name, flags))
+
+    def mark_saved(self, flags):
+        """修改已写回配置, flags 是写回的开关字典"""
+        for row, name in enumerate(self._names):
+            if name in self._edited:
+                self._values[row] = flags[name]
+        self._edited = set()
+
+    def name(self, row):
+        """开关名称"""
+        return self._names[row]
+
+    def value(self, row):
+        """开关的当前值 (复选框为布尔值)"""
+        return self._values[row]
+
+    def text(self, row):
+        """值列的文本"""
+        return self._texts[row]
+
+    def is_edited(self, row):
+        """值列的文本是否被用户编辑过"""
+        return self._names[row] in self._edited
+
+    def toggle(self, row):
+        """切换复选框"""
+        index = self.index(row, 1)
+        current = Qt.CheckState.Checked if self._values[row] else Qt.CheckState.Unchecked
+        new_state = Qt.CheckState.Unchecked if current == Qt.CheckState.Checked else Qt.CheckState.Checked
+        self.setData(index, new_state.value, Qt.ItemDataRole.CheckStateRole)
+
+    def search_key(self, row):
+        """行的搜索键 (供 SearchFilterProxyModel 使用)"""
+        return self._search[row]
+
+    def _make_search_key(self, row):
+        """生成搜索键"""
+        if self.checkable:
+            return self._names[row].lower()
+        return (self._names[row] + "\n" + self._texts[row]).lower()
+
+    @staticmethod
+    def _format_value(value):
+        """格式化值列"""
+        return str(value) if value is not None else "null"
+
+    # ---- QAbstractTableModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == 1:
+            if self.checkable:
+                flags |= Qt.ItemFlag.ItemIsUserCheckable
+            else:
+                flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+
+        if index.column() == 0:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._names[row]
+            return None
+
+        if self.checkable:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._values[row] else Qt.CheckState.Unchecked
+            return None
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._texts[row]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != 1:
+            return False
+        row = index.row()
+
+        if self.checkable and role == Qt.ItemDataRole.CheckStateRole:
+            self._values[row] = Qt.CheckState(value) == Qt.CheckState.Checked
+            self._edited.add(self._names[row])
+        elif not self.checkable and role == Qt.ItemDataRole.EditRole:
+            self._texts[row] = str(value)
+            self._edited.add(self._names[row])
+            self._search[row] = self._make_search_key(row)
+        else:
+            return False
+
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
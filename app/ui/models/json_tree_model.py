@@ -0,0 +1,291 @@
+"""
+JSON 树形模型
+按需展开的 JSON 文档树, 只为可见的子树创建节点
+"""
+import json
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from ...core import LazySection, json_default
+
+
+# 每次展开时最多加载的子节点数量
+FETCH_BATCH_SIZE = 500
+
+# 值列显示的最大字符数
+MAX_VALUE_LENGTH = 200
+
+
+class _JsonNode:
+    """树节点, 子节点在首次访问时才创建"""
+
+    __slots__ = ('key', 'value', 'parent', 'row', '_keys', '_children')
+
+    def __init__(self, key, value, parent=None, row=0):
+        self.key = key
+        self.value = value
+        self.parent = parent
+        self.row = row
+        self._keys = None
+        self._children = []
+
+    def is_container(self):
+        """是否为对象或数组"""
+        return isinstance(self.value, (dict, list, LazySection))
+
+    def total_count(self):
+        """子节点总数 (尚未解析的子树记为 1, 以便显示展开箭头)"""
+        if isinstance(self.value, (dict, list)):
+            return len(self.value)
+        if isinstance(self.value, LazySection):
+            return 1
+        return 0
+
+    def materialize(self):
+        """首次展开尚未解析的子树时解析它, 并替换父对象中的占位对象"""
+        if not isinstance(self.value, LazySection):
+            return
+        value = self.value.materialize()
+        if self.parent is not None and isinstance(self.parent.value, dict):
+            self.parent.value[self.key] = value
+        self.value = value
+
+    def loaded_count(self):
+        """已创建的子节点数量"""
+        return len(self._children)
+
+    def pending_count(self):
+        """尚未创建的子节点数量"""
+        if self._keys is None:
+            return self.total_count()
+        return len(self._keys) - len(self._children)
+
+    def fetch(self, count):
+        """再创建最多 count 个子节点, 返回实际创建的数量"""
+        if self._keys is None:
+            if isinstance(self.value, dict):
+                self._keys = list(self.value)
+            elif isinstance(self.value, list):
+                self._keys = list(range(len(self.value)))
+            else:
+                return 0
+
+        start = len(self._children)
+        for key in self._keys[start:start + count]:
+            self._children.append(_JsonNode(key, self.value[key], self, len(self._children)))
+        return len(self._children) - start
+
+    def reset(self, value):
+        """替换值并丢弃已创建的子节点"""
+        self.value = value
+        self._keys = None
+        self._children = []
+
+    def child(self, row):
+        """获取子节点"""
+        if 0 <= row < len(self._children):
+            return self._children[row]
+        return None
+
+    def find_child(self, key):
+        """按键查找已创建的子节点"""
+        for child in self._children:
+            if child.key == key:
+                return child
+        return None
+
+    def path(self):
+        """从根到当前节点的键路径"""
+        keys = []
+        node = self
+        while node.parent is not None:
+            keys.append(node.key)
+            node = node.parent
+        return tuple(reversed(keys))
+
+
+class JsonTreeModel(QAbstractItemModel):
+    """JSON 树形模型"""
+
+    HEADERS = ["键", "值"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = _JsonNode(None, {})
+
+    def set_data(self, data):
+        """设置文档 (只重置根节点, 不遍历内容)"""
+        self.beginResetModel()
+        self._root = _JsonNode(None, data)
+        self.endResetModel()
+
+    def node_from_index(self, index):
+        """获取索引对应的节点"""
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def update_path(self, path):
+        """path 对应的值已改变, 只更新树中已创建的相关节点"""
+        if not path:
+            self.set_data(self._root.value)
+            return
+
+        node = self._root
+        parent_index = QModelIndex()
+        for depth, key in enumerate(path):
+            container = node.value
+            if isinstance(container, list):
+                # 数组中的增删会移动后续元素, 直接替换整个数组节点
+                self._replace_node(node, self._index_of(node), node.value)
+                return
+            if not isinstance(container, dict):
+                return
+
+            child = node.find_child(key)
+            if key not in container:
+                if child is not None:
+                    self._remove_child(node, parent_index, child)
+                return
+            if child is None:
+                self._add_child(node, parent_index, key)
+                return
+
+            value = container[key]
+            if depth == len(path) - 1 or value is not child.value:
+                self._replace_node(child, self.index(child.row, 0, parent_index), value)
+                return
+            node = child
+            parent_index = self.index(child.row, 0, parent_index)
+
+    def _index_of(self, node):
+        """节点对应的索引"""
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _replace_node(self, node, index, value):
+        """替换节点的值并折叠其子节点"""
+        if node is self._root:
+            self.set_data(value)
+            return
+        if node.loaded_count():
+            self.beginRemoveRows(index, 0, node.loaded_count() - 1)
+            node.reset(value)
+            self.endRemoveRows()
+        else:
+            node.reset(value)
+        self.dataChanged.emit(index, index.siblingAtColumn(1))
+
+    def _add_child(self, node, parent_index, key):
+        """对象中新增了键"""
+        if node._keys is not None:
+            fully_loaded = node.loaded_count() == len(node._keys)
+            node._keys.append(key)
+            if fully_loaded:
+                row = node.loaded_count()
+                self.beginInsertRows(parent_index, row, row)
+                node.fetch(1)
+                self.endInsertRows()
+        self._summary_changed(node, parent_index)
+
+    def _remove_child(self, node, parent_index, child):
+        """对象中删除了键"""
+        row = child.row
+        self.beginRemoveRows(parent_index, row, row)
+        del node._children[row]
+        node._keys.remove(child.key)
+        for later in node._children[row:]:
+            later.row -= 1
+        self.endRemoveRows()
+        self._summary_changed(node, parent_index)
+
+    def _summary_changed(self, node, index):
+        """容器的子项数量改变"""
+        if node is not self._root:
+            value_index = index.siblingAtColumn(1)
+            self.dataChanged.emit(value_index, value_index)
+
+    def subtree_json(self, index):
+        """序列化单个子树"""
+        node = self.node_from_index(index)
+        return json.dumps(node.value, indent=2, ensure_ascii=False, default=json_default)
+
+    # ---- QAbstractItemModel 接口 ----
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        child = self.node_from_index(parent).child(row)
+        if child is None:
+            return QModelIndex()
+        return self.createIndex(row, column, child)
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        parent_node = node.parent
+        if parent_node is None or parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.node_from_index(parent).loaded_count()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.node_from_index(parent).total_count() > 0
+
+    def canFetchMore(self, parent):
+        return self.node_from_index(parent).pending_count() > 0
+
+    def fetchMore(self, parent):
+        node = self.node_from_index(parent)
+        node.materialize()
+        count = min(node.pending_count(), FETCH_BATCH_SIZE)
+        if count <= 0:
+            return
+        start = node.loaded_count()
+        self.beginInsertRows(parent, start, start + count - 1)
+        node.fetch(count)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return str(node.key)
+            return self._format_value(node.value)
+
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 0:
+            return "/".join(str(key) for key in node.path())
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    @staticmethod
+    def _format_value(value):
+        """格式化值列 (容器只显示摘要)"""
+        if isinstance(value, dict):
+            return f"{{…}} {len(value)} 项"
+        if isinstance(value, list):
+            return f"[…] {len(value)} 项"
+        if isinstance(value, LazySection):
+            bracket = "{…}" if value.raw[:1] == b"{" else "[…]"
+            return f"{bracket} 未加载 ({value.size / 1024 / 1024:.1f} MB, 展开时解析)"
+        text = json.dumps(value, ensure_ascii=False)
+        if len(text) > MAX_VALUE_LENGTH:
+            text = text[:MAX_VALUE_LENGTH] + "…"
+        return text
@@ -0,0 +1,179 @@
+"""
+MCP 服务器表格模型
+直接包装配置中的 mcpServers 字典, 单行修改只发出该行的信号
+"""
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from ...core.mcp_probe import PROBE_LABELS, PROBE_OK, PROBE_SKIPPED
+
+
+class McpServersModel(QAbstractTableModel):
+    """MCP 服务器表格模型"""
+
+    HEADERS = ["服务器名称", "命令", "参数", "环境变量", "检测", "启动 / 握手"]
+    PROBE_COLUMN = 4
+    TIMING_COLUMN = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.servers = {}
+        self._names = []
+        self._rows = {}
+        # 每行的小写搜索键: 名称、命令、参数和环境变量
+        self._search = []
+        # 检测结果: {名称: (ProbeResult, 检测时的配置)}, 配置改变后不再显示
+        self._probes = {}
+        # 正在检测的服务器
+        self._probing = set()
+
+    def set_servers(self, servers):
+        """设置 mcpServers 字典 (整体重置)"""
+        self.beginResetModel()
+        self.servers = servers
+        self._names = list(servers)
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        self._search = [self._make_search_key(name) for name in self._names]
+        self.endResetModel()
+
+    def server_name(self, row):
+        """获取行对应的服务器名称"""
+        if 0 <= row < len(self._names):
+            return self._names[row]
+        return None
+
+    def search_key(self, row):
+        """行的搜索键 (供 SearchFilterProxyModel 使用)"""
+        return self._search[row]
+
+    def _make_search_key(self, name):
+        """生成搜索键"""
+        config = self.servers.get(name, {})
+        env = config.get("env", {})
+        parts = [name, str(config.get("command", ""))]
+        parts.extend(str(arg) for arg in config.get("args", []))
+        parts.extend(f"{k}={v}" for k, v in env.items())
+        return "\n".join(parts).lower()
+
+    def set_probing(self, names):
+        """标记正在检测的服务器"""
+        self._probing = set(names)
+        self._emit_probe_changed(self._probing)
+
+    def set_probe_result(self, result, config):
+        """记录一个服务器的检测结果"""
+        self._probes[result.name] = (result, config)
+        self._probing.discard(result.name)
+        self._emit_probe_changed([result.name])
+
+    def clear_probing(self):
+        """检测结束 (或被取消), 清除检测中的标记"""
+        names, self._probing = self._probing, set()
+        self._emit_probe_changed(names)
+
+    def probe_result(self, name):
+        """服务器的检测结果, 没有检测过或之后配置已改变时返回 None"""
+        entry = self._probes.get(name)
+        if entry is None or entry[1] != self.servers.get(name):
+            return None
+        return entry[0]
+
+    def _emit_probe_changed(self, names):
+        """刷新检测结果列"""
+        for name in names:
+            row = self.row_of(name)
+            if row >= 0:
+                self.dataChanged.emit(self.index(row, self.PROBE_COLUMN), self.index(row, self.TIMING_COLUMN))
+
+    def row_of(self, name):
+        """获取服务器所在的行, 不存在时返回 -1"""
+        return self._rows.get(name, -1)
+
+    def update_server(self, name):
+        """服务器 name 被添加/修改/删除后同步对应的行"""
+        row = self.row_of(name)
+        if name in self.servers:
+            if row < 0:
+                row = len(self._names)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._names.append(name)
+                self._rows[name] = row
+                self._search.append(self._make_search_key(name))
+                self.endInsertRows()
+            else:
+                self._search[row] = self._make_search_key(name)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        elif row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._names[row]
+            del self._rows[name]
+            del self._search[row]
+            for later_row in range(row, len(self._names)):
+                self._rows[self._names[later_row]] = later_row
+            self.endRemoveRows()
+
+    # ---- QAbstractTableModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        name = self._names[index.row()]
+        column = index.column()
+        if column >= self.PROBE_COLUMN:
+            return self._probe_data(name, column, role)
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+
+        if column == 0:
+            return name
+
+        config = self.servers.get(name, {})
+        if column == 1:
+            return config.get("command", "")
+        if column == 2:
+            return str(config.get("args", []))
+
+        env = config.get("env", {})
+        return "; ".join([f"{k}={v}" for k, v in env.items()])
+
+    def _probe_data(self, name, column, role):
+        """检测结果列的数据"""
+        result = self.probe_result(name)
+        if role == Qt.ItemDataRole.DisplayRole:
+            if name in self._probing:
+                return "检测中..." if column == self.PROBE_COLUMN else ""
+            if result is None:
+                return ""
+            if column == self.PROBE_COLUMN:
+                return PROBE_LABELS.get(result.status, result.status)
+            if result.status == PROBE_SKIPPED:
+                return ""
+            spawn = f"{result.spawn_time * 1000:.0f}" if result.spawn_time is not None else "-"
+            init = f"{result.init_time * 1000:.0f}" if result.init_time is not None else "-"
+            return f"{spawn} / {init} ms"
+        if result is None:
+            return None
+        if role == Qt.ItemDataRole.ForegroundRole and result.status != PROBE_OK:
+            return QColor("#666" if result.status == PROBE_SKIPPED else "#d73a49")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if result.error:
+                return result.error
+            info = result.server_info
+            return f"{info.get('name', '')} {info.get('version', '')}".strip() or None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
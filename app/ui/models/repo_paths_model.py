@@ -0,0 +1,137 @@
+"""
+GitHub 仓库表格模型
+包装配置中的 githubRepoPaths 字典
+"""
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from ...core.path_health import STATUS_LABELS, STATUS_OK
+
+
+class RepoPathsModel(QAbstractTableModel):
+    """GitHub 仓库表格模型"""
+
+    HEADERS = ["仓库", "路径数量", "状态"]
+    STATUS_COLUMN = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.repos = {}
+        self._names = []
+        self._rows = {}
+        # 每行的小写搜索键: 仓库名称和所有本地路径
+        self._search = []
+        # 路径检查结果: {(仓库名称, 路径): 状态}
+        self._health = {}
+
+    def set_repos(self, repos):
+        """设置 githubRepoPaths 字典 (整体重置)"""
+        self.beginResetModel()
+        self.repos = repos
+        self._names = list(repos)
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        self._search = [self._make_search_key(name) for name in self._names]
+        self.endResetModel()
+
+    def repo_name(self, row):
+        """获取行对应的仓库名称"""
+        if 0 <= row < len(self._names):
+            return self._names[row]
+        return None
+
+    def row_of(self, name):
+        """获取仓库所在的行, 不存在时返回 -1"""
+        return self._rows.get(name, -1)
+
+    def path_status(self, name, path):
+        """仓库中某个路径的检查状态, 尚未检查时返回 None"""
+        return self._health.get((name, path))
+
+    def set_path_health(self, results):
+        """记录一批路径检查结果 (PathHealth 列表), 只刷新受影响仓库的状态列"""
+        rows = set()
+        for result in results:
+            self._health[(result.repo, result.path)] = result.status
+            rows.add(self.row_of(result.repo))
+        rows.discard(-1)
+        for row in rows:
+            index = self.index(row, self.STATUS_COLUMN)
+            self.dataChanged.emit(index, index)
+
+    def _repo_status(self, name):
+        """仓库的检查状态: (显示文本, 是否有问题)"""
+        statuses = [self._health.get((name, path)) for path in self.repos.get(name, [])]
+        problems = [status for status in statuses if status is not None and status != STATUS_OK]
+        if len(problems) == 1:
+            return STATUS_LABELS[problems[0]], True
+        if problems:
+            return f"{len(problems)} 个路径有问题", True
+        if None in statuses:
+            return "", False
+        return STATUS_LABELS[STATUS_OK], False
+
+    def search_key(self, row):
+        """行的搜索键 (供 SearchFilterProxyModel 使用)"""
+        return self._search[row]
+
+    def _make_search_key(self, name):
+        """生成搜索键"""
+        return "\n".join([name] + [str(path) for path in self.repos.get(name, [])]).lower()
+
+    def update_repo(self, name):
+        """仓库 name 被添加/修改/删除后同步对应的行"""
+        row = self.row_of(name)
+        if name in self.repos:
+            if row < 0:
+                row = len(self._names)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._names.append(name)
+                self._rows[name] = row
+                self._search.append(self._make_search_key(name))
+                self.endInsertRows()
+            else:
+                self._search[row] = self._make_search_key(name)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        elif row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._names[row]
+            del self._rows[name]
+            del self._search[row]
+            for later_row in range(row, len(self._names)):
+                self._rows[self._names[later_row]] = later_row
+            self.endRemoveRows()
+
+    # ---- QAbstractTableModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        name = self._names[index.row()]
+        if index.column() == self.STATUS_COLUMN:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._repo_status(name)[0]
+            if role == Qt.ItemDataRole.ForegroundRole and self._repo_status(name)[1]:
+                return QColor("#d73a49")
+            return None
+
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if index.column() == 0:
+            return name
+        return str(len(self.repos.get(name, [])))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
@@ -0,0 +1,42 @@
+"""
+搜索过滤代理模型
+源模型维护每行的小写搜索键 (search_key), 过滤时只做子串匹配
+"""
+from PySide6.QtCore import QSortFilterProxyModel
+
+
+class SearchFilterProxyModel(QSortFilterProxyModel):
+    """搜索过滤代理模型
+
+    源模型需要提供 search_key(row), 返回该行所有可搜索文本拼接后的小写字符串,
+    并在增删改行时同步更新, 这样过滤时不需要再读取单元格数据。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._terms = []
+
+    def set_filter_text(self, text):
+        """设置过滤文本, 以空格分隔的每个词都必须匹配"""
+        terms = text.lower().split()
+        if terms == self._terms:
+            return
+        self._terms = terms
+        self.invalidateFilter()
+
+    def filter_text(self):
+        """当前过滤文本"""
+        return " ".join(self._terms)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._terms:
+            return True
+        key = self.sourceModel().search_key(source_row)
+        for term in self._terms:
+            if term not in key:
+                return False
+        return True
+
+    def source_row(self, proxy_row):
+        """代理行号转换为源模型行号"""
+        return self.mapToSource(self.index(proxy_row, 0)).row()
@@ -0,0 +1,148 @@
+"""
+配置大小树形模型
+显示 SizeNode 树, 排序直接在模型中对每层子节点排序
+"""
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from ..widgets.numeric_item import format_size
+
+
+class SizeTreeModel(QAbstractItemModel):
+    """配置大小树形模型"""
+
+    HEADERS = ["键", "大小", "占比", "子键数"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = None
+        self._total = 0
+        # 节点 id -> (父节点, 行号)
+        self._positions = {}
+
+    def set_root(self, root):
+        """设置分析结果 (整体重置)"""
+        self.beginResetModel()
+        self._root = root
+        self._total = root.size if root is not None else 0
+        self._update_positions()
+        self.endResetModel()
+
+    def root(self):
+        """根节点"""
+        return self._root
+
+    def node_from_index(self, index):
+        """获取索引对应的节点"""
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def key_path(self, index):
+        """从根到索引对应节点的键路径"""
+        keys = []
+        node = self.node_from_index(index)
+        while node is not None and node is not self._root:
+            keys.append(node.key)
+            node = self._positions[id(node)][0]
+        return tuple(reversed(keys))
+
+    def _update_positions(self):
+        """重新记录每个节点的父节点和行号"""
+        self._positions = {}
+        if self._root is None:
+            return
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            for row, child in enumerate(node.children):
+                self._positions[id(child)] = (node, row)
+                if child.children:
+                    pending.append(child)
+
+    @staticmethod
+    def _sort_key(column):
+        """列对应的排序键"""
+        if column == 0:
+            return lambda node: str(node.key).lower()
+        if column == 3:
+            return lambda node: len(node.children)
+        return lambda node: node.size
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """对每层子节点排序"""
+        if self._root is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_nodes = [index.internalPointer() for index in old_indexes]
+
+        key = self._sort_key(column)
+        reverse = order == Qt.SortOrder.DescendingOrder
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            node.children.sort(key=key, reverse=reverse)
+            pending.extend(child for child in node.children if child.children)
+        self._update_positions()
+
+        new_indexes = [
+            self.createIndex(self._positions[id(node)][1], index.column(), node)
+            for index, node in zip(old_indexes, old_nodes)
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    # ---- QAbstractItemModel 接口 ----
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if node is None or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = self._positions[id(index.internalPointer())][0]
+        if parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(self._positions[id(parent_node)][1], 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.node_from_index(parent)
+        return len(node.children) if node is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        return node is not None and bool(node.children)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > 0:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role == Qt.ItemDataRole.ToolTipRole and column == 0:
+            return " › ".join(str(key) for key in self.key_path(index))
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if column == 0:
+            return str(node.key)
+        if column == 1:
+            return format_size(node.size)
+        if column == 2:
+            return f"{node.size * 100 / self._total:.1f}%" if self._total else ""
+        return str(len(node.children)) if node.children else ""
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
@@ -0,0 +1,203 @@
+"""
+用量统计标签页
+汇总各项目最近一次会话的费用、令牌和耗时, 统计在后台线程中增量计算
+"""
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QSplitter
+)
+from PySide6.QtCore import Qt
+
+from ...core import timed
+from ...core.project_stats import DEFAULT_TOP_N, ProjectStatsCache, STAT_NAMES, total_tokens
+from ..widgets.numeric_item import NumericItem
+from ..workers.project_stats_worker import ProjectStatsThread
+
+
+# 总计区域显示的统计: (统计名, 标签)
+TOTAL_ROWS = (
+    ("cost", "费用"),
+    ("duration", "会话耗时"),
+    ("api_duration", "API 耗时"),
+    ("input_tokens", "输入令牌"),
+    ("output_tokens", "输出令牌"),
+    ("cache_creation_tokens", "缓存写入令牌"),
+    ("cache_read_tokens", "缓存读取令牌"),
+    ("lines_added", "新增行数"),
+    ("lines_removed", "删除行数"),
+)
+
+_COST = STAT_NAMES.index("cost")
+_DURATION = STAT_NAMES.index("duration")
+
+
+def format_cost(value):
+    """格式化费用 (美元)"""
+    return f"${value:,.2f}"
+
+
+def format_duration(ms):
+    """格式化毫秒耗时"""
+    seconds = int(ms // 1000)
+    if seconds < 60:
+        return f"{ms / 1000:.1f} 秒"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} 分 {seconds} 秒"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} 小时 {minutes} 分"
+
+
+def format_stat(name, value):
+    """按统计类型格式化数值"""
+    if name == "cost":
+        return format_cost(value)
+    if name in ("duration", "api_duration"):
+        return format_duration(value)
+    return f"{value:,}"
+
+
+class AnalyticsTab(QWidget):
+    """用量统计标签页"""
+
+    CONFIG_KEYS = ("projects",)
+
+    def __init__(self, parent_window):
+        super().__init__()
+        self.parent_window = parent_window
+        self.stats_cache = ProjectStatsCache()
+        self.stats_thread = None
+        # 统计线程运行时又收到新数据, 结束后重新统计
+        self.stats_pending = False
+        # 首次统计时先读取磁盘上的缓存
+        self.disk_cache_loaded = False
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        layout = QVBoxLayout(self)
+
+        # 按钮栏
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("重新统计")
+        refresh_btn.clicked.connect(lambda: self.load_data(self.parent_window.get_config_data()))
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666; font-size: 11px;")
+        button_layout.addWidget(refresh_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.status_label)
+        layout.addLayout(button_layout)
+
+        # 总计
+        totals_group = QGroupBox("总计 (各项目最近一次会话)")
+        totals_layout = QFormLayout(totals_group)
+        self.projects_label = QLabel()
+        totals_layout.addRow("项目数:", self.projects_label)
+        self.total_labels = {}
+        for name, title in TOTAL_ROWS:
+            label = QLabel()
+            label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            self.total_labels[name] = label
+            totals_layout.addRow(f"{title}:", label)
+        layout.addWidget(totals_group)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        cost_group = QGroupBox(f"费用最高的 {DEFAULT_TOP_N} 个项目")
+        cost_layout = QVBoxLayout(cost_group)
+        self.top_cost_table = self.create_table(["项目", "费用", "令牌", "耗时"])
+        cost_layout.addWidget(self.top_cost_table)
+        splitter.addWidget(cost_group)
+
+        tokens_group = QGroupBox(f"令牌最多的 {DEFAULT_TOP_N} 个项目")
+        tokens_layout = QVBoxLayout(tokens_group)
+        self.top_tokens_table = self.create_table(["项目", "费用", "令牌", "耗时"])
+        tokens_layout.addWidget(self.top_tokens_table)
+        splitter.addWidget(tokens_group)
+
+        buckets_group = QGroupBox("会话耗时分布")
+        buckets_layout = QVBoxLayout(buckets_group)
+        self.buckets_table = self.create_table(["耗时", "项目数", "费用"])
+        self.buckets_table.setSortingEnabled(False)
+        buckets_layout.addWidget(self.buckets_table)
+        splitter.addWidget(buckets_group)
+
+        layout.addWidget(splitter)
+
+    def create_table(self, headers):
+        """创建只读表格"""
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSortingEnabled(True)
+        return table
+
+    @timed()
+    def load_data(self, config_data):
+        """加载数据 (在后台统计, 完成后刷新)"""
+        if self.stats_thread is not None:
+            self.stats_pending = True
+            return
+
+        self.stats_pending = False
+        self.status_label.setText("正在统计...")
+        self.stats_thread = ProjectStatsThread(
+            self.stats_cache, self.parent_window.config_path, config_data.get("projects", {}),
+            load_disk_cache=not self.disk_cache_loaded, parent=self
+        )
+        self.disk_cache_loaded = True
+        self.stats_thread.computed.connect(self.on_stats_computed)
+        self.stats_thread.failed.connect(self.status_label.setText)
+        self.stats_thread.conflicted.connect(self.on_stats_conflicted)
+        self.stats_thread.finished.connect(self.on_stats_finished)
+        self.stats_thread.start()
+
+    def on_stats_conflicted(self):
+        """统计时配置被修改, 结束后重新统计"""
+        self.stats_pending = True
+
+    def on_stats_finished(self):
+        """统计线程结束"""
+        self.stats_thread.deleteLater()
+        self.stats_thread = None
+        if self.stats_pending:
+            self.load_data(self.parent_window.get_config_data())
+
+    @timed()
+    def on_stats_computed(self, summary, recomputed, elapsed):
+        """显示汇总结果"""
+        self.projects_label.setText(f"{summary['projects']:,} (有会话记录: {summary['sessions']:,})")
+        for name, label in self.total_labels.items():
+            label.setText(format_stat(name, summary["totals"][name]))
+
+        self.fill_top_table(self.top_cost_table, summary["top_cost"])
+        self.fill_top_table(self.top_tokens_table, summary["top_tokens"])
+
+        buckets = summary["duration_buckets"]
+        self.buckets_table.setRowCount(len(buckets))
+        for row, (label, count, cost) in enumerate(buckets):
+            self.buckets_table.setItem(row, 0, QTableWidgetItem(label))
+            self.buckets_table.setItem(row, 1, NumericItem(count, f"{count:,}"))
+            self.buckets_table.setItem(row, 2, NumericItem(cost, format_cost(cost)))
+
+        self.status_label.setText(
+            f"统计耗时 {elapsed * 1000:.0f} ms, 重新计算 {recomputed:,} / {summary['projects']:,} 个项目"
+        )
+
+    def fill_top_table(self, table, rows):
+        """填充排行表格"""
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for row, (path, stats) in enumerate(rows):
+            tokens = total_tokens(stats)
+            path_item = QTableWidgetItem(path)
+            path_item.setToolTip(path)
+            table.setItem(row, 0, path_item)
+            table.setItem(row, 1, NumericItem(stats[_COST], format_cost(stats[_COST])))
+            table.setItem(row, 2, NumericItem(tokens, f"{tokens:,}"))
+            table.setItem(row, 3, NumericItem(stats[_DURATION], format_duration(stats[_DURATION])))
+        table.setSortingEnabled(True)
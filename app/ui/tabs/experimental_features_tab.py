@@ -2,15 +2,20 @@
 实验性功能标签页
 """
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QLineEdit,
     QPushButton, QMessageBox, QHeaderView, QAbstractItemView, QLabel, QGroupBox
 )
-from PySide6.QtCore import Qt
+
+from ...core import timed
+from ..models.feature_flags_model import FeatureFlagsModel
+from ..models.search_filter_proxy_model import SearchFilterProxyModel
 
 
 class ExperimentalFeaturesTab(QWidget):
     """实验性功能标签页"""
 
+    CONFIG_KEYS = ("cachedStatsigGates", "cachedGrowthBookFeatures")
+
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
@@ -25,17 +30,22 @@ class ExperimentalFeaturesTab(QWidget):
         info_label.setStyleSheet("color: #666; font-size: 11px; padding: 5px;")
         layout.addWidget(info_label)
 
+        # 搜索框
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("搜索功能名称或值...")
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+
         # Statsig Gates
         statsig_group = QGroupBox("Statsig 功能开关")
         statsig_layout = QVBoxLayout(statsig_group)
 
-        self.statsig_table = QTableWidget()
-        self.statsig_table.setColumnCount(2)
-        self.statsig_table.setHorizontalHeaderLabels(["功能名称", "状态"])
-        self.statsig_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.statsig_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.statsig_table.itemChanged.connect(self.on_statsig_item_changed)
-        self.statsig_table.cellDoubleClicked.connect(self.toggle_statsig_feature)
+        self.statsig_model = FeatureFlagsModel(["功能名称", "状态"], checkable=True, parent=self)
+        self.statsig_proxy_model = SearchFilterProxyModel(self)
+        self.statsig_proxy_model.setSourceModel(self.statsig_model)
+
+        self.statsig_table = self.create_table(self.statsig_proxy_model)
+        self.statsig_table.doubleClicked.connect(self.toggle_statsig_feature)
         statsig_layout.addWidget(self.statsig_table)
 
         layout.addWidget(statsig_group)
@@ -44,16 +54,18 @@ class ExperimentalFeaturesTab(QWidget):
         growthbook_group = QGroupBox("GrowthBook 功能标志")
         growthbook_layout = QVBoxLayout(growthbook_group)
 
-        self.growthbook_table = QTableWidget()
-        self.growthbook_table.setColumnCount(2)
-        self.growthbook_table.setHorizontalHeaderLabels(["功能名称", "值"])
-        self.growthbook_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.growthbook_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.growthbook_table.itemChanged.connect(self.on_growthbook_item_changed)
+        self.growthbook_model = FeatureFlagsModel(["功能名称", "值"], parent=self)
+        self.growthbook_proxy_model = SearchFilterProxyModel(self)
+        self.growthbook_proxy_model.setSourceModel(self.growthbook_model)
+
+        self.growthbook_table = self.create_table(self.growthbook_proxy_model)
         growthbook_layout.addWidget(self.growthbook_table)
 
         layout.addWidget(growthbook_group)
 
+        self.filter_edit.textChanged.connect(self.statsig_proxy_model.set_filter_text)
+        self.filter_edit.textChanged.connect(self.growthbook_proxy_model.set_filter_text)
+
         # 保存按钮
         button_layout = QHBoxLayout()
         save_btn = QPushButton("保存实验性设置")
@@ -62,60 +74,49 @@ class ExperimentalFeaturesTab(QWidget):
         button_layout.addWidget(save_btn)
         layout.addLayout(button_layout)
 
+    @timed()
     def load_data(self, config_data):
         """加载数据"""
-        # 阻止信号以防止加载时触发 itemChanged
-        self.statsig_table.blockSignals(True)
-        self.growthbook_table.blockSignals(True)
-
-        # Statsig Gates
-        statsig_gates = config_data.get("cachedStatsigGates", {})
-        self.statsig_table.setRowCount(0)
-        for name, value in statsig_gates.items():
-            row = self.statsig_table.rowCount()
-            self.statsig_table.insertRow(row)
-
-            name_item = QTableWidgetItem(name)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.statsig_table.setItem(row, 0, name_item)
-
-            value_item = QTableWidgetItem()
-            value_item.setFlags(value_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            value_item.setCheckState(Qt.CheckState.Checked if value else Qt.CheckState.Unchecked)
-            self.statsig_table.setItem(row, 1, value_item)
-
-        # GrowthBook Features
-        growthbook = config_data.get("cachedGrowthBookFeatures", {})
-        self.growthbook_table.setRowCount(0)
-        for name, value in growthbook.items():
-            row = self.growthbook_table.rowCount()
-            self.growthbook_table.insertRow(row)
-
-            self.growthbook_table.setItem(row, 0, QTableWidgetItem(name))
-
-            value_str = str(value) if value is not None else "null"
-            self.growthbook_table.setItem(row, 1, QTableWidgetItem(value_str))
-
-        # 解除阻塞
-        self.statsig_table.blockSignals(False)
-        self.growthbook_table.blockSignals(False)
-
-    def on_statsig_item_changed(self, item):
-        """Statsig 项目改变事件"""
-        _ = item  # 值将在点击保存按钮时保存
-        pass
-
-    def on_growthbook_item_changed(self, item):
-        """GrowthBook 项目改变事件"""
-        _ = item  # 值将在点击保存按钮时保存
-        pass
-
-    def toggle_statsig_feature(self, row, col):
+        self.load_statsig_gates(config_data)
+        self.load_growthbook_features(config_data)
+
+    @timed()
+    def apply_change(self, config_data, path):
+        """只更新受影响的行, 用户修改过 (尚未保存) 的行保持不变"""
+        model = self.statsig_model if path[0] == "cachedStatsigGates" else self.growthbook_model
+        flags = config_data.get(path[0], {})
+        if not isinstance(flags, dict):
+            flags = {}
+        if len(path) > 1:
+            skipped = 0 if model.update_flag(path[1], flags) else 1
+        else:
+            skipped = model.sync_flags(flags)
+        if skipped:
+            self.parent_window.statusBar().showMessage(
+                f"{skipped} 个已修改但未保存的开关在配置中也被改变, 保存时将以此处的修改为准"
+            )
+
+    def create_table(self, model):
+        """创建功能开关表格"""
+        table = QTableView()
+        table.setModel(model)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        return table
+
+    def load_statsig_gates(self, config_data):
+        """加载 Statsig Gates"""
+        self.statsig_model.set_flags(config_data.get("cachedStatsigGates", {}))
+
+    def load_growthbook_features(self, config_data):
+        """加载 GrowthBook Features"""
+        self.growthbook_model.set_flags(config_data.get("cachedGrowthBookFeatures", {}))
+
+    def toggle_statsig_feature(self, index):
         """双击切换 Statsig 功能"""
-        if col == 1:
-            item = self.statsig_table.item(row, 1)
-            current = item.checkState()
-            item.setCheckState(Qt.CheckState.Unchecked if current == Qt.CheckState.Checked else Qt.CheckState.Checked)
+        if index.column() == 1:
+            self.statsig_model.toggle(self.statsig_proxy_model.mapToSource(index).row())
 
     def save_features(self):
         """保存实验性功能设置"""
@@ -124,24 +125,19 @@ class ExperimentalFeaturesTab(QWidget):
 
             # 保存 Statsig Gates
             statsig_gates = {}
-            for row in range(self.statsig_table.rowCount()):
-                name_item = self.statsig_table.item(row, 0)
-                value_item = self.statsig_table.item(row, 1)
-                if name_item and value_item:
-                    name = name_item.text()
-                    value = value_item.checkState() == Qt.CheckState.Checked
-                    statsig_gates[name] = value
+            for row in range(self.statsig_model.rowCount()):
+                statsig_gates[self.statsig_model.name(row)] = bool(self.statsig_model.value(row))
 
             config_data["cachedStatsigGates"] = statsig_gates
 
-            # 保存 GrowthBook Features
+            # 保存 GrowthBook Features (未编辑的值保持原样)
             growthbook = {}
-            for row in range(self.growthbook_table.rowCount()):
-                name_item = self.growthbook_table.item(row, 0)
-                value_item = self.growthbook_table.item(row, 1)
-                if name_item and value_item:
-                    name = name_item.text()
-                    value_str = value_item.text()
+            for row in range(self.growthbook_model.rowCount()):
+                name = self.growthbook_model.name(row)
+                if not self.growthbook_model.is_edited(row):
+                    growthbook[name] = self.growthbook_model.value(row)
+                else:
+                    value_str = self.growthbook_model.text(row)
 
                     # 解析值
                     if value_str == "true":
@@ -160,10 +156,15 @@ class ExperimentalFeaturesTab(QWidget):
                     growthbook[name] = value
 
             config_data["cachedGrowthBookFeatures"] = growthbook
+            self.statsig_model.mark_saved(statsig_gates)
+            self.growthbook_model.mark_saved(growthbook)
 
             self.parent_window.set_config_data(config_data)
             self.parent_window.save_config_to_file()
-            self.parent_window.raw_config_tab.load_data(config_data)
+
+            # 表格本身已是最新, 只通知其他视图
+            self.parent_window.notify_changed("cachedStatsigGates", source=self)
+            self.parent_window.notify_changed("cachedGrowthBookFeatures", source=self)
 
             QMessageBox.information(self, "成功", "实验性功能设置已保存!")
             self.parent_window.statusBar().showMessage("实验性功能已保存")
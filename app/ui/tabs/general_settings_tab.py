@@ -7,10 +7,18 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from ...core import timed
+
 
 class GeneralSettingsTab(QWidget):
     """通用设置标签页"""
 
+    CONFIG_KEYS = (
+        "autoUpdates", "installMethod",
+        "sonnet45MigrationComplete", "opus45MigrationComplete", "thinkingMigrationComplete",
+        "officialMarketplaceAutoInstallAttempted", "officialMarketplaceAutoInstalled",
+    )
+
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
@@ -63,6 +71,7 @@ class GeneralSettingsTab(QWidget):
         button_layout.addWidget(save_btn)
         layout.addLayout(button_layout)
 
+    @timed()
     def load_data(self, config_data):
         """加载数据"""
         self.auto_updates_checkbox.setChecked(config_data.get("autoUpdates", False))
@@ -96,6 +105,7 @@ class GeneralSettingsTab(QWidget):
             config_data["autoUpdates"] = self.auto_updates_checkbox.isChecked()
             self.parent_window.set_config_data(config_data)
             self.parent_window.save_config_to_file()
+            self.parent_window.notify_changed("autoUpdates", source=self)
             QMessageBox.information(self, "成功", "通用设置已保存!")
             self.parent_window.statusBar().showMessage("设置已保存")
         except Exception as e:
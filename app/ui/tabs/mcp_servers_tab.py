@@ -1,19 +1,43 @@
 """
 MCP 服务器标签页
 """
+import copy
+
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QLineEdit, QLabel, QSplitter, QGroupBox,
     QPushButton, QMessageBox, QHeaderView, QAbstractItemView
 )
 from PySide6.QtCore import Qt
 
+from ...core import config_ops, timed
+from ...core.mcp_inventory import InventoryCache
+from ...core.mcp_probe import DEFAULT_PROBE_TIMEOUT, PROBE_OK, PROBE_SKIPPED
+from ..models.mcp_servers_model import McpServersModel
+from ..models.search_filter_proxy_model import SearchFilterProxyModel
+from ..widgets.mcp_inventory_view import McpInventoryView
+from ..workers.mcp_inventory_worker import McpInventoryThread
+from ..workers.mcp_probe_worker import McpProbeThread
+
 
 class MCPServersTab(QWidget):
     """MCP 服务器标签页"""
 
+    CONFIG_KEYS = ("mcpServers",)
+
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
+        self.probe_thread = None
+        # 最近一次检测的配置快照 {名称: 配置}, 检测线程和表格只读
+        self.probe_configs = {}
+        # 工具/资源清单: 缓存只在清单线程中修改; inventories 为 {名称: (McpInventory, 获取时的配置)}
+        self.inventory_cache = InventoryCache()
+        self.inventory_cache_loaded = False
+        self.inventories = {}
+        self.inventory_configs = {}
+        self.inventory_thread = None
+        # 清单线程运行期间请求的服务器 {名称: 是否强制重新获取}
+        self.inventory_pending = {}
         self.init_ui()
 
     def init_ui(self):
@@ -33,36 +57,219 @@ class MCPServersTab(QWidget):
         button_layout.addWidget(add_btn)
         button_layout.addWidget(edit_btn)
         button_layout.addWidget(delete_btn)
+
+        self.probe_btn = QPushButton("检测")
+        self.probe_btn.setToolTip("并发启动所有服务器并完成 MCP 握手, 测量启动和握手耗时")
+        self.probe_btn.clicked.connect(self.probe_servers)
+        button_layout.addWidget(self.probe_btn)
+        inventory_btn = QPushButton("获取工具列表")
+        inventory_btn.setToolTip("获取所有服务器的工具和资源列表 (有效期内的取自缓存, 不启动进程)")
+        inventory_btn.clicked.connect(self.fetch_all_inventories)
+        button_layout.addWidget(inventory_btn)
         button_layout.addStretch()
 
+        # 搜索框
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("搜索名称、命令、参数或环境变量...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setMaximumWidth(300)
+        button_layout.addWidget(self.filter_edit)
+
         layout.addLayout(button_layout)
 
         # 表格
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["服务器名称", "命令", "参数", "环境变量"])
+        self.model = McpServersModel(self)
+        self.proxy_model = SearchFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.filter_edit.textChanged.connect(self.proxy_model.set_filter_text)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        for column in (McpServersModel.PROBE_COLUMN, McpServersModel.TIMING_COLUMN):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table.itemDoubleClicked.connect(self.edit_server)
-        layout.addWidget(self.table)
-
+        self.table.doubleClicked.connect(self.edit_server)
+        self.table.selectionModel().selectionChanged.connect(self.on_server_selected)
+
+        # 选中服务器的工具和资源
+        inventory_group = QGroupBox("工具与资源")
+        inventory_layout = QVBoxLayout(inventory_group)
+        self.inventory_view = McpInventoryView()
+        self.inventory_view.set_message("选择一个服务器查看它提供的工具和资源")
+        inventory_layout.addWidget(self.inventory_view)
+        refetch_btn = QPushButton("重新获取")
+        refetch_btn.setToolTip("忽略缓存, 重新启动选中的服务器获取列表")
+        refetch_btn.clicked.connect(self.refetch_selected_inventory)
+        refetch_layout = QHBoxLayout()
+        refetch_layout.addStretch()
+        refetch_layout.addWidget(refetch_btn)
+        inventory_layout.addLayout(refetch_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.table)
+        splitter.addWidget(inventory_group)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter)
+
+        self.probe_label = QLabel()
+        self.probe_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.probe_label)
+
+    @timed()
     def load_data(self, config_data):
         """加载数据"""
+        self.model.set_servers(config_data.get("mcpServers", {}))
+
+    @timed()
+    def apply_change(self, config_data, path):
+        """只更新受影响的服务器行"""
         mcp_servers = config_data.get("mcpServers", {})
+        if len(path) < 2 or mcp_servers is not self.model.servers:
+            self.load_data(config_data)
+            return
+        self.model.update_server(path[1])
 
-        self.table.setRowCount(0)
-        for name, config in mcp_servers.items():
-            row = self.table.rowCount()
-            self.table.insertRow(row)
+    def probe_servers(self):
+        """在后台检测所有服务器"""
+        if self.probe_thread is not None:
+            return
+        servers = self.parent_window.get_config_data().get("mcpServers", {})
+        self.probe_configs = {
+            name: copy.deepcopy(config) for name, config in servers.items() if isinstance(config, dict)
+        }
+        if not self.probe_configs:
+            return
 
-            self.table.setItem(row, 0, QTableWidgetItem(name))
-            self.table.setItem(row, 1, QTableWidgetItem(config.get("command", "")))
-            self.table.setItem(row, 2, QTableWidgetItem(str(config.get("args", []))))
+        self.probe_btn.setEnabled(False)
+        self.probe_label.setText(f"正在检测 {len(self.probe_configs)} 个服务器...")
+        self.model.set_probing(self.probe_configs)
+        self.probe_thread = McpProbeThread(self.probe_configs, DEFAULT_PROBE_TIMEOUT, parent=self)
+        self.probe_thread.probed.connect(self.on_server_probed)
+        self.probe_thread.completed.connect(self.on_probe_completed)
+        self.probe_thread.failed.connect(self.probe_label.setText)
+        self.probe_thread.finished.connect(self.on_probe_finished)
+        self.probe_thread.start()
+
+    def on_server_probed(self, result):
+        """显示一个服务器的检测结果"""
+        self.model.set_probe_result(result, self.probe_configs.get(result.name))
+
+    def on_probe_completed(self, count, elapsed):
+        """显示检测汇总: 失败数和最慢的服务器"""
+        results = [self.model.probe_result(name) for name in self.probe_configs]
+        results = [result for result in results if result is not None]
+        skipped = sum(1 for result in results if result.status == PROBE_SKIPPED)
+        failures = sum(1 for result in results if result.status not in (PROBE_OK, PROBE_SKIPPED))
+        text = f"已检测 {count - skipped} 个服务器, {failures} 个失败, 耗时 {elapsed:.1f} 秒"
+        if skipped:
+            text += f" ({skipped} 个远程服务器未检测)"
+        timed_results = [result for result in results if result.init_time is not None]
+        if timed_results:
+            slowest = max(timed_results, key=lambda result: result.init_time)
+            text += f"; 最慢: {slowest.name} ({slowest.init_time * 1000:.0f} ms)"
+        self.probe_label.setText(text)
+
+    def on_probe_finished(self):
+        """检测线程结束"""
+        self.probe_thread.deleteLater()
+        self.probe_thread = None
+        self.model.clear_probing()
+        self.probe_btn.setEnabled(True)
+
+    def current_inventory(self, name):
+        """服务器的清单, 没有获取过或之后配置已改变时返回 None"""
+        entry = self.inventories.get(name)
+        servers = self.parent_window.get_config_data().get("mcpServers", {})
+        if entry is None or entry[1] != servers.get(name):
+            return None
+        return entry[0]
+
+    def on_server_selected(self):
+        """显示选中服务器的清单, 没有时在后台获取 (缓存有效时不启动进程)"""
+        name = self.selected_server_name()
+        if name is None:
+            return
+        inventory = self.current_inventory(name)
+        if inventory is not None:
+            self.inventory_view.set_inventory(inventory)
+            return
+        self.inventory_view.set_message(f"正在获取 {name} 的工具列表...")
+        self.fetch_inventories([name])
 
-            env = config.get("env", {})
-            env_str = "; ".join([f"{k}={v}" for k, v in env.items()])
-            self.table.setItem(row, 3, QTableWidgetItem(env_str))
+    def fetch_all_inventories(self):
+        """获取所有服务器的清单"""
+        self.fetch_inventories(list(self.parent_window.get_config_data().get("mcpServers", {})))
+
+    def refetch_selected_inventory(self):
+        """忽略缓存重新获取选中服务器的清单"""
+        name = self.selected_server_name()
+        if name is None:
+            QMessageBox.warning(self, "警告", "请先选择一个服务器")
+            return
+        self.inventory_view.set_message(f"正在重新获取 {name} 的工具列表...")
+        self.fetch_inventories([name], force=True)
+
+    def fetch_inventories(self, names, force=False):
+        """在后台获取服务器的清单"""
+        if self.inventory_thread is not None:
+            for name in names:
+                self.inventory_pending[name] = self.inventory_pending.get(name, False) or force
+            return
+
+        servers = self.parent_window.get_config_data().get("mcpServers", {})
+        configs = {
+            name: copy.deepcopy(servers[name]) for name in names if isinstance(servers.get(name), dict)
+        }
+        if not configs:
+            return
+        self.inventory_configs = configs
+        self.inventory_thread = McpInventoryThread(
+            self.inventory_cache, self.parent_window.config_path, configs, force=force,
+            load_disk_cache=not self.inventory_cache_loaded, parent=self
+        )
+        self.inventory_cache_loaded = True
+        self.inventory_thread.fetched.connect(self.on_inventory_fetched)
+        self.inventory_thread.completed.connect(self.on_inventory_completed)
+        self.inventory_thread.failed.connect(self.probe_label.setText)
+        self.inventory_thread.finished.connect(self.on_inventory_finished)
+        self.inventory_thread.start()
+
+    def on_inventory_fetched(self, inventory):
+        """记录一个服务器的清单, 是当前选中的服务器时显示"""
+        self.inventories[inventory.name] = (inventory, self.inventory_configs.get(inventory.name))
+        if inventory.name == self.selected_server_name():
+            self.inventory_view.set_inventory(inventory)
+
+    def on_inventory_completed(self, count, spawned, elapsed):
+        """显示清单获取的汇总"""
+        if spawned:
+            self.probe_label.setText(
+                f"已获取 {count} 个服务器的工具列表, 启动了 {spawned} 个进程, 耗时 {elapsed:.1f} 秒"
+            )
+
+    def on_inventory_finished(self):
+        """清单线程结束, 处理期间的请求"""
+        self.inventory_thread.deleteLater()
+        self.inventory_thread = None
+        pending, self.inventory_pending = self.inventory_pending, {}
+        forced = [name for name, force in pending.items() if force]
+        if forced:
+            self.fetch_inventories(forced, force=True)
+        cached = [name for name, force in pending.items() if not force]
+        if cached:
+            self.fetch_inventories(cached)
+
+    def selected_server_name(self):
+        """当前选中的服务器名称"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.server_name(self.proxy_model.mapToSource(rows[0]).row())
 
     def add_server(self):
         """添加服务器"""
@@ -72,34 +279,25 @@ class MCPServersTab(QWidget):
             server_data = dialog.get_server_data()
 
             config_data = self.parent_window.get_config_data()
-            if "mcpServers" not in config_data:
-                config_data["mcpServers"] = {}
-
-            config_data["mcpServers"][server_data["name"]] = {
-                "command": server_data["command"],
-                "args": server_data["args"]
-            }
-
-            if server_data["env_vars"]:
-                config_data["mcpServers"][server_data["name"]]["env"] = server_data["env_vars"]
+            changed = config_ops.set_server(
+                config_data, server_data["name"], server_data["command"],
+                server_data["args"], server_data["env_vars"]
+            )
 
-            self.parent_window.set_config_data(config_data)
-            self.parent_window.save_config_to_file()
-            self.load_data(config_data)
-            self.parent_window.raw_config_tab.load_data(config_data)
+            if changed:
+                self.parent_window.set_config_data(config_data)
+                self.parent_window.save_config_to_file()
+                self.parent_window.notify_changed(*changed)
 
             QMessageBox.information(self, "成功", f"MCP服务器 '{server_data['name']}' 已添加!")
 
     def edit_server(self):
         """编辑服务器"""
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        server_name = self.selected_server_name()
+        if server_name is None:
             QMessageBox.warning(self, "警告", "请先选择一个服务器")
             return
 
-        row = selected_items[0].row()
-        server_name = self.table.item(row, 0).text()
-
         config_data = self.parent_window.get_config_data()
         mcp_servers = config_data.get("mcpServers", {})
         if server_name not in mcp_servers:
@@ -108,39 +306,35 @@ class MCPServersTab(QWidget):
         server_config = mcp_servers[server_name]
 
         from ..dialogs.mcp_server_dialog import MCPServerDialog
-        dialog = MCPServerDialog(self, server_name, server_config)
+        dialog = MCPServerDialog(self, server_name, server_config, self.current_inventory(server_name))
         if dialog.exec() == QMessageBox.DialogCode.Accepted:
             server_data = dialog.get_server_data()
 
             # 如果名称改变,删除旧条目
+            changes = []
             if server_data["name"] != server_name:
-                del mcp_servers[server_name]
-
-            mcp_servers[server_data["name"]] = {
-                "command": server_data["command"],
-                "args": server_data["args"]
-            }
-
-            if server_data["env_vars"]:
-                mcp_servers[server_data["name"]]["env"] = server_data["env_vars"]
-
-            self.parent_window.set_config_data(config_data)
-            self.parent_window.save_config_to_file()
-            self.load_data(config_data)
-            self.parent_window.raw_config_tab.load_data(config_data)
+                changes.append(config_ops.remove_server(config_data, server_name))
+            changes.append(config_ops.set_server(
+                config_data, server_data["name"], server_data["command"],
+                server_data["args"], server_data["env_vars"]
+            ))
+            changes = [changed for changed in changes if changed]
+
+            if changes:
+                self.parent_window.set_config_data(config_data)
+                self.parent_window.save_config_to_file()
+                for changed in changes:
+                    self.parent_window.notify_changed(*changed)
 
             QMessageBox.information(self, "成功", f"MCP服务器 '{server_data['name']}' 已更新!")
 
     def delete_server(self):
         """删除服务器"""
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        server_name = self.selected_server_name()
+        if server_name is None:
             QMessageBox.warning(self, "警告", "请先选择一个服务器")
             return
 
-        row = selected_items[0].row()
-        server_name = self.table.item(row, 0).text()
-
         reply = QMessageBox.question(
             self, "确认删除",
             f"确定要删除MCP服务器 '{server_name}' 吗?",
@@ -149,13 +343,10 @@ class MCPServersTab(QWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             config_data = self.parent_window.get_config_data()
-            mcp_servers = config_data.get("mcpServers", {})
-            if server_name in mcp_servers:
-                del mcp_servers[server_name]
-
+            changed = config_ops.remove_server(config_data, server_name)
+            if changed:
                 self.parent_window.set_config_data(config_data)
                 self.parent_window.save_config_to_file()
-                self.load_data(config_data)
-                self.parent_window.raw_config_tab.load_data(config_data)
+                self.parent_window.notify_changed(*changed)
 
                 QMessageBox.information(self, "成功", f"MCP服务器 '{server_name}' 已删除!")
@@ -0,0 +1,154 @@
+"""
+性能诊断标签页 (默认隐藏, Ctrl+Shift+P 显示)
+"""
+import time
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+    QMessageBox, QHeaderView, QAbstractItemView, QLabel, QCheckBox, QFileDialog, QGroupBox,
+    QSplitter
+)
+from PySide6.QtCore import Qt
+
+from ...core import profiler
+from ..widgets.numeric_item import NumericItem
+
+
+# 最近记录表格显示的条数
+RECENT_LIMIT = 500
+
+
+class ProfilerTab(QWidget):
+    """性能诊断标签页"""
+
+    # 不依赖任何配置键
+    CONFIG_KEYS = ()
+
+    def __init__(self, parent_window):
+        super().__init__()
+        self.parent_window = parent_window
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        layout = QVBoxLayout(self)
+
+        # 按钮栏
+        button_layout = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox("启用记录")
+        self.enabled_checkbox.setChecked(profiler.enabled)
+        self.enabled_checkbox.toggled.connect(self.set_enabled)
+        refresh_btn = QPushButton("刷新")
+        clear_btn = QPushButton("清空")
+        export_btn = QPushButton("导出 Chrome Trace...")
+        refresh_btn.clicked.connect(self.refresh)
+        clear_btn.clicked.connect(self.clear_records)
+        export_btn.clicked.connect(self.export_trace)
+
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet("color: #666; font-size: 11px;")
+
+        button_layout.addWidget(self.enabled_checkbox)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(clear_btn)
+        button_layout.addWidget(export_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.count_label)
+        layout.addLayout(button_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        # 汇总
+        summary_group = QGroupBox("按操作汇总")
+        summary_layout = QVBoxLayout(summary_group)
+        self.summary_table = self.create_table(
+            ["操作", "次数", "总耗时 (ms)", "平均 (ms)", "最大 (ms)", "最近 (ms)", "平均内存块增量"]
+        )
+        summary_layout.addWidget(self.summary_table)
+        splitter.addWidget(summary_group)
+
+        # 最近的记录
+        recent_group = QGroupBox(f"最近 {RECENT_LIMIT} 条记录")
+        recent_layout = QVBoxLayout(recent_group)
+        self.recent_table = self.create_table(["开始 (ms)", "操作", "耗时 (ms)", "内存块增量", "线程"])
+        recent_layout.addWidget(self.recent_table)
+        splitter.addWidget(recent_group)
+
+        layout.addWidget(splitter)
+
+    def create_table(self, headers):
+        """创建只读表格"""
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        return table
+
+    def load_data(self, config_data):
+        """加载数据 (与配置无关, 只刷新记录)"""
+        _ = config_data
+        self.refresh()
+
+    def showEvent(self, event):
+        """显示时刷新"""
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        """刷新汇总和最近记录"""
+        records = profiler.snapshot()
+        self.count_label.setText(f"记录: {len(records)} / {profiler.capacity}")
+
+        summary = profiler.summary()
+        self.summary_table.setSortingEnabled(False)
+        self.summary_table.setRowCount(len(summary))
+        for row, (name, item) in enumerate(summary.items()):
+            count = item["count"]
+            total_ms = item["total_ns"] / 1e6
+            avg_blocks = item["alloc_blocks"] / count
+            self.summary_table.setItem(row, 0, QTableWidgetItem(name))
+            self.summary_table.setItem(row, 1, NumericItem(count, str(count)))
+            self.summary_table.setItem(row, 2, NumericItem(total_ms, f"{total_ms:.2f}"))
+            self.summary_table.setItem(row, 3, NumericItem(total_ms / count, f"{total_ms / count:.2f}"))
+            self.summary_table.setItem(row, 4, NumericItem(item["max_ns"], f"{item['max_ns'] / 1e6:.2f}"))
+            self.summary_table.setItem(row, 5, NumericItem(item["last_ns"], f"{item['last_ns'] / 1e6:.2f}"))
+            self.summary_table.setItem(row, 6, NumericItem(avg_blocks, f"{avg_blocks:+.0f}"))
+        self.summary_table.setSortingEnabled(True)
+
+        recent = records[-RECENT_LIMIT:][::-1]
+        origin = records[0].start_ns if records else 0
+        self.recent_table.setRowCount(len(recent))
+        for row, record in enumerate(recent):
+            start_ms = (record.start_ns - origin) / 1e6
+            self.recent_table.setItem(row, 0, NumericItem(start_ms, f"{start_ms:.1f}"))
+            self.recent_table.setItem(row, 1, QTableWidgetItem(record.name))
+            self.recent_table.setItem(row, 2, NumericItem(record.duration_ns, f"{record.duration_ns / 1e6:.2f}"))
+            self.recent_table.setItem(row, 3, NumericItem(record.alloc_blocks, f"{record.alloc_blocks:+d}"))
+            self.recent_table.setItem(row, 4, QTableWidgetItem(record.thread_name))
+
+    def set_enabled(self, enabled):
+        """启用/停用记录"""
+        profiler.enabled = enabled
+
+    def clear_records(self):
+        """清空记录"""
+        profiler.clear()
+        self.refresh()
+
+    def export_trace(self):
+        """导出 Chrome Trace JSON"""
+        default_name = f"claude-config-trace-{time.strftime('%Y%m%d_%H%M%S')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出 Chrome Trace", default_name, "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            profiler.export_chrome_trace(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导出失败:\n{str(e)}")
+            return
+        self.parent_window.statusBar().showMessage(
+            f"已导出 {len(profiler.records)} 条记录: {file_path} (可在 chrome://tracing 或 ui.perfetto.dev 中打开)"
+        )
@@ -2,19 +2,34 @@
 项目列表标签页
 """
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QTableView,
     QPushButton, QMessageBox, QHeaderView, QAbstractItemView,
-    QSplitter, QLabel, QFileDialog
+    QSplitter, QLabel, QFileDialog, QLineEdit
 )
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
+
+from ...core import config_ops, timed
+from ...core.path_health import PathHealthChecker, STATUS_LABELS, STATUS_OK, repo_path_pairs
+from ..models.repo_paths_model import RepoPathsModel
+from ..models.search_filter_proxy_model import SearchFilterProxyModel
+from ..workers.path_health_worker import PathHealthThread
 
 
 class ProjectsTab(QWidget):
     """项目列表标签页"""
 
+    CONFIG_KEYS = ("githubRepoPaths",)
+
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
+        self.health_checker = PathHealthChecker()
+        self.health_thread = None
+        # 检查线程运行期间请求的检查: 部分 (仓库名称, 路径) 列表或全部路径
+        self.health_pending = None
+        self.health_pending_all = False
+        self.health_cache_loaded = False
         self.init_ui()
 
     def init_ui(self):
@@ -38,20 +53,46 @@ class ProjectsTab(QWidget):
         delete_repo_btn = QPushButton("删除仓库")
         add_repo_btn.clicked.connect(self.add_repo)
         delete_repo_btn.clicked.connect(self.delete_repo)
+        check_paths_btn = QPushButton("检查路径")
+        check_paths_btn.setToolTip("检查所有本地路径是否存在、是否为对应仓库的 git 检出")
+        check_paths_btn.clicked.connect(self.check_all_paths)
         repo_btn_layout.addWidget(add_repo_btn)
         repo_btn_layout.addWidget(delete_repo_btn)
+        discover_btn = QPushButton("发现仓库...")
+        discover_btn.setToolTip("在选定的目录下查找尚未配置的 git 检出")
+        discover_btn.clicked.connect(self.discover_repos)
+        repo_btn_layout.addWidget(check_paths_btn)
+        repo_btn_layout.addWidget(discover_btn)
         repo_btn_layout.addStretch()
         left_layout.addLayout(repo_btn_layout)
 
-        self.repo_table = QTableWidget()
-        self.repo_table.setColumnCount(2)
-        self.repo_table.setHorizontalHeaderLabels(["仓库", "路径数量"])
+        # 搜索框
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("搜索仓库名称或本地路径...")
+        self.filter_edit.setClearButtonEnabled(True)
+        left_layout.addWidget(self.filter_edit)
+
+        self.repo_model = RepoPathsModel(self)
+        self.repo_proxy_model = SearchFilterProxyModel(self)
+        self.repo_proxy_model.setSourceModel(self.repo_model)
+        self.filter_edit.textChanged.connect(self.repo_proxy_model.set_filter_text)
+
+        self.repo_table = QTableView()
+        self.repo_table.setModel(self.repo_proxy_model)
         self.repo_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.repo_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.repo_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.repo_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.repo_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.repo_table.itemSelectionChanged.connect(self.on_repo_selected)
+        self.repo_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.repo_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.repo_table.selectionModel().selectionChanged.connect(self.on_repo_selected)
         left_layout.addWidget(self.repo_table)
 
+        self.health_label = QLabel()
+        self.health_label.setStyleSheet("color: #666; font-size: 11px;")
+        left_layout.addWidget(self.health_label)
+
         splitter.addWidget(left_widget)
 
         # 右侧: 路径详情
@@ -73,39 +114,58 @@ class ProjectsTab(QWidget):
         right_layout.addWidget(right_label)
 
         self.path_table = QTableWidget()
-        self.path_table.setColumnCount(1)
-        self.path_table.setHorizontalHeaderLabels(["路径"])
-        self.path_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.path_table.setColumnCount(2)
+        self.path_table.setHorizontalHeaderLabels(["路径", "状态"])
+        self.path_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.path_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.path_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.path_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         right_layout.addWidget(self.path_table)
 
         splitter.addWidget(right_widget)
 
         layout.addWidget(splitter)
 
+    @timed()
     def load_data(self, config_data):
         """加载数据"""
-        github_repos = config_data.get("githubRepoPaths", {})
-
-        self.repo_table.setRowCount(0)
-        for repo_name, paths in github_repos.items():
-            row = self.repo_table.rowCount()
-            self.repo_table.insertRow(row)
-
-            self.repo_table.setItem(row, 0, QTableWidgetItem(repo_name))
-            self.repo_table.setItem(row, 1, QTableWidgetItem(str(len(paths))))
+        self.repo_model.set_repos(config_data.get("githubRepoPaths", {}))
 
         # 清空路径表
         self.path_table.setRowCount(0)
+        self.check_all_paths()
+
+    def selected_repo(self):
+        """当前选中的仓库名称"""
+        rows = self.repo_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.repo_model.repo_name(self.repo_proxy_model.mapToSource(rows[0]).row())
+
+    @timed()
+    def apply_change(self, config_data, path):
+        """只更新受影响的仓库行"""
+        github_repos = config_data.get("githubRepoPaths", {})
+        if len(path) < 2 or github_repos is not self.repo_model.repos:
+            self.load_data(config_data)
+            return
+
+        repo_name = path[1]
+        was_selected = self.selected_repo() == repo_name
+        self.repo_model.update_repo(repo_name)
+        self.check_paths(repo_path_pairs({repo_name: github_repos.get(repo_name, [])}))
+        if was_selected:
+            if repo_name in github_repos:
+                self.on_repo_selected()
+            else:
+                self.path_table.setRowCount(0)
 
     def on_repo_selected(self):
         """仓库选择改变事件"""
-        selected_items = self.repo_table.selectedItems()
-        if not selected_items:
+        repo_name = self.selected_repo()
+        if repo_name is None:
             return
 
-        row = selected_items[0].row()
-        repo_name = self.repo_table.item(row, 0).text()
-
         config_data = self.parent_window.get_config_data()
         github_repos = config_data.get("githubRepoPaths", {})
         paths = github_repos.get(repo_name, [])
@@ -115,6 +175,86 @@ class ProjectsTab(QWidget):
             path_row = self.path_table.rowCount()
             self.path_table.insertRow(path_row)
             self.path_table.setItem(path_row, 0, QTableWidgetItem(path))
+            self.path_table.setItem(path_row, 1, self.make_status_item(repo_name, path))
+
+    def make_status_item(self, repo_name, path):
+        """路径状态单元格"""
+        status = self.repo_model.path_status(repo_name, path)
+        item = QTableWidgetItem(STATUS_LABELS.get(status, "检查中..."))
+        if status is not None and status != STATUS_OK:
+            item.setForeground(QColor("#d73a49"))
+        return item
+
+    def check_all_paths(self):
+        """在后台检查所有仓库的本地路径"""
+        self.check_paths(None)
+
+    def check_paths(self, repo_paths):
+        """在后台检查 [(仓库名称, 路径)], None 表示全部路径"""
+        if self.health_thread is not None:
+            # 正在检查时合并到下一次检查中
+            if repo_paths is None or self.health_pending_all:
+                self.health_pending_all = True
+                self.health_pending = None
+            else:
+                self.health_pending = (self.health_pending or []) + list(repo_paths)
+            return
+
+        prune = repo_paths is None
+        if prune:
+            config_data = self.parent_window.get_config_data()
+            repo_paths = repo_path_pairs(config_data.get("githubRepoPaths", {}))
+        if not repo_paths:
+            return
+
+        self.health_label.setText(f"正在检查 {len(repo_paths)} 个路径...")
+        self.health_thread = PathHealthThread(
+            self.health_checker, self.parent_window.config_path, repo_paths,
+            load_disk_cache=not self.health_cache_loaded, prune=prune, parent=self
+        )
+        self.health_cache_loaded = True
+        self.health_thread.checked.connect(self.on_paths_checked)
+        self.health_thread.completed.connect(self.on_check_completed)
+        self.health_thread.failed.connect(self.health_label.setText)
+        self.health_thread.finished.connect(self.on_check_finished)
+        self.health_thread.start()
+
+    def on_check_finished(self):
+        """检查线程结束"""
+        self.health_thread.deleteLater()
+        self.health_thread = None
+        if self.health_pending_all:
+            self.health_pending_all = False
+            self.check_all_paths()
+        elif self.health_pending:
+            pending, self.health_pending = self.health_pending, None
+            self.check_paths(pending)
+
+    @timed()
+    def on_paths_checked(self, results):
+        """显示一批检查结果"""
+        self.repo_model.set_path_health(results)
+        repo_name = self.selected_repo()
+        if repo_name is None:
+            return
+        for result in results:
+            if result.repo != repo_name:
+                continue
+            for row in range(self.path_table.rowCount()):
+                if self.path_table.item(row, 0).text() == result.path:
+                    self.path_table.setItem(row, 1, self.make_status_item(repo_name, result.path))
+
+    def on_check_completed(self, count, elapsed):
+        """检查完成, 显示有问题的路径数"""
+        config_data = self.parent_window.get_config_data()
+        pairs = repo_path_pairs(config_data.get("githubRepoPaths", {}))
+        problems = sum(
+            1 for repo, path in pairs
+            if self.repo_model.path_status(repo, path) not in (None, STATUS_OK)
+        )
+        self.health_label.setText(
+            f"已检查 {count} 个路径, {problems} 个有问题, 耗时 {elapsed * 1000:.0f} ms"
+        )
 
     def add_repo(self):
         """添加仓库"""
@@ -124,28 +264,29 @@ class ProjectsTab(QWidget):
             repo_name = dialog.get_repo_name()
 
             config_data = self.parent_window.get_config_data()
-            if "githubRepoPaths" not in config_data:
-                config_data["githubRepoPaths"] = {}
-
-            config_data["githubRepoPaths"][repo_name] = []
+            changed = config_ops.add_repo(config_data, repo_name)
+            if changed is None:
+                QMessageBox.warning(self, "警告", f"仓库 '{repo_name}' 已存在")
+                return
 
             self.parent_window.set_config_data(config_data)
             self.parent_window.save_config_to_file()
-            self.load_data(config_data)
-            self.parent_window.raw_config_tab.load_data(config_data)
+            self.parent_window.notify_changed(*changed)
 
             QMessageBox.information(self, "成功", f"仓库 '{repo_name}' 已添加!")
 
+    def discover_repos(self):
+        """扫描目录, 批量添加发现的仓库路径"""
+        from ..dialogs.repo_discovery_dialog import RepoDiscoveryDialog
+        RepoDiscoveryDialog(self.parent_window).exec()
+
     def delete_repo(self):
         """删除仓库"""
-        selected_items = self.repo_table.selectedItems()
-        if not selected_items:
+        repo_name = self.selected_repo()
+        if repo_name is None:
             QMessageBox.warning(self, "警告", "请先选择一个仓库")
             return
 
-        row = selected_items[0].row()
-        repo_name = self.repo_table.item(row, 0).text()
-
         reply = QMessageBox.question(
             self, "确认删除",
             f"确定要删除仓库 '{repo_name}' 吗?\n这将删除该仓库的所有路径配置。",
@@ -154,42 +295,31 @@ class ProjectsTab(QWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             config_data = self.parent_window.get_config_data()
-            github_repos = config_data.get("githubRepoPaths", {})
-            if repo_name in github_repos:
-                del github_repos[repo_name]
-
+            changed = config_ops.remove_repo(config_data, repo_name)
+            if changed:
                 self.parent_window.set_config_data(config_data)
                 self.parent_window.save_config_to_file()
-                self.load_data(config_data)
-                self.parent_window.raw_config_tab.load_data(config_data)
+                self.parent_window.notify_changed(*changed)
 
                 QMessageBox.information(self, "成功", f"仓库 '{repo_name}' 已删除!")
 
     def add_path(self):
         """添加路径"""
-        selected_items = self.repo_table.selectedItems()
-        if not selected_items:
+        repo_name = self.selected_repo()
+        if repo_name is None:
             QMessageBox.warning(self, "警告", "请先选择一个仓库")
             return
 
-        row = selected_items[0].row()
-        repo_name = self.repo_table.item(row, 0).text()
-
         # 浏览文件夹
         folder_path = QFileDialog.getExistingDirectory(self, "选择项目文件夹")
         if folder_path:
             config_data = self.parent_window.get_config_data()
-            github_repos = config_data.get("githubRepoPaths", {})
-            if repo_name in github_repos:
-                paths = github_repos[repo_name]
-                if folder_path not in paths:
-                    paths.append(folder_path)
-
+            if repo_name in config_data.get("githubRepoPaths", {}):
+                changed = config_ops.add_repo_path(config_data, repo_name, folder_path)
+                if changed:
                     self.parent_window.set_config_data(config_data)
                     self.parent_window.save_config_to_file()
-                    self.load_data(config_data)
-                    self.on_repo_selected()
-                    self.parent_window.raw_config_tab.load_data(config_data)
+                    self.parent_window.notify_changed(*changed)
 
                     QMessageBox.information(self, "成功", f"路径已添加到 '{repo_name}'!")
                 else:
@@ -197,16 +327,13 @@ class ProjectsTab(QWidget):
 
     def remove_path(self):
         """删除路径"""
-        selected_repo_items = self.repo_table.selectedItems()
+        repo_name = self.selected_repo()
         selected_path_items = self.path_table.selectedItems()
 
-        if not selected_repo_items or not selected_path_items:
+        if repo_name is None or not selected_path_items:
             QMessageBox.warning(self, "警告", "请先选择仓库和路径")
             return
 
-        repo_row = selected_repo_items[0].row()
-        repo_name = self.repo_table.item(repo_row, 0).text()
-
         path_row = selected_path_items[0].row()
         path = self.path_table.item(path_row, 0).text()
 
@@ -218,16 +345,10 @@ class ProjectsTab(QWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             config_data = self.parent_window.get_config_data()
-            github_repos = config_data.get("githubRepoPaths", {})
-            if repo_name in github_repos:
-                paths = github_repos[repo_name]
-                if path in paths:
-                    paths.remove(path)
-
-                    self.parent_window.set_config_data(config_data)
-                    self.parent_window.save_config_to_file()
-                    self.load_data(config_data)
-                    self.on_repo_selected()
-                    self.parent_window.raw_config_tab.load_data(config_data)
+            changed = config_ops.remove_repo_path(config_data, repo_name, path)
+            if changed:
+                self.parent_window.set_config_data(config_data)
+                self.parent_window.save_config_to_file()
+                self.parent_window.notify_changed(*changed)
 
-                    QMessageBox.information(self, "成功", "路径已删除!")
+                QMessageBox.information(self, "成功", "路径已删除!")
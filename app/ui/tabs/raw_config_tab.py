@@ -3,20 +3,30 @@
 """
 import json
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit, QMessageBox,
+    QStackedWidget, QTreeView, QApplication, QMenu, QLabel
 )
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QTextCursor, QTextDocument
+from PySide6.QtCore import Qt, QRegularExpression
 
+from ...core import dumps_config, dumps_section, profiler, timed
+from ..models.json_tree_model import JsonTreeModel
 from ..widgets.json_highlighter import JsonHighlighter
 
 
 class RawConfigTab(QWidget):
-    """原始 JSON 配置标签页"""
+    """原始 JSON 配置标签页
+
+    默认以树形视图展示配置, 只有展开的子树才会创建节点;
+    文本编辑模式仅在切换过去时才序列化整个文档。
+    """
 
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
         self.highlighter = None
+        self.config_data = {}
+        self.text_stale = True
         self.init_ui()
 
     def init_ui(self):
@@ -26,50 +36,216 @@ class RawConfigTab(QWidget):
         # 按钮栏
         button_layout = QHBoxLayout()
         reload_btn = QPushButton("重新加载")
-        save_btn = QPushButton("保存配置")
-        format_btn = QPushButton("格式化JSON")
+        self.text_mode_btn = QPushButton("文本编辑模式")
+        self.text_mode_btn.setCheckable(True)
+        self.format_btn = QPushButton("格式化JSON")
+        self.save_btn = QPushButton("保存配置")
 
         reload_btn.clicked.connect(self.reload_config)
-        save_btn.clicked.connect(self.save_config)
-        format_btn.clicked.connect(self.format_json)
+        self.text_mode_btn.toggled.connect(self.set_text_mode)
+        self.format_btn.clicked.connect(self.format_json)
+        self.save_btn.clicked.connect(self.save_config)
 
         button_layout.addWidget(reload_btn)
-        button_layout.addWidget(format_btn)
-        button_layout.addWidget(save_btn)
+        button_layout.addWidget(self.text_mode_btn)
+        button_layout.addWidget(self.format_btn)
+        button_layout.addWidget(self.save_btn)
         button_layout.addStretch()
 
         layout.addLayout(button_layout)
 
+        # 文本中有未保存的编辑时, 配置的变化不直接替换文本, 而是提示用户
+        self.stale_notice = QWidget()
+        notice_layout = QHBoxLayout(self.stale_notice)
+        notice_layout.setContentsMargins(0, 0, 0, 0)
+        notice_label = QLabel("配置已在磁盘上或其他标签页中改变, 文本中有未保存的编辑。重新加载?")
+        notice_label.setStyleSheet("color: #d73a49;")
+        discard_btn = QPushButton("重新加载 (放弃编辑)")
+        discard_btn.clicked.connect(self.refresh_text)
+        keep_btn = QPushButton("保留编辑")
+        keep_btn.clicked.connect(self.stale_notice.hide)
+        notice_layout.addWidget(notice_label)
+        notice_layout.addStretch()
+        notice_layout.addWidget(discard_btn)
+        notice_layout.addWidget(keep_btn)
+        self.stale_notice.hide()
+        layout.addWidget(self.stale_notice)
+
+        self.view_stack = QStackedWidget()
+
+        # 树形视图
+        self.tree_model = JsonTreeModel(self)
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.tree_model)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setFont(QFont("Consolas", 10))
+        self.tree_view.header().resizeSection(0, 320)
+        self.tree_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tree_view.customContextMenuRequested.connect(self.show_tree_menu)
+        self.view_stack.addWidget(self.tree_view)
+
         # 文本编辑器
-        self.text_edit = QTextEdit()
+        self.text_edit = QPlainTextEdit()
         self.text_edit.setFont(QFont("Consolas", 10))
-        self.text_edit.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
 
         # 应用语法高亮
         self.highlighter = JsonHighlighter(self.text_edit.document())
 
-        layout.addWidget(self.text_edit)
+        self.view_stack.addWidget(self.text_edit)
+
+        layout.addWidget(self.view_stack)
+        self.update_buttons()
 
+    @timed()
     def load_data(self, config_data):
         """加载数据"""
-        json_str = json.dumps(config_data, indent=2, ensure_ascii=False)
-        self.text_edit.setPlainText(json_str)
+        self.config_data = config_data
+        self.tree_model.set_data(config_data)
+
+        if not self.is_text_mode():
+            self.text_stale = True
+        elif self.has_text_edits():
+            self.mark_text_stale()
+        else:
+            self.refresh_text()
+
+    @timed()
+    def apply_change(self, config_data, path):
+        """只更新被修改的部分"""
+        self.config_data = config_data
+        self.tree_model.update_path(path)
+
+        if not self.is_text_mode():
+            self.text_stale = True
+        elif self.has_text_edits():
+            self.mark_text_stale()
+        elif not self.replace_text_section(path[0]):
+            self.refresh_text()
+
+    def has_text_edits(self):
+        """文本编辑器中是否有未保存的编辑"""
+        return self.text_edit.document().isModified()
+
+    def mark_text_stale(self):
+        """文本已过期, 但有未保存的编辑: 保留文本并提示重新加载"""
+        self.text_stale = True
+        self.stale_notice.show()
+
+    def replace_text_section(self, key):
+        """只替换文本中一个顶层键对应的行, 找不到时返回 False"""
+        if key not in self.config_data:
+            return False
+
+        document = self.text_edit.document()
+        prefix = "  " + json.dumps(key, ensure_ascii=False) + ":"
+        pattern = QRegularExpression("^" + QRegularExpression.escape(prefix))
+        found = document.find(pattern, 0, QTextDocument.FindFlag.FindCaseSensitively)
+        if found.isNull():
+            return False
+
+        # 该键的内容一直延续到下一个顶层键或文档末尾的 "}"
+        first = found.block()
+        last = first
+        block = first.next()
+        while block.isValid():
+            text = block.text()
+            if text.startswith('  "') or text.startswith('}'):
+                break
+            last = block
+            block = block.next()
+
+        new_text = prefix + " " + dumps_section(self.config_data[key])
+        if last.text().endswith(","):
+            new_text += ","
+
+        cursor = QTextCursor(first)
+        cursor.setPosition(last.position() + last.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+        cursor.beginEditBlock()
+        cursor.insertText(new_text)
+        cursor.endEditBlock()
+        # 同步配置的变化不算用户的编辑
+        self.text_edit.document().setModified(False)
+        return True
+
+    def is_text_mode(self):
+        """是否处于文本编辑模式"""
+        return self.text_mode_btn.isChecked()
+
+    def set_text_mode(self, enabled):
+        """切换树形视图/文本编辑模式"""
+        if enabled:
+            if self.text_stale and self.has_text_edits():
+                self.mark_text_stale()
+            elif self.text_stale:
+                self.refresh_text()
+            self.view_stack.setCurrentWidget(self.text_edit)
+        else:
+            self.view_stack.setCurrentWidget(self.tree_view)
+            self.stale_notice.hide()
+        self.update_buttons()
+
+    def update_buttons(self):
+        """格式化和保存只在文本模式下可用"""
+        text_mode = self.is_text_mode()
+        self.format_btn.setEnabled(text_mode)
+        self.save_btn.setEnabled(text_mode)
+
+    @timed()
+    def refresh_text(self):
+        """序列化整个文档到文本编辑器"""
+        # 尚未解析的子树直接使用原始文本
+        json_str = dumps_config(self.config_data)
+        # setPlainText 会同步高亮整个文档
+        with profiler.span("JsonHighlighter.highlight", "highlight") as args:
+            self.text_edit.setPlainText(json_str)
+            args["blocks"] = self.text_edit.document().blockCount()
+        self.text_stale = False
+        self.stale_notice.hide()
+
+    def show_tree_menu(self, pos):
+        """树形视图右键菜单"""
+        index = self.tree_view.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        copy_action = menu.addAction("复制 JSON")
+        if menu.exec(self.tree_view.viewport().mapToGlobal(pos)) == copy_action:
+            QApplication.clipboard().setText(self.tree_model.subtree_json(index))
+            self.parent_window.statusBar().showMessage("已复制到剪贴板")
 
     def reload_config(self):
-        """重新加载配置"""
+        """重新加载配置 (文本中有未保存的编辑时先确认)"""
+        if self.is_text_mode() and self.has_text_edits():
+            reply = QMessageBox.question(
+                self, "确认重新加载", "文本中有未保存的编辑, 重新加载会放弃这些编辑。确定吗?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            self.text_edit.document().setModified(False)
         self.parent_window.load_config()
 
     def save_config(self):
         """保存配置"""
+        if self.text_stale:
+            reply = QMessageBox.question(
+                self, "确认保存", "编辑期间配置已在磁盘上或其他标签页中改变, 保存文本会覆盖这些修改。确定吗?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
         try:
             json_text = self.text_edit.toPlainText()
             config_data = json.loads(json_text)
+            # 编辑已写入配置, 随后的刷新会重新生成文本
+            self.text_edit.document().setModified(False)
 
             self.parent_window.set_config_data(config_data)
             self.parent_window.save_config_to_file()
 
             # 刷新所有视图
-            self.parent_window.refresh_all_views()
+            self.parent_window.notify_changed()
 
             QMessageBox.information(self, "成功", "配置已保存!")
             self.parent_window.statusBar().showMessage("配置已保存")
@@ -85,6 +261,8 @@ class RawConfigTab(QWidget):
             data = json.loads(json_text)
             formatted = json.dumps(data, indent=2, ensure_ascii=False)
             self.text_edit.setPlainText(formatted)
+            # 格式化也是尚未保存的编辑
+            self.text_edit.document().setModified(True)
             self.parent_window.statusBar().showMessage("JSON已格式化")
         except json.JSONDecodeError as e:
             QMessageBox.critical(self, "错误", f"JSON 格式错误:\n{str(e)}")
@@ -0,0 +1,122 @@
+"""
+配置大小分析标签页
+显示配置文件中每个键 (直到指定深度) 占用的字节数, 可按任一列排序
+"""
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox, QTreeView, QHeaderView
+)
+from PySide6.QtCore import Qt
+
+from ...core import file_fingerprint, timed
+from ...core.size_analyzer import DEFAULT_MAX_DEPTH
+from ..models.size_tree_model import SizeTreeModel
+from ..widgets.numeric_item import format_size
+from ..workers.size_analyzer_worker import SizeAnalysisThread
+
+
+class SizeAnalyzerTab(QWidget):
+    """配置大小分析标签页"""
+
+    # 分析的是磁盘上的文件, 不依赖内存中的配置键; 显示时按文件指纹判断是否需要重新分析
+    CONFIG_KEYS = ()
+
+    def __init__(self, parent_window):
+        super().__init__()
+        self.parent_window = parent_window
+        self.analysis_thread = None
+        self.analysis_pending = False
+        # 上次分析时文件的指纹和深度
+        self.analyzed_state = None
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化UI"""
+        layout = QVBoxLayout(self)
+
+        toolbar = QHBoxLayout()
+        refresh_btn = QPushButton("重新分析")
+        refresh_btn.clicked.connect(self.start_analysis)
+        self.depth_spin = QSpinBox()
+        self.depth_spin.setRange(1, 8)
+        self.depth_spin.setValue(DEFAULT_MAX_DEPTH)
+        self.depth_spin.setPrefix("深度: ")
+        self.depth_spin.valueChanged.connect(self.start_analysis)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666; font-size: 11px;")
+        toolbar.addWidget(refresh_btn)
+        toolbar.addWidget(self.depth_spin)
+        toolbar.addStretch()
+        toolbar.addWidget(self.status_label)
+        layout.addLayout(toolbar)
+
+        self.size_model = SizeTreeModel(self)
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.size_model)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setSortingEnabled(True)
+        self.tree_view.sortByColumn(1, Qt.SortOrder.DescendingOrder)
+        header = self.tree_view.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(SizeTreeModel.HEADERS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.tree_view)
+
+        tip = QLabel("大小包含键名、缩进和分隔符; 数组中的元素计入数组本身")
+        tip.setStyleSheet("color: #666; font-size: 10px;")
+        layout.addWidget(tip)
+
+    def load_data(self, config_data):
+        """加载数据 (分析磁盘上的配置文件)"""
+        _ = config_data
+        self.refresh_if_changed()
+
+    def showEvent(self, event):
+        """显示时, 文件在上次分析后被修改过则重新分析"""
+        super().showEvent(event)
+        self.refresh_if_changed()
+
+    def refresh_if_changed(self):
+        """文件或深度改变时重新分析"""
+        if self.analysis_thread is not None:
+            return
+        state = (file_fingerprint(self.parent_window.config_path), self.depth_spin.value())
+        if state != self.analyzed_state:
+            self.start_analysis()
+
+    def start_analysis(self):
+        """在后台分析配置文件"""
+        if self.analysis_thread is not None:
+            self.analysis_pending = True
+            return
+
+        self.analysis_pending = False
+        self.status_label.setText("正在分析...")
+        self.analysis_thread = SizeAnalysisThread(
+            self.parent_window.config_path, self.depth_spin.value(), parent=self
+        )
+        self.analysis_thread.analyzed.connect(self.on_analyzed)
+        self.analysis_thread.failed.connect(self.status_label.setText)
+        self.analysis_thread.finished.connect(self.on_analysis_finished)
+        self.analysis_thread.start()
+
+    def on_analysis_finished(self):
+        """分析线程结束"""
+        self.analysis_thread.deleteLater()
+        self.analysis_thread = None
+        if self.analysis_pending:
+            self.start_analysis()
+
+    @timed()
+    def on_analyzed(self, root, fingerprint, elapsed):
+        """显示分析结果"""
+        self.analyzed_state = (fingerprint, self.analysis_thread.max_depth)
+        self.size_model.set_root(root)
+        header = self.tree_view.header()
+        self.size_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        if root.children:
+            self.tree_view.expand(self.size_model.index(0, 0))
+        self.status_label.setText(
+            f"{self.parent_window.config_path} 共 {format_size(root.size)}, "
+            f"{len(root.children)} 个顶层键, 分析耗时 {elapsed * 1000:.0f} ms"
+        )
@@ -1,8 +1,6 @@
 """
 用户信息标签页
 """
-import json
-import shutil
 from pathlib import Path
 from datetime import datetime
 
@@ -12,10 +10,15 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from ...core import backup_config, timed
+from ...core.backup_store import BACKUP_RESET
+
 
 class UserInfoTab(QWidget):
     """用户信息标签页"""
 
+    CONFIG_KEYS = ("userID", "firstStartTime")
+
     def __init__(self, parent_window):
         super().__init__()
         self.parent_window = parent_window
@@ -60,14 +63,31 @@ class UserInfoTab(QWidget):
         btn_layout.addWidget(reset_btn)
         backup_layout.addLayout(btn_layout)
 
+        compact_btn = QPushButton("压缩配置...")
+        restore_btn = QPushButton("恢复归档的项目...")
+        history_btn = QPushButton("备份历史...")
+        diff_btn = QPushButton("比较配置...")
+        compact_btn.clicked.connect(self.compact_config)
+        restore_btn.clicked.connect(self.restore_archived)
+        history_btn.clicked.connect(self.show_backup_history)
+        diff_btn.clicked.connect(self.compare_configs)
+
+        compact_layout = QHBoxLayout()
+        compact_layout.addWidget(compact_btn)
+        compact_layout.addWidget(restore_btn)
+        compact_layout.addWidget(history_btn)
+        compact_layout.addWidget(diff_btn)
+        backup_layout.addLayout(compact_layout)
+
         # 备份信息
-        backup_info = QLabel("提示: 保存配置时会自动创建 .bak 备份文件")
+        backup_info = QLabel("提示: 每次保存前会自动备份, 内容相同的部分只保存一份")
         backup_info.setStyleSheet("color: #666; font-size: 10px;")
         backup_layout.addWidget(backup_info)
 
         layout.addWidget(backup_group)
         layout.addStretch()
 
+    @timed()
     def load_data(self, config_data):
         """加载数据"""
         user_id = config_data.get("userID", "未知")
@@ -97,60 +117,41 @@ class UserInfoTab(QWidget):
             self.usage_time_label.setText("未知")
 
     def export_config(self):
-        """导出配置"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "导出配置",
-            str(Path.home() / "claude_config_backup.json"),
-            "JSON 文件 (*.json);;所有文件 (*.*)"
-        )
-
-        if file_path:
-            try:
-                config_data = self.parent_window.get_config_data()
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(config_data, f, indent=2, ensure_ascii=False)
-                QMessageBox.information(self, "成功", f"配置已导出到:\n{file_path}")
-                self.parent_window.statusBar().showMessage(f"配置已导出: {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "错误", f"导出失败:\n{str(e)}")
+        """按部分导出配置"""
+        from ..dialogs.section_transfer_dialog import SectionExportDialog
+        SectionExportDialog(self.parent_window).exec()
 
     def import_config(self):
-        """导入配置"""
+        """选择文件后按部分导入, 或预览后覆盖整个配置"""
         file_path, _ = QFileDialog.getOpenFileName(
             self, "导入配置",
             str(Path.home()),
-            "JSON 文件 (*.json);;所有文件 (*.*)"
+            "JSON 文件 (*.json *.json.gz);;所有文件 (*.*)"
         )
 
         if file_path:
-            reply = QMessageBox.question(
-                self, "确认导入",
-                "导入配置将覆盖当前配置,确定要继续吗?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-
-            if reply == QMessageBox.StandardButton.Yes:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        imported_data = json.load(f)
-
-                    # 备份当前配置
-                    config_path = self.parent_window.config_path
-                    if config_path.exists():
-                        backup_path = config_path.with_suffix('.json.bak')
-                        shutil.copy2(config_path, backup_path)
-
-                    # 更新配置
-                    self.parent_window.set_config_data(imported_data)
-                    self.parent_window.save_config_to_file()
-
-                    # 刷新所有视图
-                    self.parent_window.refresh_all_views()
-
-                    QMessageBox.information(self, "成功", "配置已导入!")
-                    self.parent_window.statusBar().showMessage(f"配置已导入: {file_path}")
-                except Exception as e:
-                    QMessageBox.critical(self, "错误", f"导入失败:\n{str(e)}")
+            from ..dialogs.section_transfer_dialog import SectionImportDialog
+            SectionImportDialog(self.parent_window, Path(file_path)).exec()
+
+    def compact_config(self):
+        """清理不再需要的项目以减小配置文件"""
+        from ..dialogs.compaction_dialog import CompactionDialog
+        CompactionDialog(self.parent_window).exec()
+
+    def restore_archived(self):
+        """从归档恢复项目"""
+        from ..dialogs.compaction_dialog import ArchiveRestoreDialog
+        ArchiveRestoreDialog(self.parent_window).exec()
+
+    def show_backup_history(self):
+        """查看和恢复备份"""
+        from ..dialogs.backup_dialog import BackupHistoryDialog
+        BackupHistoryDialog(self.parent_window).exec()
+
+    def compare_configs(self):
+        """比较当前配置、备份和其他文件"""
+        from ..dialogs.config_diff_dialog import ConfigDiffDialog
+        ConfigDiffDialog(self.parent_window).exec()
 
     def reset_config(self):
         """重置配置"""
@@ -163,10 +164,7 @@ class UserInfoTab(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 # 创建备份
-                config_path = self.parent_window.config_path
-                if config_path.exists():
-                    backup_path = config_path.with_suffix(f'.json.bak.{datetime.now().strftime("%Y%m%d_%H%M%S")}')
-                    shutil.copy2(config_path, backup_path)
+                backup_config(self.parent_window.config_path, BACKUP_RESET)
 
                 # 重置为最小配置
                 default_config = {
@@ -178,7 +176,7 @@ class UserInfoTab(QWidget):
 
                 self.parent_window.set_config_data(default_config)
                 self.parent_window.save_config_to_file()
-                self.parent_window.refresh_all_views()
+                self.parent_window.notify_changed()
 
                 QMessageBox.information(self, "成功", "配置已重置为默认值!")
             except Exception as e:
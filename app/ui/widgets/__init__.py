@@ -2,5 +2,8 @@
 UI 组件
 """
 from .json_highlighter import JsonHighlighter
+from .mcp_inventory_view import McpInventoryView
+from .numeric_item import NumericItem, format_size
+from .section_tree import SectionTree
 
-__all__ = ['JsonHighlighter']
+__all__ = ['JsonHighlighter', 'McpInventoryView', 'NumericItem', 'SectionTree', 'format_size']
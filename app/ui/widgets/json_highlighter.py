@@ -1,11 +1,39 @@
 """
 JSON 语法高亮器
 为 JSON 编辑器提供语法高亮功能
+
+每行只做一次词法扫描, 行尾的词法状态通过 setCurrentBlockState 传递给下一行,
+因此跨行的字符串也能正确高亮; 编辑某一行时, 只要行尾状态不变,
+QSyntaxHighlighter 就不会重新高亮后面的行。
 """
 import re
 from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
 
 
+# 行尾词法状态
+STATE_NORMAL = 0
+STATE_AFTER_COLON = 1        # 上一个记号是冒号, 接下来是值
+STATE_IN_STRING = 2          # 位于未闭合的字符串中 (键或数组元素)
+STATE_IN_VALUE_STRING = 3    # 位于未闭合的字符串值中
+STATE_ESCAPED = 4            # 与字符串状态组合: 行尾是未完成的转义符
+
+# 所有记号的单一正则, 每行只扫描一次
+TOKEN_RE = re.compile(r'''
+    (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<open_string>"(?:[^"\\]|\\.)*(?P<escape>\\)?$)
+  | (?P<literal>\b(?:true|false|null)\b)
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<colon>:)
+  | (?P<punct>[{}\[\],])
+''', re.VERBOSE)
+
+# 续行字符串的剩余部分
+STRING_TAIL_RE = re.compile(r'(?:[^"\\]|\\.)*(")?')
+
+# 字符串之后紧跟冒号即为键名
+KEY_SUFFIX_RE = re.compile(r'\s*:')
+
+
 class JsonHighlighter(QSyntaxHighlighter):
     """JSON 语法高亮器"""
 
@@ -38,31 +66,70 @@ class JsonHighlighter(QSyntaxHighlighter):
 
     def highlightBlock(self, text):
         """高亮文本块"""
-        # 先高亮关键字和特殊值
-        for match in re.finditer(r'\b(true|false|null)\b', text):
-            self.setFormat(match.start(), match.end() - match.start(), self.literal_format)
-
-        # 高亮键名 (带冒号的字符串)
-        for match in re.finditer(r'"[^"]+"\s*:', text):
-            self.setFormat(match.start(), match.end() - match.start(), self.key_format)
-
-        # 高亮字符串值 (冒号后的字符串)
-        for match in re.finditer(r':\s*"[^"]*"', text):
-            self.setFormat(match.start(), match.end() - match.start(), self.string_format)
-
-        # 高亮数字
-        for match in re.finditer(r':\s*-?\d+\.?\d*([eE][+-]?\d+)?', text):
-            self.setFormat(match.start(), match.end() - match.start(), self.number_format)
-
-        # 高亮剩余的普通字符串(没有冒号的)
-        # 这里需要更精细的处理,避免重复高亮
-        for match in re.finditer(r'"[^"]*"', text):
-            # 检查是否已经被高亮
-            already_highlighted = False
-            for i in range(match.start(), min(match.end(), len(text))):
-                if self.format(i) != QTextCharFormat():
-                    already_highlighted = True
-                    break
-
-            if not already_highlighted:
-                self.setFormat(match.start(), match.end() - match.start(), self.string_general_format)
+        state = self.previousBlockState()
+        if state < 0:
+            state = STATE_NORMAL
+
+        pos = 0
+        if state & ~STATE_ESCAPED in (STATE_IN_STRING, STATE_IN_VALUE_STRING):
+            pos, state = self._continue_string(text, state)
+            if pos is None:
+                return
+
+        after_colon = state == STATE_AFTER_COLON
+        for match in TOKEN_RE.finditer(text, pos):
+            kind = match.lastgroup
+            start = match.start()
+            length = match.end() - start
+
+            if kind == 'string':
+                if after_colon:
+                    fmt = self.string_format
+                elif KEY_SUFFIX_RE.match(text, match.end()):
+                    fmt = self.key_format
+                else:
+                    fmt = self.string_general_format
+                self.setFormat(start, length, fmt)
+            elif kind == 'open_string':
+                fmt = self.string_format if after_colon else self.string_general_format
+                self.setFormat(start, length, fmt)
+                state = STATE_IN_VALUE_STRING if after_colon else STATE_IN_STRING
+                if match.group('escape'):
+                    state |= STATE_ESCAPED
+                self.setCurrentBlockState(state)
+                return
+            elif kind == 'literal':
+                self.setFormat(start, length, self.literal_format)
+            elif kind == 'number':
+                self.setFormat(start, length, self.number_format)
+
+            after_colon = kind == 'colon'
+
+        # 冒号之后的值可能在下一行
+        self.setCurrentBlockState(STATE_AFTER_COLON if after_colon else STATE_NORMAL)
+
+    def _continue_string(self, text, state):
+        """处理上一行延续下来的字符串, 返回 (扫描起点, 状态)"""
+        start = 1 if state & STATE_ESCAPED else 0
+        in_value = state & ~STATE_ESCAPED == STATE_IN_VALUE_STRING
+        match = STRING_TAIL_RE.match(text, min(start, len(text)))
+
+        if match.group(1) is None:
+            # 整行仍在字符串内
+            fmt = self.string_format if in_value else self.string_general_format
+            self.setFormat(0, len(text), fmt)
+            new_state = STATE_IN_VALUE_STRING if in_value else STATE_IN_STRING
+            if match.end() < len(text):
+                new_state |= STATE_ESCAPED
+            self.setCurrentBlockState(new_state)
+            return None, new_state
+
+        end = match.end()
+        if in_value:
+            fmt = self.string_format
+        elif KEY_SUFFIX_RE.match(text, end):
+            fmt = self.key_format
+        else:
+            fmt = self.string_general_format
+        self.setFormat(0, end, fmt)
+        return end, STATE_NORMAL
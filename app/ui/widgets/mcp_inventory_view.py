@@ -0,0 +1,74 @@
+"""
+MCP 服务器清单视图
+显示服务器的工具和资源列表 (McpInventory)
+"""
+from datetime import datetime
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QHeaderView
+
+
+class McpInventoryView(QWidget):
+    """MCP 服务器清单视图"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.info_label = QLabel()
+        self.info_label.setStyleSheet("color: #666; font-size: 11px;")
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["名称", "说明"])
+        self.tree.setUniformRowHeights(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.tree)
+
+    def set_message(self, text):
+        """清空列表并显示提示"""
+        self.tree.clear()
+        self.info_label.setText(text)
+
+    def set_inventory(self, inventory):
+        """显示清单"""
+        self.tree.clear()
+        if inventory.skipped:
+            self.info_label.setText(f"未获取工具列表: {inventory.error}")
+            return
+        if inventory.error:
+            self.info_label.setText(f"获取失败: {inventory.error}")
+            return
+
+        info = inventory.server_info
+        server = f"{info.get('name', '')} {info.get('version', '')}".strip()
+        fetched_at = datetime.fromtimestamp(inventory.fetched_at).strftime("%Y-%m-%d %H:%M")
+        source = "缓存" if inventory.cached else "刚刚获取"
+        self.info_label.setText(f"{server or '未知服务器'} · 获取于 {fetched_at} ({source})")
+
+        tools = QTreeWidgetItem(self.tree, [f"工具 ({len(inventory.tools)})"])
+        for tool in inventory.tools:
+            properties = (tool.get("inputSchema") or {}).get("properties") or {}
+            item = self.make_item(tools, str(tool.get("name", "")), tool.get("description"))
+            if isinstance(properties, dict) and properties:
+                item.setToolTip(0, "参数: " + ", ".join(str(name) for name in properties))
+
+        resources = QTreeWidgetItem(self.tree, [f"资源 ({len(inventory.resources)})"])
+        for resource in inventory.resources:
+            item = self.make_item(
+                resources, str(resource.get("name") or resource.get("uri", "")), resource.get("description")
+            )
+            item.setToolTip(0, str(resource.get("uri", "")))
+
+        tools.setExpanded(True)
+        resources.setExpanded(len(inventory.resources) <= 50)
+
+    @staticmethod
+    def make_item(parent, name, description):
+        """列表项: 说明只显示第一行, 完整内容在提示中"""
+        description = str(description or "")
+        item = QTreeWidgetItem(parent, [name, description.strip().split("\n", 1)[0]])
+        item.setToolTip(1, description)
+        return item
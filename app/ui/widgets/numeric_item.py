@@ -0,0 +1,29 @@
+"""
+数值显示
+按数值排序的表格项和字节数格式化
+"""
+from PySide6.QtWidgets import QTableWidgetItem
+from PySide6.QtCore import Qt
+
+
+class NumericItem(QTableWidgetItem):
+    """按数值排序的表格项"""
+
+    def __init__(self, value, text):
+        super().__init__(text)
+        self.value = value
+        self.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+    def __lt__(self, other):
+        if isinstance(other, NumericItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+def format_size(size):
+    """格式化字节数"""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / 1024 / 1024:.1f} MB"
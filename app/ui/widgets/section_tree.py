@@ -0,0 +1,72 @@
+"""
+配置部分选择树
+勾选顶层键或其中的成员, 用于按部分导出和导入
+"""
+from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem, QHeaderView
+from PySide6.QtCore import Qt
+
+from .numeric_item import format_size
+
+
+class SectionTree(QTreeWidget):
+    """配置部分选择树"""
+
+    # 成员超过该数量的键不列出成员, 只能整体选择
+    MAX_MEMBER_ITEMS = 5000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setColumnCount(3)
+        self.setHeaderLabels(["部分", "大小", "状态"])
+        self.setUniformRowHeights(True)
+        self.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.header().setStretchLastSection(False)
+
+    def set_sections(self, sections, checked=(), status=None):
+        """显示 SectionInfo 列表
+
+        checked 为默认整体勾选的键; status(键, 成员) 返回状态列的文本, 成员为 None 时表示整个键。
+        """
+        self.clear()
+        checked = set(checked)
+        for section in sections:
+            item = QTreeWidgetItem(self, [section.key, format_size(section.size)])
+            item.setData(0, Qt.ItemDataRole.UserRole, section.key)
+            item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            if status is not None:
+                item.setText(2, status(section.key, None) or "")
+
+            members = section.members or []
+            if len(members) > self.MAX_MEMBER_ITEMS:
+                item.setText(0, f"{section.key} ({len(members)} 项)")
+                item.setToolTip(0, "成员过多, 只能整体选择")
+            elif members:
+                item.setText(0, f"{section.key} ({len(members)} 项)")
+                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsAutoTristate)
+                for member in members:
+                    child = QTreeWidgetItem(item, [member])
+                    child.setData(0, Qt.ItemDataRole.UserRole, member)
+                    child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                    child.setCheckState(0, Qt.CheckState.Unchecked)
+                    if status is not None:
+                        child.setText(2, status(section.key, member) or "")
+            # 有子项时设置父项的状态会同步到所有子项
+            item.setCheckState(0, Qt.CheckState.Checked if section.key in checked else Qt.CheckState.Unchecked)
+
+    def selection(self):
+        """勾选的部分 {键: None (整个键) 或成员列表}"""
+        selection = {}
+        for row in range(self.topLevelItemCount()):
+            item = self.topLevelItem(row)
+            key = item.data(0, Qt.ItemDataRole.UserRole)
+            state = item.checkState(0)
+            if state == Qt.CheckState.Checked:
+                selection[key] = None
+            elif state == Qt.CheckState.PartiallyChecked:
+                selection[key] = [
+                    item.child(index).data(0, Qt.ItemDataRole.UserRole)
+                    for index in range(item.childCount())
+                    if item.child(index).checkState(0) == Qt.CheckState.Checked
+                ]
+        return selection
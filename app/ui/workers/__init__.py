@@ -0,0 +1,21 @@
+"""
+后台工作线程
+"""
+from .compaction_worker import CompactionScanThread
+from .config_diff_worker import ConfigDiffThread
+from .config_loader import ConfigLoadThread, ConfigReloadThread
+from .config_saver import ConfigSaveThread
+from .config_watcher import ConfigWatcher
+from .mcp_inventory_worker import McpInventoryThread
+from .mcp_probe_worker import McpProbeThread
+from .path_health_worker import PathHealthThread
+from .project_stats_worker import ProjectStatsThread
+from .repo_discovery_worker import RepoDiscoveryThread
+from .section_transfer_worker import SectionExportThread, SectionScanThread
+from .size_analyzer_worker import SizeAnalysisThread
+
+__all__ = [
+    'CompactionScanThread', 'ConfigDiffThread', 'ConfigLoadThread', 'ConfigReloadThread', 'ConfigSaveThread',
+    'ConfigWatcher', 'McpInventoryThread', 'McpProbeThread', 'PathHealthThread', 'ProjectStatsThread',
+    'RepoDiscoveryThread', 'SectionExportThread', 'SectionScanThread', 'SizeAnalysisThread',
+]
@@ -0,0 +1,32 @@
+"""
+配置压缩扫描线程
+检查每个项目的目录和会话记录 (需要访问文件系统), 在后台列出可清理的项目
+"""
+from PySide6.QtCore import QThread, Signal
+
+from ...core import plan_compaction
+
+
+class CompactionScanThread(QThread):
+    """配置压缩扫描线程"""
+
+    # 清理候选列表 (CompactionCandidate)
+    scanned = Signal(object)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, projects, idle_days, prune_missing, parent=None):
+        super().__init__(parent)
+        # 已解析的 projects 在 GUI 线程中做浅拷贝, LazySection 不可变可直接使用
+        self.projects = dict(projects) if isinstance(projects, dict) else projects
+        self.idle_days = idle_days
+        self.prune_missing = prune_missing
+
+    def run(self):
+        """线程入口"""
+        try:
+            candidates = plan_compaction(self.projects, self.idle_days, self.prune_missing)
+        except Exception as e:
+            self.failed.emit(f"扫描失败: {str(e)}")
+            return
+        self.scanned.emit(candidates)
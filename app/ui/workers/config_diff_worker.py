@@ -0,0 +1,40 @@
+"""
+配置比较线程
+在后台读取两份配置 (当前配置、备份或文件) 并做结构化比较
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core import JsonDiff
+from ...core.json_diff import DiffCancelled
+
+
+class ConfigDiffThread(QThread):
+    """配置比较线程"""
+
+    # DiffEntry 列表, 按字节跳过的相同成员数, 耗时 (秒)
+    completed = Signal(object, int, float)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, load_old, load_new, parent=None):
+        super().__init__(parent)
+        # 返回原始字节的函数, 在本线程中调用
+        self.load_old = load_old
+        self.load_new = load_new
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        try:
+            old_raw = self.load_old()
+            new_raw = self.load_new()
+            diff = JsonDiff(cancelled=self.isInterruptionRequested)
+            entries = diff.compare_raw(old_raw, new_raw)
+        except DiffCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(f"比较失败: {str(e)}")
+            return
+        self.completed.emit(entries, diff.skipped, time.perf_counter() - start)
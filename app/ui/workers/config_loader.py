@@ -0,0 +1,137 @@
+"""
+配置文件加载线程
+在后台读取并解析配置文件, 通过信号把结果交回 GUI 线程
+"""
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core import content_hash, diff_config, file_fingerprint, parse_config, store_cache, timed
+
+
+# 每次读取的字节数, 两次读取之间检查是否被取消
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class ConfigLoadCancelled(Exception):
+    """加载被用户取消"""
+
+
+class ConfigLoadThread(QThread):
+    """配置文件加载线程"""
+
+    # 读取进度 (0-100)
+    progress = Signal(int)
+    # 解析完成的配置字典
+    loaded = Signal(object)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, config_path, parent=None):
+        super().__init__(parent)
+        self.config_path = config_path
+        # 读取时文件的指纹与原始内容 (写入缓存后释放)
+        self.fingerprint = None
+        self.raw = None
+        # 内容哈希与此相同时跳过解析, read_config 返回 None
+        self.expected_hash = None
+
+    def run(self):
+        """线程入口"""
+        try:
+            data = self.read_config()
+        except ConfigLoadCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        if not self.isInterruptionRequested():
+            self.loaded.emit(data)
+            self.update_cache(data)
+
+    @timed()
+    def read_config(self):
+        """读取并解析配置文件"""
+        raw = self.read_raw()
+        if raw is None:
+            self.progress.emit(100)
+            return {}
+
+        if self.expected_hash is not None and content_hash(raw) == self.expected_hash:
+            # 内容与缓存相同, 无需解析
+            self.progress.emit(100)
+            return None
+
+        # projects 等大的子树只记录原始字节, 用到时再解析
+        data = parse_config(raw)
+        self.raw = raw
+        self.progress.emit(100)
+        return data
+
+    def update_cache(self, data):
+        """把新解析的配置写入缓存 (在结果发出之后, 不增加加载延迟)"""
+        raw, self.raw = self.raw, None
+        if data and raw is not None:
+            store_cache(self.config_path, data, self.fingerprint, content_hash(raw))
+
+    def read_raw(self):
+        """分块读取配置文件, 文件不存在时返回 None"""
+        if not self.config_path.exists():
+            return None
+
+        self.fingerprint = file_fingerprint(self.config_path)
+        total = self.config_path.stat().st_size
+        chunks = []
+        read = 0
+        with open(self.config_path, 'rb') as f:
+            while True:
+                if self.isInterruptionRequested():
+                    raise ConfigLoadCancelled()
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                read += len(chunk)
+                if total:
+                    # 读取占前一半进度, 解析占后一半
+                    self.progress.emit(min(50, read * 50 // total))
+
+        raw = b"".join(chunks)
+        if self.isInterruptionRequested():
+            raise ConfigLoadCancelled()
+        return raw
+
+
+class ConfigReloadThread(ConfigLoadThread):
+    """重新读取被外部修改的配置文件, 并与内存中的配置做比较
+
+    expected_hash 为内存中配置 (例如启动时显示的缓存) 对应的内容哈希, 相同时不再解析。
+    """
+
+    # 新配置与变化的路径列表
+    diffed = Signal(object, object)
+
+    def __init__(self, config_path, current_data, expected_hash=None, parent=None):
+        super().__init__(config_path, parent)
+        # 顶层浅拷贝, GUI 线程替换顶层键不会影响比较
+        self.current_data = dict(current_data)
+        self.expected_hash = expected_hash
+
+    def run(self):
+        """线程入口"""
+        try:
+            data = self.read_config()
+            if data is None:
+                data, changes = self.current_data, []
+            else:
+                changes = diff_config(self.current_data, data)
+        except ConfigLoadCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        if not self.isInterruptionRequested():
+            self.diffed.emit(data, changes)
+            if changes:
+                self.update_cache(data)
@@ -0,0 +1,52 @@
+"""
+配置文件保存线程
+在后台序列化配置, 写入临时文件后原子替换, 中途崩溃不会截断原文件
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core import SaveConflict, save_config, timed
+
+
+class ConfigSaveThread(QThread):
+    """配置文件保存线程"""
+
+    # 保存耗时 (秒), 写入后文件的指纹
+    saved = Signal(float, object)
+    # 错误信息
+    failed = Signal(str)
+    # 序列化时配置被 GUI 线程修改, 需要重新保存
+    conflicted = Signal()
+    # 合并了外部修改: 合并后的配置与相对本地快照变化的路径列表
+    merged = Signal(object, object)
+
+    def __init__(self, config_path, snapshot, local_paths=None, base_fingerprint=None,
+                 backup=False, parent=None):
+        super().__init__(parent)
+        self.config_path = config_path
+        self.snapshot = snapshot
+        # 自合并基准以来本地修改过的路径
+        self.local_paths = set(local_paths or ())
+        # 合并基准 (上次读取/写入) 时文件的指纹
+        self.base_fingerprint = base_fingerprint
+        self.backup = backup
+
+    @timed()
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        try:
+            data, changes, fingerprint = save_config(
+                self.config_path, self.snapshot, self.local_paths, self.base_fingerprint, self.backup
+            )
+        except SaveConflict:
+            self.conflicted.emit()
+            return
+        except Exception as e:
+            self.failed.emit(f"保存到文件失败: {str(e)}")
+            return
+
+        if changes:
+            self.merged.emit(data, changes)
+        self.saved.emit(time.perf_counter() - start, fingerprint)
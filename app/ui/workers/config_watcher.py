@@ -0,0 +1,60 @@
+"""
+配置文件监视器
+CLI 会频繁重写配置文件, 这里在文件变化 (防抖) 后发出信号
+"""
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from ...core import file_fingerprint
+
+
+# 文件变化后等待多久再处理 (毫秒), CLI 一次写入可能触发多个事件
+WATCH_DEBOUNCE_MS = 300
+
+
+class ConfigWatcher(QObject):
+    """配置文件监视器"""
+
+    # 文件内容已被外部修改
+    file_changed = Signal()
+
+    def __init__(self, config_path, parent=None):
+        super().__init__(parent)
+        self.config_path = config_path
+        # 最近一次由本程序读取或写入时的文件指纹
+        self.known_fingerprint = None
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.check_file)
+
+        # 原子替换会使文件监视失效, 因此同时监视所在目录
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_path_changed)
+        self.watcher.directoryChanged.connect(self.on_path_changed)
+        self.watcher.addPath(str(config_path.parent))
+        self.watch_file()
+
+    def watch_file(self):
+        """(重新) 监视配置文件本身"""
+        path = str(self.config_path)
+        if self.config_path.exists() and path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+    def remember(self, fingerprint):
+        """记录本程序读取/写入后的文件指纹, 这些变化不会触发信号"""
+        self.known_fingerprint = fingerprint
+
+    def on_path_changed(self, path):
+        """文件或目录变化"""
+        _ = path
+        self.debounce_timer.start()
+
+    def check_file(self):
+        """防抖结束, 指纹与已知的不同时发出信号"""
+        self.watch_file()
+        fingerprint = file_fingerprint(self.config_path)
+        if fingerprint is None or fingerprint == self.known_fingerprint:
+            return
+        self.known_fingerprint = fingerprint
+        self.file_changed.emit()
@@ -0,0 +1,45 @@
+"""
+MCP 服务器清单线程
+在后台获取服务器的工具和资源列表: 有效期内的取自缓存, 其余并发启动服务器获取
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+
+class McpInventoryThread(QThread):
+    """MCP 服务器清单线程"""
+
+    # 单个服务器的清单 (McpInventory)
+    fetched = Signal(object)
+    # 服务器数, 启动的进程数, 耗时 (秒)
+    completed = Signal(int, int, float)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, cache, config_path, servers, force=False, load_disk_cache=False, parent=None):
+        super().__init__(parent)
+        # 缓存只在本线程运行期间被修改, 同一时间最多一个清单线程
+        self.cache = cache
+        self.config_path = config_path
+        # {名称: 配置} 的快照, 在 GUI 线程中复制
+        self.servers = servers
+        self.force = force
+        self.load_disk_cache = load_disk_cache
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        if self.load_disk_cache:
+            self.cache.load(self.config_path)
+        try:
+            results, spawned = self.cache.refresh(
+                self.servers, force=self.force, on_result=self.fetched.emit, cancelled=self.isInterruptionRequested
+            )
+        except Exception as e:
+            self.failed.emit(f"获取清单失败: {str(e)}")
+            return
+        self.completed.emit(len(results), spawned, time.perf_counter() - start)
+        if spawned:
+            self.cache.prune()
+            self.cache.store(self.config_path)
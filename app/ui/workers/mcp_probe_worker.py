@@ -0,0 +1,38 @@
+"""
+MCP 服务器检测线程
+在后台的 asyncio 事件循环中并发启动服务器并完成握手, 每完成一个交回一个结果
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core.mcp_probe import probe_servers
+
+
+class McpProbeThread(QThread):
+    """MCP 服务器检测线程"""
+
+    # 单个服务器的检测结果 (ProbeResult)
+    probed = Signal(object)
+    # 检测的服务器数, 总耗时 (秒)
+    completed = Signal(int, float)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, servers, timeout, parent=None):
+        super().__init__(parent)
+        # {名称: 配置} 的快照, 在 GUI 线程中复制
+        self.servers = servers
+        self.timeout = timeout
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        try:
+            results = probe_servers(
+                self.servers, self.timeout, on_result=self.probed.emit, cancelled=self.isInterruptionRequested
+            )
+        except Exception as e:
+            self.failed.emit(f"检测失败: {str(e)}")
+            return
+        self.completed.emit(len(results), time.perf_counter() - start)
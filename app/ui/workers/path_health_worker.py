@@ -0,0 +1,61 @@
+"""
+仓库路径检查线程
+在后台并发检查 githubRepoPaths 中的本地路径, 分批交回结果, 慢速挂载的目录不会阻塞界面
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+
+class PathHealthThread(QThread):
+    """仓库路径检查线程"""
+
+    # 一批检查结果 (PathHealth 列表)
+    checked = Signal(object)
+    # 检查的路径数, 耗时 (秒)
+    completed = Signal(int, float)
+    # 错误信息
+    failed = Signal(str)
+
+    # 两批结果之间的最短间隔 (秒)
+    BATCH_INTERVAL = 0.1
+
+    def __init__(self, checker, config_path, repo_paths, load_disk_cache=False, prune=False, parent=None):
+        super().__init__(parent)
+        # 检查器的缓存只在本线程运行期间被修改, 同一时间最多一个检查线程
+        self.checker = checker
+        self.config_path = config_path
+        # (仓库名称, 路径) 列表在 GUI 线程中生成
+        self.repo_paths = repo_paths
+        self.load_disk_cache = load_disk_cache
+        self.prune = prune
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        if self.load_disk_cache:
+            self.checker.load(self.config_path)
+
+        batch = []
+        count = 0
+        last_emit = start
+        try:
+            for result in self.checker.check(self.repo_paths, cancelled=self.isInterruptionRequested,
+                                             prune=self.prune):
+                batch.append(result)
+                count += 1
+                now = time.perf_counter()
+                if now - last_emit >= self.BATCH_INTERVAL:
+                    self.checked.emit(batch)
+                    batch = []
+                    last_emit = now
+        except Exception as e:
+            self.failed.emit(f"检查失败: {str(e)}")
+            return
+
+        if batch:
+            self.checked.emit(batch)
+        if self.isInterruptionRequested():
+            return
+        self.completed.emit(count, time.perf_counter() - start)
+        self.checker.store(self.config_path)
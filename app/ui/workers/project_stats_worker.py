@@ -0,0 +1,48 @@
+"""
+项目用量统计线程
+在后台更新按项目缓存的统计并汇总, 只重新计算内容变化的项目
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+
+class ProjectStatsThread(QThread):
+    """项目用量统计线程"""
+
+    # 汇总结果, 重新计算的项目数, 耗时 (秒)
+    computed = Signal(object, int, float)
+    # 错误信息
+    failed = Signal(str)
+    # 统计时 projects 被 GUI 线程修改, 需要重新统计
+    conflicted = Signal()
+
+    def __init__(self, cache, config_path, projects, load_disk_cache=False, parent=None):
+        super().__init__(parent)
+        # 缓存只在本线程运行期间被修改, 同一时间最多一个统计线程
+        self.cache = cache
+        self.config_path = config_path
+        # 已解析的 projects 在 GUI 线程中做浅拷贝, LazySection 不可变可直接使用
+        self.projects = dict(projects) if isinstance(projects, dict) else projects
+        self.load_disk_cache = load_disk_cache
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        try:
+            if self.load_disk_cache:
+                self.cache.load(self.config_path)
+            previous_count = len(self.cache.entries)
+            recomputed = self.cache.update(self.projects)
+            summary = self.cache.summarize()
+        except RuntimeError:
+            # dictionary changed size during iteration
+            self.conflicted.emit()
+            return
+        except Exception as e:
+            self.failed.emit(f"统计失败: {str(e)}")
+            return
+
+        self.computed.emit(summary, recomputed, time.perf_counter() - start)
+        if recomputed or len(self.cache.entries) != previous_count:
+            self.cache.store(self.config_path)
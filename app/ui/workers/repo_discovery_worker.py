@@ -0,0 +1,52 @@
+"""
+仓库发现线程
+在后台并发扫描根目录下的 git 检出, 分批交回结果
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+
+class RepoDiscoveryThread(QThread):
+    """仓库发现线程"""
+
+    # 一批发现的仓库 (DiscoveredRepo 列表)
+    found = Signal(object)
+    # 扫描的目录数, 耗时 (秒)
+    completed = Signal(int, float)
+    # 错误信息
+    failed = Signal(str)
+
+    # 两批结果之间的最短间隔 (秒)
+    BATCH_INTERVAL = 0.1
+
+    def __init__(self, scanner, config_path, roots, max_depth, parent=None):
+        super().__init__(parent)
+        # 扫描器的缓存只在本线程运行期间被修改, 同一时间最多一个扫描线程
+        self.scanner = scanner
+        self.config_path = config_path
+        self.roots = roots
+        self.max_depth = max_depth
+
+    def run(self):
+        """线程入口"""
+        start = last_emit = time.perf_counter()
+        batch = []
+        try:
+            for repo in self.scanner.scan(self.roots, self.max_depth, cancelled=self.isInterruptionRequested):
+                batch.append(repo)
+                now = time.perf_counter()
+                if now - last_emit >= self.BATCH_INTERVAL:
+                    self.found.emit(batch)
+                    batch = []
+                    last_emit = now
+        except Exception as e:
+            self.failed.emit(f"扫描失败: {str(e)}")
+            return
+
+        if batch:
+            self.found.emit(batch)
+        if self.isInterruptionRequested():
+            return
+        self.completed.emit(self.scanner.scanned_count, time.perf_counter() - start)
+        self.scanner.store(self.config_path)
@@ -0,0 +1,59 @@
+"""
+按部分导出/导入线程
+导出时在后台边序列化边写入; 导入时在后台读取 (解压) 文件并列出其中的顶层键
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core import export_sections, list_sections, read_raw
+
+
+class SectionExportThread(QThread):
+    """按部分导出线程"""
+
+    # 写入的 (未压缩) 字节数, 耗时 (秒)
+    completed = Signal(int, float)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, data, path, selection, compress, parent=None):
+        super().__init__(parent)
+        # 顶层的浅拷贝, 在 GUI 线程中复制
+        self.data = data
+        self.path = path
+        self.selection = selection
+        self.compress = compress
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        try:
+            size = export_sections(self.data, self.path, self.selection, self.compress)
+        except Exception as e:
+            self.failed.emit(f"导出失败: {str(e)}")
+            return
+        self.completed.emit(size, time.perf_counter() - start)
+
+
+class SectionScanThread(QThread):
+    """读取导入文件的线程"""
+
+    # 文件的原始字节 (已解压), SectionInfo 列表
+    listed = Signal(object, object)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+    def run(self):
+        """线程入口"""
+        try:
+            raw = read_raw(self.path)
+            sections = list_sections(raw)
+        except Exception as e:
+            self.failed.emit(f"读取失败: {str(e)}")
+            return
+        self.listed.emit(raw, sections)
@@ -0,0 +1,34 @@
+"""
+配置大小分析线程
+在后台扫描配置文件, 得到每个键占用的字节数
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core import analyze_file, file_fingerprint
+
+
+class SizeAnalysisThread(QThread):
+    """配置大小分析线程"""
+
+    # 根节点 (SizeNode), 分析时文件的指纹, 耗时 (秒)
+    analyzed = Signal(object, object, float)
+    # 错误信息
+    failed = Signal(str)
+
+    def __init__(self, config_path, max_depth, parent=None):
+        super().__init__(parent)
+        self.config_path = config_path
+        self.max_depth = max_depth
+
+    def run(self):
+        """线程入口"""
+        start = time.perf_counter()
+        try:
+            fingerprint = file_fingerprint(self.config_path)
+            root = analyze_file(self.config_path, self.max_depth)
+        except Exception as e:
+            self.failed.emit(f"分析失败: {str(e)}")
+            return
+        self.analyzed.emit(root, fingerprint, time.perf_counter() - start)
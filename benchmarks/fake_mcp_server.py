@@ -0,0 +1,114 @@
+"""
+用于测试 MCP 检测的 stdio 服务器 (只依赖标准库)
+
+    python -m benchmarks.fake_mcp_server --startup-delay 2 --tools 50
+    python -m benchmarks.fake_mcp_server --exit-code 1      # 启动后立即失败
+    python -m benchmarks.fake_mcp_server --hang             # 不响应 initialize
+
+配置为 MCP 服务器时 command 为 python 解释器, args 为 ["-m", "benchmarks.fake_mcp_server", ...],
+需要在仓库根目录运行或把仓库加入 PYTHONPATH。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def make_tools(count):
+    """生成工具列表"""
+    return [
+        {
+            "name": f"tool_{i}",
+            "description": f"示例工具 {i}",
+            "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}}},
+        }
+        for i in range(count)
+    ]
+
+
+def make_resources(count):
+    """生成资源列表"""
+    return [
+        {"uri": f"file:///example/resource-{i}.txt", "name": f"resource-{i}", "mimeType": "text/plain"}
+        for i in range(count)
+    ]
+
+
+def paginate(items, params, page_size):
+    """按 cursor 分页, 返回 (本页, 下一页的 cursor)"""
+    start = int((params or {}).get("cursor") or 0)
+    if not page_size:
+        return items[start:], None
+    end = start + page_size
+    return items[start:end], str(end) if end < len(items) else None
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="测试用的 MCP stdio 服务器")
+    parser.add_argument("--name", default="fake-mcp-server", help="serverInfo 中的名称")
+    parser.add_argument("--startup-delay", type=float, default=0, help="开始读取请求前等待的秒数")
+    parser.add_argument("--init-delay", type=float, default=0, help="响应 initialize 前等待的秒数")
+    parser.add_argument("--exit-code", type=int, help="启动后以该退出码立即退出")
+    parser.add_argument("--hang", action="store_true", help="读取请求但从不响应")
+    parser.add_argument("--tools", type=int, default=3, help="工具数量")
+    parser.add_argument("--resources", type=int, default=2, help="资源数量")
+    parser.add_argument("--page-size", type=int, default=0, help="列表分页大小 (0 为不分页)")
+    parser.add_argument("--require-env", action="append", default=[], help="必须存在的环境变量")
+    args = parser.parse_args(argv)
+
+    if args.exit_code is not None:
+        print(f"{args.name}: 模拟启动失败", file=sys.stderr)
+        return args.exit_code
+    missing = [name for name in args.require_env if name not in os.environ]
+    if missing:
+        print(f"{args.name}: 缺少环境变量 {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    time.sleep(args.startup_delay)
+    # 真实服务器常把日志打印到 stdout, 客户端应忽略非 JSON 的行
+    print(f"{args.name} starting", flush=True)
+
+    tools = make_tools(args.tools)
+    resources = make_resources(args.resources)
+    for line in sys.stdin:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if "id" not in message or args.hang:
+            continue
+
+        method = message.get("method")
+        params = message.get("params")
+        if method == "initialize":
+            time.sleep(args.init_delay)
+            result = {
+                "protocolVersion": (params or {}).get("protocolVersion", "2024-11-05"),
+                "capabilities": {"tools": {}, "resources": {}},
+                "serverInfo": {"name": args.name, "version": "0.1.0"},
+            }
+        elif method == "tools/list":
+            page, cursor = paginate(tools, params, args.page_size)
+            result = {"tools": page}
+            if cursor:
+                result["nextCursor"] = cursor
+        elif method == "resources/list":
+            page, cursor = paginate(resources, params, args.page_size)
+            result = {"resources": page}
+            if cursor:
+                result["nextCursor"] = cursor
+        elif method == "ping":
+            result = {}
+        else:
+            response = {"jsonrpc": "2.0", "id": message["id"],
+                        "error": {"code": -32601, "message": f"Method not found: {method}"}}
+            print(json.dumps(response), flush=True)
+            continue
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
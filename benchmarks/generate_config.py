@@ -0,0 +1,138 @@
+"""
+生成用于基准测试的 ~/.claude.json
+
+    python -m benchmarks.generate_config -o /tmp/claude.json --preset large
+"""
+import argparse
+import json
+import random
+import uuid
+from pathlib import Path
+
+
+# 预设规模: 项目数, 每个项目的历史条数, MCP 服务器数, 功能开关数, 仓库数
+PRESETS = {
+    "small": dict(projects=100, history=20, servers=10, flags=100, repos=20),
+    "medium": dict(projects=2000, history=40, servers=50, flags=400, repos=100),
+    "large": dict(projects=5000, history=60, servers=200, flags=1000, repos=1000),
+}
+
+TOOLS = ["Bash", "Edit", "Read", "Write", "Glob", "Grep", "WebFetch", "mcp__github__create_issue"]
+
+PROMPTS = [
+    "修复登录页面在 Safari 上的布局问题",
+    "add retry with exponential backoff to the \"fetch_user\" client",
+    "为 parser 编写单元测试, 覆盖转义字符 \\n 和 \\t",
+    "refactor the build script:\n- drop python 3.8\n- pin ruff",
+    "解释一下 src/core/cache.rs 里的 LRU 实现",
+    "bump dependencies and run `npm audit fix`",
+]
+
+
+def make_project(rng, index, history):
+    """生成一个项目条目"""
+    entries = []
+    for _ in range(history):
+        entry = {"display": rng.choice(PROMPTS), "pastedContents": {}}
+        if rng.random() < 0.1:
+            entry["pastedContents"] = {"1": {"id": 1, "type": "text", "content": "Traceback ...\n" * rng.randint(1, 20)}}
+        entries.append(entry)
+
+    return {
+        "allowedTools": rng.sample(TOOLS, rng.randint(0, 3)),
+        "history": entries,
+        "mcpContextUris": [],
+        "mcpServers": {},
+        "enabledMcpjsonServers": [],
+        "disabledMcpjsonServers": [],
+        "hasTrustDialogAccepted": rng.random() < 0.8,
+        "projectOnboardingSeenCount": rng.randint(0, 5),
+        "hasClaudeMdExternalIncludesApproved": False,
+        "hasClaudeMdExternalIncludesWarningShown": False,
+        "lastCost": round(rng.random() * 5, 6),
+        "lastAPIDuration": rng.randint(1000, 600000),
+        "lastDuration": rng.randint(1000, 4000000),
+        "lastLinesAdded": rng.randint(0, 2000),
+        "lastLinesRemoved": rng.randint(0, 1000),
+        "lastTotalInputTokens": rng.randint(0, 10 ** 6),
+        "lastTotalOutputTokens": rng.randint(0, 10 ** 5),
+        "lastTotalCacheCreationInputTokens": rng.randint(0, 10 ** 5),
+        "lastTotalCacheReadInputTokens": rng.randint(0, 10 ** 7),
+        "lastSessionId": str(uuid.UUID(int=rng.getrandbits(128))),
+        "exampleFiles": [f"src/module_{index}_{i}.py" for i in range(rng.randint(0, 5))],
+    }
+
+
+def make_server(rng, index):
+    """生成一个 MCP 服务器条目"""
+    server = {"command": "npx", "args": ["-y", f"@example/mcp-server-{index}"]}
+    if rng.random() < 0.5:
+        server["env"] = {"API_TOKEN": f"token-{index:06d}", "LOG_LEVEL": "info"}
+    return server
+
+
+def generate_config(projects=2000, history=40, servers=50, flags=400, repos=100, seed=0):
+    """生成配置字典"""
+    rng = random.Random(seed)
+    gates = flags // 4
+    return {
+        "numStartups": rng.randint(100, 5000),
+        "installMethod": "native",
+        "autoUpdates": True,
+        "userID": "%064x" % rng.getrandbits(256),
+        "firstStartTime": "2025-01-01T00:00:00.000Z",
+        "mcpServers": {f"server-{i}": make_server(rng, i) for i in range(servers)},
+        "projects": {
+            f"/home/dev/work/project-{i}": make_project(rng, i, history) for i in range(projects)
+        },
+        "githubRepoPaths": {
+            f"org-{i % 37}/repo-{i}": [f"/home/dev/work/repo-{i}"] + [f"/home/dev/wt/repo-{i}-{j}" for j in range(i % 3)]
+            for i in range(repos)
+        },
+        "cachedStatsigGates": {f"tengu_gate_{i}": rng.random() < 0.5 for i in range(gates)},
+        "cachedGrowthBookFeatures": {
+            f"feature_{i}": rng.choice([True, False, None, "N/A", {}, f"variant-{i % 4}"])
+            for i in range(flags - gates)
+        },
+    }
+
+
+def write_config(path, **sizes):
+    """生成配置并以 CLI 相同的格式 (缩进 2) 写入 path, 返回字节数"""
+    text = json.dumps(generate_config(**sizes), indent=2, ensure_ascii=False)
+    path.write_text(text, encoding='utf-8')
+    return len(text.encode('utf-8'))
+
+
+def add_size_arguments(parser):
+    """添加规模相关的命令行参数"""
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium", help="预设规模 (默认 medium)")
+    for name in ("projects", "history", "servers", "flags", "repos"):
+        parser.add_argument(f"--{name}", type=int, help=f"覆盖预设中的 {name}")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+
+
+def sizes_from_args(args):
+    """根据命令行参数得到规模"""
+    sizes = dict(PRESETS[args.preset])
+    for name in sizes:
+        value = getattr(args, name)
+        if value is not None:
+            sizes[name] = value
+    sizes["seed"] = args.seed
+    return sizes
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="生成用于基准测试的 Claude 配置文件")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="输出文件")
+    add_size_arguments(parser)
+    args = parser.parse_args(argv)
+
+    size = write_config(args.output, **sizes_from_args(args))
+    print(f"{args.output}: {size / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+在 Qt offscreen 平台上无界面地测量各阶段耗时, 输出 JSON 结果
+
+    python -m benchmarks.run_benchmarks --preset medium -o results.json
+    python -m benchmarks.run_benchmarks --baseline results.json   # 与基准比较, 变慢时退出码为 1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from .generate_config import add_size_arguments, sizes_from_args, write_config
+
+
+# 判定为性能回退的中位数增幅
+DEFAULT_TOLERANCE = 0.25
+
+# 等待后台线程的最长时间 (秒)
+WAIT_TIMEOUT = 300
+
+# MCP 检测阶段启动的测试服务器数
+PROBE_SERVERS = 8
+
+# 在文档中间编辑一行时允许重新高亮的最多行数 (行尾状态不变时不应向后传播);
+# 换行产生的新行没有记录的状态, QSyntaxHighlighter 总会再检查下一行
+EDIT_MAX_BLOCKS = {"JsonHighlighter.edit.keystroke": 1, "JsonHighlighter.edit.newline": 3}
+
+
+class BenchmarkRunner:
+    """基准测试运行器"""
+
+    def __init__(self, app, repeat):
+        self.app = app
+        self.repeat = repeat
+        self.results = {}
+        # 不满足的断言 (与耗时无关的回退)
+        self.failures = []
+
+    def wait_until(self, predicate):
+        """处理事件直到 predicate 为真"""
+        deadline = time.perf_counter() + WAIT_TIMEOUT
+        while not predicate():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("等待后台线程超时")
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def measure(self, name, func, setup=None, **extra):
+        """运行 func repeat 次并记录耗时 (毫秒)"""
+        runs = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            func()
+            runs.append((time.perf_counter() - start) * 1000)
+            self.app.processEvents()
+
+        result = {
+            "runs_ms": [round(run, 3) for run in runs],
+            "min_ms": round(min(runs), 3),
+            "median_ms": round(statistics.median(runs), 3),
+            "mean_ms": round(statistics.fmean(runs), 3),
+        }
+        result.update(extra)
+        self.results[name] = result
+        print(f"{name:40s} {result['median_ms']:10.1f} ms", file=sys.stderr)
+        return result
+
+    def record(self, name, runs, **extra):
+        """记录在别处测得的耗时 (毫秒)"""
+        result = {
+            "runs_ms": [round(run, 3) for run in runs],
+            "min_ms": round(min(runs), 3),
+            "median_ms": round(statistics.median(runs), 3),
+            "mean_ms": round(statistics.fmean(runs), 3),
+        }
+        result.update(extra)
+        self.results[name] = result
+        print(f"{name:40s} {result['median_ms']:10.1f} ms", file=sys.stderr)
+
+    def run(self, config_path):
+        """运行所有阶段"""
+        from PySide6.QtCore import QThread
+        from PySide6.QtGui import QTextCursor, QTextDocument
+        from PySide6.QtWidgets import QMessageBox, QPlainTextDocumentLayout
+
+        from app.core import (
+            BackupStore, ProjectStatsCache, analyze_file, content_hash, diff_raw, dumps_config, export_sections,
+            load_cache, read_config, read_raw, read_sections, store_cache
+        )
+        from app.core.mcp_probe import probe_servers
+        from app.ui.main_window import ClaudeConfigGUI
+        from app.ui.widgets.json_highlighter import JsonHighlighter
+
+        class CountingHighlighter(JsonHighlighter):
+            """记录 highlightBlock 的调用次数"""
+
+            blocks = 0
+
+            def highlightBlock(self, text):
+                self.blocks += 1
+                super().highlightBlock(text)
+
+        # 模态对话框会阻塞无界面运行
+        QMessageBox.information = staticmethod(lambda *args, **kwargs: None)
+        QMessageBox.critical = staticmethod(lambda *args, **kwargs: print(*args[1:3], file=sys.stderr))
+
+        result = self.measure("core.read_config", lambda: read_config(config_path))
+        tracemalloc.start()
+        data, fingerprint = read_config(config_path)
+        result["peak_alloc_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+
+        self.measure("core.analyze_file", lambda: analyze_file(config_path))
+
+        # 备份: 首次备份 (全部块压缩写入) / 只有末尾变化时的增量备份
+        backup_root = Path(tempfile.mkdtemp(prefix="backups-", dir=config_path.parent))
+        original = config_path.read_bytes()
+        cold_runs = []
+
+        def cold_backup():
+            store = BackupStore(backup_root / f"cold-{len(cold_runs)}")
+            cold_runs.append(store.snapshot(config_path))
+
+        self.measure("BackupStore.snapshot.cold", cold_backup)
+        store = BackupStore(backup_root / "incremental")
+        store.snapshot(config_path)
+
+        def touch_config():
+            # 切换末尾的换行, 只有最后一块变化
+            raw = config_path.read_bytes()
+            config_path.write_bytes(raw[:-1] if raw.endswith(b"\n") else raw + b"\n")
+
+        self.measure("BackupStore.snapshot.incremental", lambda: store.snapshot(config_path), setup=touch_config)
+        config_path.write_bytes(original)
+        del original
+
+        # 结构化比较: 每 100 个项目修改一个, 另加一个顶层键
+        old_raw = config_path.read_bytes()
+        changed = json.loads(old_raw)
+        for index, project in enumerate((changed.get("projects") or {}).values()):
+            if index % 100 == 0 and isinstance(project, dict):
+                project["benchmarkMarker"] = index
+        changed["benchmarkMarker"] = True
+        new_raw = dumps_config(changed).encode('utf-8')
+        del changed
+        self.measure(
+            "JsonDiff.compare_raw", lambda: diff_raw(old_raw, new_raw), changes=len(diff_raw(old_raw, new_raw))
+        )
+        del old_raw, new_raw
+
+        # 按部分导出/导入: 整个配置 gzip 导出 (未解析的部分直接写原始字节) / 只读取 mcpServers
+        export_path = config_path.parent / "export.json.gz"
+        export_data, _ = read_config(config_path)
+        result = self.measure("export_sections.gzip", lambda: export_sections(export_data, export_path))
+        result["compressed_bytes"] = export_path.stat().st_size
+        export_raw = read_raw(export_path)
+        self.measure("read_sections", lambda: read_sections(export_raw, {"mcpServers": None}))
+        export_path.unlink()
+        del export_data, export_raw
+
+        # MCP 检测: 并发启动测试服务器并完成握手 (主要是解释器的启动时间)
+        repo_root = str(Path(__file__).resolve().parent.parent)
+        stand_in = {"command": sys.executable, "args": ["-m", "benchmarks.fake_mcp_server"],
+                    "env": {"PYTHONPATH": repo_root}}
+        servers = {f"server-{i}": stand_in for i in range(PROBE_SERVERS)}
+        self.measure("core.probe_servers", lambda: probe_servers(servers), servers=PROBE_SERVERS)
+
+        raw = config_path.read_bytes()
+        store_cache(config_path, data, fingerprint, content_hash(raw))
+        self.measure("core.load_cache", lambda: load_cache(config_path))
+        del data, raw
+
+        # 启动: 有缓存时先显示缓存 (校验在后台进行)
+        start = time.perf_counter()
+        window = ClaudeConfigGUI()
+        self.wait_until(lambda: window.load_thread is None)
+        self.record("startup", [(time.perf_counter() - start) * 1000])
+        self.wait_until(lambda: window.reload_thread is None)
+
+        def load_config():
+            window.load_config()
+            self.wait_until(lambda: window.load_thread is None)
+
+        def wait_idle():
+            # 上一次加载在交回结果后还会在后台写入缓存
+            self.wait_until(lambda: not any(worker.isRunning() for worker in window.findChildren(QThread)))
+
+        self.measure("ClaudeConfigGUI.load_config", load_config, setup=wait_idle)
+        config_data = window.config_data
+
+        raw_tab = window.ensure_view("raw_config_tab")
+        self.measure("RawConfigTab.load_data", lambda: raw_tab.load_data(config_data))
+
+        def leave_text_mode():
+            raw_tab.text_mode_btn.setChecked(False)
+            raw_tab.load_data(config_data)
+
+        self.measure(
+            "RawConfigTab.text_mode", lambda: raw_tab.text_mode_btn.setChecked(True), setup=leave_text_mode
+        )
+        raw_tab.text_mode_btn.setChecked(False)
+
+        text = dumps_config(config_data)
+        document = QTextDocument()
+        # 与编辑器一样使用纯文本布局 (没有布局的文档在编辑时不发出 contentsChange, 不会触发高亮)
+        document.setDocumentLayout(QPlainTextDocumentLayout(document))
+        document.setPlainText(text)
+        highlighter = CountingHighlighter()
+        highlighter.setDocument(document)
+        self.app.processEvents()
+        blocks = document.blockCount()
+        result = self.measure("JsonHighlighter.highlightBlock", highlighter.rehighlight, blocks=blocks)
+        result["per_block_us"] = round(result["median_ms"] * 1000 / blocks, 3)
+
+        # 逐键编辑: 在文档中间的字符串里输入一个字符 / 换行, 测量触发的重新高亮及其行数
+        block = document.findBlockByNumber(blocks // 2)
+        while block.isValid() and '"' not in block.text():
+            block = block.next()
+        position = block.position() + block.text().index('"') + 1
+        for name, inserted in (("JsonHighlighter.edit.keystroke", "x"), ("JsonHighlighter.edit.newline", "\n")):
+            counts = []
+
+            def undo_edit(inserted=inserted):
+                if counts:
+                    cursor = QTextCursor(document)
+                    cursor.setPosition(position)
+                    cursor.setPosition(position + len(inserted), QTextCursor.MoveMode.KeepAnchor)
+                    cursor.removeSelectedText()
+                highlighter.blocks = 0
+
+            def edit(inserted=inserted):
+                cursor = QTextCursor(document)
+                cursor.setPosition(position)
+                cursor.insertText(inserted)
+                counts.append(highlighter.blocks)
+
+            result = self.measure(name, edit, setup=undo_edit)
+            undo_edit()
+            result["max_blocks"] = max(counts)
+            if max(counts) > EDIT_MAX_BLOCKS[name]:
+                self.failures.append(
+                    f"{name}: 重新高亮了 {max(counts)} 行 (最多 {EDIT_MAX_BLOCKS[name]} 行), 编辑向后传播"
+                )
+
+        for name, label in (
+            ("mcp_servers_tab", "MCPServersTab.load_data"),
+            ("projects_tab", "ProjectsTab.load_data"),
+            ("experimental_features_tab", "ExperimentalFeaturesTab.load_data"),
+        ):
+            tab = window.ensure_view(name)
+            self.measure(label, lambda tab=tab: tab.load_data(config_data))
+
+        # 用量统计: 首次统计所有项目, 以及按签名只重新计算变化的项目 (此处没有变化)
+        projects = config_data.get("projects", {})
+        self.measure("ProjectStatsCache.update.cold", lambda: ProjectStatsCache().update(projects))
+        stats_cache = ProjectStatsCache()
+        stats_cache.update(projects)
+
+        def forget_section():
+            # 跳过整段比较, 测量逐个项目比较签名的开销
+            stats_cache.section_raw = None
+
+        self.measure("ProjectStatsCache.update.warm", lambda: stats_cache.update(projects), setup=forget_section)
+        self.measure("ProjectStatsCache.summarize", stats_cache.summarize)
+
+        # 保存: 从请求保存到写入完成 (不含防抖等待), 以及后台线程中的写入耗时
+        write_times = []
+
+        def save_config():
+            window.save_config_to_file()
+            window.save_timer.stop()
+            window.start_save()
+            window.save_thread.saved.connect(lambda elapsed, fingerprint: write_times.append(elapsed * 1000))
+            self.wait_until(lambda: window.save_thread is None)
+
+        self.measure("save_config_to_file", save_config, debounce_ms_excluded=window.save_timer.interval())
+        self.record("ConfigSaveThread.write", write_times)
+
+        window.close()
+
+
+def compare(results, baseline, tolerance):
+    """与基准结果比较, 返回变慢的阶段列表"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old or not old.get("median_ms"):
+            continue
+        ratio = result["median_ms"] / old["median_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append((name, old["median_ms"], result["median_ms"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="Claude 配置管理器性能基准测试")
+    add_size_arguments(parser)
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="每个阶段的重复次数 (默认 5)")
+    parser.add_argument("-o", "--output", type=Path, help="结果 JSON 文件 (默认输出到标准输出)")
+    parser.add_argument("--baseline", type=Path, help="与之前的结果 JSON 比较")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help=f"中位数增幅超过该比例视为回退 (默认 {DEFAULT_TOLERANCE})"
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import __version__ as pyside_version
+    from PySide6.QtWidgets import QApplication
+
+    sizes = sizes_from_args(args)
+    with tempfile.TemporaryDirectory(prefix="claude-config-bench-") as home:
+        # 主窗口读取 ~/.claude.json, 因此把 HOME 指向临时目录
+        os.environ["HOME"] = os.environ["USERPROFILE"] = home
+        os.environ["XDG_CACHE_HOME"] = str(Path(home) / ".cache")
+        config_path = Path(home) / ".claude.json"
+        config_bytes = write_config(config_path, **sizes)
+
+        app = QApplication.instance() or QApplication([])
+        runner = BenchmarkRunner(app, args.repeat)
+        runner.run(config_path)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pyside6": pyside_version,
+        "platform": platform.platform(),
+        "qpa_platform": os.environ["QT_QPA_PLATFORM"],
+        "config": dict(sizes, bytes=config_bytes),
+        "repeat": args.repeat,
+        "results": runner.results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n", encoding='utf-8')
+    else:
+        print(text)
+
+    for failure in runner.failures:
+        print(f"失败: {failure}", file=sys.stderr)
+    if runner.failures:
+        return 1
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare(runner.results, baseline.get("results", {}), args.tolerance)
+        for name, old, new, ratio in regressions:
+            print(f"回退: {name}: {old:.1f} ms -> {new:.1f} ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+回归测试 (python -m unittest 或 python -m pytest)
+"""
@@ -0,0 +1,40 @@
+"""
+项目归档的回归测试: 写入归档失败时配置保持不变
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.core import ProjectArchive, archive_projects
+
+
+class ArchiveProjectsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = {"projects": {"/a": {"x": 1}, "/b": {"x": 2}}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_moves_projects_to_archive(self):
+        archive = ProjectArchive(Path(self.tmp.name) / "archive.zip")
+        changes, removed = archive_projects(self.data, ["/a", "/missing"], archive, {"/a": "missing"})
+
+        self.assertEqual(changes, [("projects", "/a")])
+        self.assertEqual(list(removed), ["/a"])
+        self.assertEqual(list(self.data["projects"]), ["/b"])
+        self.assertEqual([(item.path, item.reason) for item in archive.entries()], [("/a", "missing")])
+
+    def test_failed_archive_keeps_projects(self):
+        blocker = Path(self.tmp.name) / "blocker"
+        blocker.write_text("", encoding='utf-8')
+        archive = ProjectArchive(blocker / "archive.zip")
+
+        with self.assertRaises(OSError):
+            archive_projects(self.data, ["/a"], archive)
+        self.assertEqual(self.data, {"projects": {"/a": {"x": 1}, "/b": {"x": 2}}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+保存与三方合并的回归测试
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from app.core import ConfigStore, SaveConflict, file_fingerprint, save_config
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+
+class ConfigStoreMergeTest(unittest.TestCase):
+    """命令行保存路径: 读取后被其他程序修改的文件"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / ".claude.json"
+        write_json(self.path, {"numStartups": 1, "theme": "dark"})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_concurrent_writers_keep_both_changes(self):
+        ours = ConfigStore(self.path)
+        ours.load()
+        theirs = ConfigStore(self.path)
+        theirs.load()
+
+        theirs.set("/numStartups", 2)
+        theirs.save(backup=False)
+        ours.set("/theme", "light")
+        ours.save(backup=False)
+
+        data = json.loads(self.path.read_text(encoding='utf-8'))
+        self.assertEqual(data, {"numStartups": 2, "theme": "light"})
+
+
+class MutatingConfig(dict):
+    """序列化时抛出 error 的配置"""
+
+    def __init__(self, error):
+        super().__init__(theme="dark")
+        self.error = error
+
+    def items(self):
+        raise self.error
+
+
+class SaveConflictTest(unittest.TestCase):
+    """只有序列化时配置被修改才报告为冲突"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / ".claude.json"
+        write_json(self.path, {"theme": "dark"})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_mutation_during_serialization_is_conflict(self):
+        data = MutatingConfig(RuntimeError("dictionary changed size during iteration"))
+        with self.assertRaises(SaveConflict):
+            save_config(self.path, data, set(), file_fingerprint(self.path), backup=False)
+
+    def test_other_runtime_error_is_not_conflict(self):
+        data = MutatingConfig(RuntimeError("unrelated"))
+        with self.assertRaises(RuntimeError) as caught:
+            save_config(self.path, data, set(), file_fingerprint(self.path), backup=False)
+        self.assertNotIsInstance(caught.exception, SaveConflict)
+
+
+class SaveDebounceMergeTest(unittest.TestCase):
+    """GUI 保存路径: 等待防抖期间 CLI 写入文件, 监视器先于保存检测到变化"""
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        try:
+            from PySide6.QtWidgets import QApplication
+        except ImportError:
+            raise unittest.SkipTest("需要 PySide6")
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved_env = {key: os.environ.get(key) for key in ("HOME", "USERPROFILE", "XDG_CACHE_HOME")}
+        os.environ["HOME"] = os.environ["USERPROFILE"] = self.tmp.name
+        os.environ["XDG_CACHE_HOME"] = str(Path(self.tmp.name) / ".cache")
+        self.path = Path(self.tmp.name) / ".claude.json"
+        write_json(self.path, {"numStartups": 1, "theme": "dark"})
+
+    def tearDown(self):
+        for key, value in self.saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self.tmp.cleanup()
+
+    def wait_until(self, predicate, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "等待超时")
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_cli_write_during_save_debounce_is_merged(self):
+        from app.ui.main_window import ClaudeConfigGUI
+
+        window = ClaudeConfigGUI()
+        try:
+            self.wait_until(lambda: window.load_thread is None and window.reload_thread is None)
+            self.assertEqual(window.get_config_data().get("theme"), "dark")
+
+            # 本地修改, 保存在等待防抖
+            window.get_config_data()["theme"] = "light"
+            window.notify_changed("theme")
+            window.save_config_to_file()
+
+            # CLI 在防抖期间写入, 监视器的防抖先结束
+            cli = ConfigStore(self.path)
+            cli.load()
+            cli.set("/numStartups", 2)
+            cli.save(backup=False)
+            window.watcher.check_file()
+
+            window.save_timer.stop()
+            window.start_save()
+            self.wait_until(lambda: window.save_thread is None and not window.save_pending)
+        finally:
+            window.close()
+
+        data = json.loads(self.path.read_text(encoding='utf-8'))
+        self.assertEqual(data["theme"], "light")
+        self.assertEqual(data["numStartups"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+功能开关表格在外部修改时保留未保存编辑的回归测试
+"""
+import unittest
+
+try:
+    from PySide6.QtCore import Qt
+    from app.ui.models.feature_flags_model import FeatureFlagsModel
+except ImportError:
+    FeatureFlagsModel = None
+
+
+@unittest.skipIf(FeatureFlagsModel is None, "需要 PySide6")
+class FeatureFlagsModelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = FeatureFlagsModel(["Gate", "启用"], checkable=True)
+        self.model.set_flags({"g1": False, "g2": False, "g3": True})
+
+    def values(self):
+        return {self.model.name(row): self.model.value(row) for row in range(self.model.rowCount())}
+
+    def test_external_change_keeps_unsaved_toggle(self):
+        self.model.toggle(1)
+        external = {"g1": True, "g2": False, "g3": True}
+
+        self.assertTrue(self.model.update_flag("g1", external))
+        self.assertEqual(self.values(), {"g1": True, "g2": True, "g3": True})
+
+        self.assertFalse(self.model.update_flag("g2", external))
+        self.assertTrue(self.model.value(1))
+
+    def test_whole_key_change_updates_other_rows(self):
+        self.model.toggle(1)
+        skipped = self.model.sync_flags({"g2": False, "g4": True})
+
+        self.assertEqual(skipped, 1)
+        self.assertEqual(self.values(), {"g2": True, "g4": True})
+
+    def test_saved_rows_follow_external_changes_again(self):
+        self.model.toggle(1)
+        self.model.mark_saved(self.values())
+
+        self.assertTrue(self.model.update_flag("g2", {"g2": False}))
+        self.assertFalse(self.model.value(1))
+
+    def test_edited_text_is_kept_after_save(self):
+        model = FeatureFlagsModel(["Feature", "值"])
+        model.set_flags({"f1": "a"})
+        model.setData(model.index(0, 1), "b", Qt.ItemDataRole.EditRole)
+        self.assertFalse(model.update_flag("f1", {"f1": "c"}))
+
+        model.mark_saved({"f1": "b"})
+        self.assertEqual(model.value(0), "b")
+        self.assertFalse(model.is_edited(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+MCP 服务器检测与清单获取的回归测试: 格式错误的服务器定义不能中断其他服务器
+"""
+import asyncio
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.cli import main
+from app.core.mcp_inventory import fetch_inventory
+from app.core.mcp_probe import PROBE_OK, PROBE_SPAWN_FAILED, probe_servers
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+GOOD_SERVER = {
+    "command": sys.executable,
+    "args": ["-m", "benchmarks.fake_mcp_server"],
+    "env": {"PYTHONPATH": str(ROOT)},
+}
+
+MALFORMED_SERVERS = {
+    "bad-env": {"command": sys.executable, "env": "x"},
+    "bad-args": {"command": sys.executable, "args": "-m benchmarks.fake_mcp_server"},
+    "bad-command": {"command": ["python"]},
+}
+
+
+class MalformedServerTest(unittest.TestCase):
+
+    def test_probe_reports_malformed_entries_per_server(self):
+        servers = dict(MALFORMED_SERVERS, good=GOOD_SERVER)
+        results = {result.name: result for result in probe_servers(servers, timeout=10)}
+
+        self.assertEqual(set(results), set(servers))
+        self.assertEqual(results["good"].status, PROBE_OK)
+        for name in MALFORMED_SERVERS:
+            self.assertEqual(results[name].status, PROBE_SPAWN_FAILED, name)
+
+    def test_fetch_inventory_reports_malformed_entry(self):
+        inventory = asyncio.run(fetch_inventory("bad-env", MALFORMED_SERVERS["bad-env"], timeout=10))
+        self.assertTrue(inventory.error)
+        self.assertFalse(inventory.skipped)
+
+    def test_cli_probe_finishes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / ".claude.json"
+            path.write_text(json.dumps({"mcpServers": dict(MALFORMED_SERVERS, good=GOOD_SERVER)}), encoding='utf-8')
+            out = io.StringIO()
+            code = main(["-c", str(path), "servers", "probe", "-t", "10"], out=out, err=io.StringIO())
+
+        self.assertEqual(code, 0)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn(f"{PROBE_OK}\t", "\n".join(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
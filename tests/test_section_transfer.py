@@ -0,0 +1,59 @@
+"""
+部分导入的回归测试: 请求的部分不存在时报错且不修改配置
+"""
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.cli import main
+
+
+class ImportSectionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = Path(self.tmp.name) / ".claude.json"
+        self.source = Path(self.tmp.name) / "export.json"
+        self.config.write_text(json.dumps({"theme": "dark"}, indent=2), encoding='utf-8')
+        self.source.write_text(json.dumps({
+            "theme": "light",
+            "projects": {"/a": {"x": 1}},
+        }, indent=2), encoding='utf-8')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_import(self, *sections):
+        args = ["-c", str(self.config), "--no-backup", "import", str(self.source)]
+        for section in sections:
+            args += ["-s", section]
+        out, err = io.StringIO(), io.StringIO()
+        return main(args, out=out, err=err), out.getvalue(), err.getvalue()
+
+    def config_data(self):
+        return json.loads(self.config.read_text(encoding='utf-8'))
+
+    def test_import_existing_sections(self):
+        code, out, _ = self.run_import("theme", "projects:/a")
+        self.assertEqual(code, 0)
+        self.assertIn("2 处变化", out)
+        self.assertEqual(self.config_data(), {"theme": "light", "projects": {"/a": {"x": 1}}})
+
+    def test_missing_section_fails(self):
+        code, _, err = self.run_import("theme", "nonexistent")
+        self.assertEqual(code, 1)
+        self.assertIn("nonexistent", err)
+        self.assertEqual(self.config_data(), {"theme": "dark"})
+
+    def test_missing_member_fails(self):
+        code, _, err = self.run_import("projects:/b", "theme:x")
+        self.assertEqual(code, 1)
+        self.assertIn("projects:/b", err)
+        self.assertIn("theme:x", err)
+        self.assertEqual(self.config_data(), {"theme": "dark"})
+
+
+if __name__ == '__main__':
+    unittest.main()